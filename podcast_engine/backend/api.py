@@ -1,48 +1,348 @@
-from fastapi import APIRouter, HTTPException
+import asyncio
+import json
+from functools import lru_cache
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import Response, StreamingResponse
 
 from podcast_engine.backend.schemas import (
+    JobResponse,
+    JobLogsResponse,
     LogEntry,
     ProcessRequest,
     ProcessResponse,
     ResultsResponse,
+    SearchHit,
+    SearchResponse,
+    SemanticHit,
+    SemanticSearchResponse,
     StatusResponse,
+    TranscriptInfo,
+    TranscriptSegment,
+    TranscriptSegmentsResponse,
 )
-from podcast_engine.backend.services.engine_service import engine_service
+from podcast_engine.backend.services.engine_service import FINISHED_STATES, Job, JobState, engine_service
+from podcast_engine.config import load_settings
+from podcast_engine.utils.embeddings import semantic_search
+from podcast_engine.utils.search import TranscriptIndex
 
 router = APIRouter()
 
+_MAX_LOGS_PER_RESPONSE = 500
+_MAX_SEGMENTS_PER_RESPONSE = 2000
+
+
+@lru_cache(maxsize=1)
+def _search_index() -> TranscriptIndex:
+    settings = load_settings()
+    index = TranscriptIndex(settings.search_db)
+    # Pick up transcripts written before the index existed (or by another process) once per server start.
+    index.sync_directory(settings.transcripts_dir)
+    return index
+
+
+def _log_entry(entry: Dict) -> LogEntry:
+    return LogEntry(
+        seq=entry.get("seq"),
+        time=entry["time"],
+        level=entry["level"],
+        message=entry["message"],
+        stage=entry.get("stage"),
+    )
+
+
+def _new_logs(state: JobState, since: int) -> Tuple[List[Dict], int]:
+    """
+    Log entries after ``since`` (capped per call) and the cursor to resume from.
+    """
+    cursor = max(since, state.log_cursor)
+    entries = state.logs_since(since, limit=_MAX_LOGS_PER_RESPONSE)
+    if entries:
+        cursor = entries[-1]["seq"] + 1
+    return entries, cursor
+
+
+def _poll(job_id: Optional[str], since: int) -> Tuple[JobState, List[Dict], int]:
+    """
+    A job's state and its log entries after ``since``. Blocking (the first call loads ``jobs.json``, old cursors
+    read the spill file), so async routes run it in a worker thread.
+    """
+    state = engine_service.status(job_id)
+    entries, cursor = _new_logs(state, since)
+    return state, entries, cursor
+
+
+def _status_response(job_id: Optional[str], since: int = 0, segments_since: int = 0) -> StatusResponse:
+    state, entries, log_cursor = _poll(job_id, since)
+    segment_cursor = len(state.partial_transcript)
+    return StatusResponse(
+        state=state.state,
+        step=state.step,
+        error=state.error,
+        progress=state.progress,
+        logs=[_log_entry(entry) for entry in entries],
+        partial_transcript=[TranscriptSegment(**segment) for segment in state.partial_transcript[segments_since:segment_cursor]],
+        llm_partial=dict(state.llm_partial),
+        log_cursor=log_cursor,
+        segment_cursor=segment_cursor,
+    )
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """
+    Whether an ``If-None-Match`` list names ``etag`` (or is ``*``), compared weakly as RFC 9110 asks.
+    """
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or etag.removeprefix("W/") in {tag.removeprefix("W/") for tag in tags}
+
+
+def _sse(event: str, data: Dict, event_id: Optional[str] = None) -> str:
+    prefix = f"id: {event_id}\n" if event_id is not None else ""
+    return f"{prefix}event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+def _position_id(log_cursor: int, segment_cursor: int, token_offsets: Dict[str, int]) -> str:
+    """
+    SSE event id naming where a reconnecting client resumes: ``<log cursor>:<segment cursor>`` followed by
+    ``:<task>=<characters>`` per streamed LLM task.
+    """
+    return ":".join([str(log_cursor), str(segment_cursor), *(f"{task}={n}" for task, n in token_offsets.items())])
+
+
+def _resume_position(last_event_id: Optional[str]) -> Optional[Tuple[int, int, Dict[str, int]]]:
+    """
+    The cursors in a ``Last-Event-ID`` written by ``_position_id``, or None when it is missing or malformed.
+    """
+    if not last_event_id:
+        return None
+    try:
+        log_cursor, segment_cursor, *tokens = last_event_id.strip().split(":")
+        offsets = {task: int(n) for task, n in (token.split("=", 1) for token in tokens)}
+        position = int(log_cursor), int(segment_cursor), offsets
+    except ValueError:
+        return None
+    return position if min(position[0], position[1], *offsets.values()) >= 0 else None
+
+
+async def _event_stream(
+    request: Request,
+    job_id: Optional[str],
+    since: int,
+    segments_since: int,
+) -> AsyncIterator[str]:
+    """
+    Push only what changed since the last tick: status transitions, new log entries, new transcript segments
+    and LLM token deltas. Each tick costs O(new events), not O(total logs). Log, segment and token events
+    carry the stream position as their id, so a client reconnecting with ``Last-Event-ID`` resumes there.
+    """
+    log_cursor, segment_cursor = since, segments_since
+    token_offsets: Dict[str, int] = {}
+    position = _resume_position(request.headers.get("last-event-id"))
+    if position is not None:
+        log_cursor, segment_cursor, token_offsets = position
+    last_status: Optional[Dict] = None
+    while True:
+        state, entries, next_log_cursor = await asyncio.to_thread(_poll, job_id, log_cursor)
+        status = {"state": state.state, "step": state.step, "progress": round(state.progress, 1), "error": state.error}
+        if status != last_status:
+            yield _sse("status", status)
+            last_status = status
+
+        for entry in entries:
+            log_cursor = entry["seq"] + 1
+            event_id = _position_id(log_cursor, segment_cursor, token_offsets)
+            yield _sse("log", _log_entry(entry).model_dump(mode="json"), event_id=event_id)
+        log_cursor = next_log_cursor
+
+        for segment in state.partial_transcript[segment_cursor:]:
+            segment_cursor += 1
+            yield _sse("segment", segment, event_id=_position_id(log_cursor, segment_cursor, token_offsets))
+
+        for task, text in list(state.llm_partial.items()):
+            offset = token_offsets.get(task, 0)
+            if len(text) > offset:
+                token_offsets[task] = len(text)
+                event_id = _position_id(log_cursor, segment_cursor, token_offsets)
+                yield _sse("token", {"task": task, "text": text[offset:]}, event_id=event_id)
+
+        if status["state"] in FINISHED_STATES or status["state"] == "idle":  # as of this tick's status event
+            yield _sse("done", status)
+            return
+        if await request.is_disconnected():
+            return
+        await asyncio.sleep(0.25)
+
+
+def _job_response(job: Job) -> JobResponse:
+    return JobResponse(
+        job_id=job.id,
+        url=job.url,
+        created_at=job.created_at,
+        state=job.state.state,
+        step=job.state.step,
+        error=job.state.error,
+        progress=job.state.progress,
+        episode_id=job.episode_id,
+        metrics=job.metrics,
+    )
+
 
 @router.post("/process", response_model=ProcessResponse)
-def process_podcast(request: ProcessRequest) -> ProcessResponse:
+async def process_podcast(request: ProcessRequest) -> ProcessResponse:
     try:
-        engine_service.start(str(request.url))
+        job = await asyncio.to_thread(engine_service.submit, str(request.url), force=request.force)
     except HTTPException:
         raise
     except Exception as exc:  # noqa: BLE001
         raise HTTPException(status_code=400, detail=str(exc)) from exc
-    return ProcessResponse(status="accepted", message="Processing started.")
+    return ProcessResponse(status="accepted", message="Processing queued.", job_id=job.id)
 
 
 @router.get("/status", response_model=StatusResponse)
-def get_status() -> StatusResponse:
-    state = engine_service.status()
-    logs = [
-        LogEntry(
-            time=entry["time"],
-            level=entry["level"],
-            message=entry["message"],
-            stage=entry.get("stage"),
-        )
-        for entry in state.logs
-    ]
-    return StatusResponse(state=state.state, step=state.step, error=state.error, logs=logs)
+async def get_status(since: int = Query(0, ge=0), segments_since: int = Query(0, ge=0)) -> StatusResponse:
+    """Status of the most recently submitted job."""
+    return await asyncio.to_thread(_status_response, None, since, segments_since)
+
+
+@router.get("/events")
+async def stream_events(
+    request: Request,
+    since: int = Query(0, ge=0),
+    segments_since: int = Query(0, ge=0),
+) -> StreamingResponse:
+    """Server-Sent Events for the job that was the most recently submitted one when the stream opened."""
+    job_id = await asyncio.to_thread(engine_service.latest_job_id)
+    return StreamingResponse(
+        _event_stream(request, job_id, since, segments_since),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"},
+    )
 
 
 @router.get("/results", response_model=ResultsResponse)
-def get_results() -> ResultsResponse:
-    results = engine_service.results()
-    return ResultsResponse(
-        transcript_markdown=results["transcript_markdown"],
-        summary_markdown=results["summary_markdown"],
-        thread_markdown=results["thread_markdown"],
+async def get_results(
+    transcript: bool = Query(True, description="Include the full transcript Markdown"),
+) -> ResultsResponse:
+    """Results of the most recently submitted job."""
+    return ResultsResponse(**await asyncio.to_thread(engine_service.results, include_transcript=transcript))
+
+
+@router.get("/jobs", response_model=List[JobResponse])
+async def list_jobs() -> List[JobResponse]:
+    return [_job_response(job) for job in await asyncio.to_thread(engine_service.list_jobs)]
+
+
+@router.get("/jobs/{job_id}", response_model=StatusResponse)
+async def get_job_status(
+    job_id: str,
+    since: int = Query(0, ge=0),
+    segments_since: int = Query(0, ge=0),
+) -> StatusResponse:
+    return await asyncio.to_thread(_status_response, job_id, since, segments_since)
+
+
+@router.get("/jobs/{job_id}/events")
+async def stream_job_events(
+    request: Request,
+    job_id: str,
+    since: int = Query(0, ge=0),
+    segments_since: int = Query(0, ge=0),
+) -> StreamingResponse:
+    await asyncio.to_thread(engine_service.status, job_id)  # 404 before the stream starts
+    return StreamingResponse(
+        _event_stream(request, job_id, since, segments_since),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"},
+    )
+
+
+@router.get("/jobs/{job_id}/logs", response_model=JobLogsResponse)
+async def get_job_logs(
+    job_id: str,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(200, ge=1, le=_MAX_LOGS_PER_RESPONSE),
+    level: Optional[str] = Query(None, description="Minimum level, e.g. warning"),
+) -> JobLogsResponse:
+    """Full log history of a job, paged by sequence number (older entries are read from the JSONL spill file)."""
+    def _page() -> Tuple[int, List[Dict]]:
+        cursor = engine_service.status(job_id).log_cursor
+        return cursor, engine_service.logs(job_id, offset=offset, limit=limit, level=level)
+
+    cursor, entries = await asyncio.to_thread(_page)
+    next_offset = entries[-1]["seq"] + 1 if entries else max(offset, cursor)
+    return JobLogsResponse(job_id=job_id, offset=offset, next_offset=next_offset, logs=[_log_entry(e) for e in entries])
+
+
+@router.get("/jobs/{job_id}/results", response_model=ResultsResponse)
+async def get_job_results(
+    job_id: str,
+    transcript: bool = Query(True, description="Include the full transcript Markdown"),
+) -> ResultsResponse:
+    return ResultsResponse(**await asyncio.to_thread(engine_service.results, job_id, include_transcript=transcript))
+
+
+@router.post("/jobs/{job_id}/cancel", response_model=JobResponse)
+async def cancel_job(job_id: str) -> JobResponse:
+    """Cancel a queued or running job; tools it has running are killed at once."""
+    return _job_response(await asyncio.to_thread(engine_service.cancel, job_id))
+
+
+@router.get("/search", response_model=SearchResponse)
+async def search_transcripts(
+    q: str = Query(..., min_length=1, description='Words to match; wrap phrases in "quotes"'),
+    limit: int = Query(20, ge=1, le=200),
+    episode_id: Optional[str] = None,
+) -> SearchResponse:
+    hits = await asyncio.to_thread(lambda: _search_index().search(q, limit=limit, episode_id=episode_id))
+    return SearchResponse(query=q, hits=[SearchHit(**hit) for hit in hits])
+
+
+@router.get("/search/semantic", response_model=SemanticSearchResponse)
+async def semantic_search_transcripts(
+    q: str = Query(..., min_length=1, description="What the passage is about"),
+    limit: int = Query(10, ge=1, le=100),
+    episode_id: Optional[str] = None,
+) -> SemanticSearchResponse:
+    """Transcript windows ranked by embedding similarity to the query (needs OLLAMA_EMBED_MODEL)."""
+    try:
+        hits = await asyncio.to_thread(semantic_search, load_settings(), q, limit=limit, episode_id=episode_id)
+    except RuntimeError as exc:
+        raise HTTPException(status_code=503, detail=str(exc)) from exc
+    return SemanticSearchResponse(query=q, hits=[SemanticHit(**hit) for hit in hits])
+
+
+@router.get("/transcripts/{episode_id}", response_model=TranscriptInfo)
+async def get_transcript(episode_id: str) -> TranscriptInfo:
+    return TranscriptInfo(episode_id=episode_id, **await asyncio.to_thread(engine_service.transcript_info, episode_id))
+
+
+@router.get("/transcripts/{episode_id}/segments", response_model=TranscriptSegmentsResponse)
+async def get_transcript_segments(
+    request: Request,
+    episode_id: str,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(200, ge=1, le=_MAX_SEGMENTS_PER_RESPONSE),
+    start: Optional[float] = Query(None, ge=0, description="Only segments overlapping [start, end) seconds"),
+    end: Optional[float] = Query(None, ge=0),
+) -> Response:
+    """
+    A page of transcript segments, read from the memory-mapped columnar copy. ``start`` seeks by time (binary
+    search); ``offset`` is an absolute row index, so ``next_offset`` pages forward within the same range.
+    Responses carry an ETag and answer ``If-None-Match`` with 304 until the transcript changes.
+    """
+    etag = await asyncio.to_thread(engine_service.transcript_etag, episode_id)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if _etag_matches(request.headers.get("if-none-match", ""), etag):
+        return Response(status_code=304, headers=headers)
+    page = await asyncio.to_thread(
+        engine_service.transcript_segments, episode_id, offset=offset, limit=limit, start=start, end=end
+    )
+    body = TranscriptSegmentsResponse(
+        episode_id=episode_id,
+        offset=page["offset"],
+        next_offset=page["next_offset"],
+        total=page["total"],
+        segments=[TranscriptSegment(**segment) for segment in page["segments"]],
     )
+    return Response(body.model_dump_json(), media_type="application/json", headers=headers)
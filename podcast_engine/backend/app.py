@@ -1,11 +1,26 @@
+import asyncio
+from collections import Counter
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 
 from podcast_engine.backend.api import router
+from podcast_engine.backend.services.engine_service import engine_service
+from podcast_engine.metrics import JOBS, REGISTRY
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    yield
+    # Kill in-flight ffmpeg/whisper/ollama children; interrupted jobs stay queued and resume on the next start.
+    await asyncio.to_thread(engine_service.shutdown)
 
 
 def create_app() -> FastAPI:
-    app = FastAPI(title="Podcast Engine API", version="0.1.0")
+    app = FastAPI(title="Podcast Engine API", version="0.1.0", lifespan=lifespan)
 
     app.add_middleware(
         CORSMiddleware,
@@ -16,6 +31,15 @@ def create_app() -> FastAPI:
     )
 
     app.include_router(router)
+
+    @app.get("/metrics", response_class=PlainTextResponse)
+    async def metrics() -> PlainTextResponse:
+        """Prometheus scrape endpoint: stage durations, CPU, RSS, real-time factor, LLM token throughput."""
+        states = Counter(job.state.state for job in await asyncio.to_thread(engine_service.list_jobs))
+        for state in ("queued", "running", "completed", "error", "cancelled"):
+            JOBS.set(states.get(state, 0), state=state)
+        return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
     return app
 
 
@@ -1,11 +1,12 @@
 from datetime import datetime
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
 from pydantic import BaseModel, HttpUrl, field_validator
 
 
 class ProcessRequest(BaseModel):
     url: HttpUrl
+    force: bool = False
 
     @field_validator("url")
     @classmethod
@@ -19,23 +20,103 @@ class ProcessRequest(BaseModel):
 class ProcessResponse(BaseModel):
     status: str
     message: str
+    job_id: Optional[str] = None
 
 
 class LogEntry(BaseModel):
+    seq: Optional[int] = None
     time: datetime
     level: str
     message: str
     stage: Optional[str] = None
 
 
+class TranscriptSegment(BaseModel):
+    start: float
+    end: float
+    text: str
+
+
 class StatusResponse(BaseModel):
-    state: str  # idle, running, completed, error
+    state: str  # idle, queued, running, completed, error, cancelled
     step: Optional[str] = None
     error: Optional[str] = None
+    progress: float = 0.0  # percent of the current step, when known
+    logs: List[LogEntry] = []
+    partial_transcript: List[TranscriptSegment] = []
+    llm_partial: Dict[str, str] = {}  # summary / x_thread text streamed so far
+    # Pass these back as ?since= / ?segments_since= to receive only newer logs and transcript segments.
+    log_cursor: int = 0
+    segment_cursor: int = 0
+
+
+class JobResponse(BaseModel):
+    job_id: str
+    url: str
+    created_at: datetime
+    state: str
+    step: Optional[str] = None
+    error: Optional[str] = None
+    progress: float = 0.0
+    episode_id: Optional[str] = None  # set once completed; key for /transcripts/{episode_id}
+    metrics: Dict[str, Dict[str, Any]] = {}  # per stage: wall_seconds, cpu_seconds, peak_rss_mb, ...
+
+
+class JobLogsResponse(BaseModel):
+    job_id: str
+    offset: int
+    next_offset: int  # pass back as ?offset= for the next page
     logs: List[LogEntry] = []
 
 
 class ResultsResponse(BaseModel):
-    transcript_markdown: str
+    transcript_markdown: Optional[str] = None  # omitted with ?transcript=false
     summary_markdown: str
     thread_markdown: str
+    episode_id: Optional[str] = None
+
+
+class TranscriptInfo(BaseModel):
+    episode_id: str
+    title: Optional[str] = None
+    source_url: Optional[str] = None
+    duration: int = 0
+    language: Optional[str] = None
+    segment_count: int
+
+
+class TranscriptSegmentsResponse(BaseModel):
+    episode_id: str
+    offset: int  # row index of the first segment returned
+    next_offset: Optional[int] = None  # None once the last segment of the requested range has been returned
+    total: int  # segments in the whole transcript
+    segments: List[TranscriptSegment] = []
+
+
+class SearchHit(BaseModel):
+    episode_id: str
+    title: Optional[str] = None
+    source_url: Optional[str] = None
+    start: float
+    end: float
+    text: str
+    snippet: str
+
+
+class SearchResponse(BaseModel):
+    query: str
+    hits: List[SearchHit] = []
+
+
+class SemanticHit(BaseModel):
+    episode_id: str
+    title: Optional[str] = None
+    start: float
+    end: float
+    text: str
+    score: float  # cosine similarity to the query
+
+
+class SemanticSearchResponse(BaseModel):
+    query: str
+    hits: List[SemanticHit] = []
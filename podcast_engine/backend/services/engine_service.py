@@ -1,5 +1,12 @@
+import asyncio
+import concurrent.futures
+import contextvars
+import json
 import logging
+import os
 import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
@@ -7,91 +14,404 @@ from typing import Dict, List, Optional
 
 from fastapi import HTTPException, status
 
+from podcast_engine.backend.services.log_store import JobLogStore, parse_level
+from podcast_engine.config import Settings, load_settings
+from podcast_engine.hooks import JobCancelled, PipelineHooks, StageLimiter
 from podcast_engine.logger import get_logger
 from podcast_engine.main import process_episode
+from podcast_engine.utils import process
+from podcast_engine.utils.transcript_store import ColumnarTranscript, ensure_columnar
+from podcast_engine.utils.whisper_server import stop_all as stop_whisper_servers
+
+_current_job_id: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("current_job_id", default=None)
+
+FINISHED_STATES = {"completed", "error", "cancelled"}
 
 
 @dataclass
 class JobState:
-    state: str = "idle"  # idle, running, completed, error
+    state: str = "idle"  # idle, queued, running, completed, error, cancelled
     step: Optional[str] = None
     error: Optional[str] = None
-    logs: List[Dict] = field(default_factory=list)
+    progress: float = 0.0
+    logs: JobLogStore = field(default_factory=JobLogStore)
+    partial_transcript: List[Dict] = field(default_factory=list)
+    llm_partial: Dict[str, str] = field(default_factory=dict)  # task -> text streamed so far
+
+    @property
+    def log_cursor(self) -> int:
+        return self.logs.cursor
+
+    def logs_since(self, cursor: int, limit: Optional[int] = None, min_level: int = logging.NOTSET) -> List[Dict]:
+        return self.logs.read(cursor, limit=limit, min_level=min_level)
+
+    def clear_partials(self) -> None:
+        """
+        Drop the streamed transcript and LLM text of a finished job; the results endpoints serve the saved files,
+        and a long-running server would otherwise hold every episode's transcript in memory.
+        """
+        self.partial_transcript = []
+        self.llm_partial = {}
+
+
+@dataclass
+class Job:
+    id: str
+    url: str
+    created_at: datetime
+    force: bool = False
+    state: JobState = field(default_factory=lambda: JobState(state="queued"))
+    result_paths: Optional[Dict[str, str]] = None
+    episode_id: Optional[str] = None
+    metrics: Dict[str, Dict] = field(default_factory=dict)  # stage -> sample from podcast_engine.metrics
+    cancel_event: threading.Event = field(default_factory=threading.Event)
+
+    def to_record(self) -> Dict:
+        return {
+            "id": self.id,
+            "url": self.url,
+            "created_at": self.created_at.isoformat(),
+            "force": self.force,
+            "state": self.state.state,
+            "step": self.state.step,
+            "error": self.state.error,
+            "result_paths": self.result_paths,
+            "episode_id": self.episode_id,
+            "metrics": self.metrics,
+        }
+
+    @classmethod
+    def from_record(cls, record: Dict) -> "Job":
+        job = cls(
+            id=record["id"],
+            url=record["url"],
+            created_at=datetime.fromisoformat(record["created_at"]),
+            force=record.get("force", False),
+            result_paths=record.get("result_paths"),
+            episode_id=record.get("episode_id"),
+            metrics=record.get("metrics") or {},
+        )
+        job.state.state = record.get("state", "queued")
+        job.state.step = record.get("step")
+        job.state.error = record.get("error")
+        return job
 
 
 class InMemoryLogHandler(logging.Handler):
-    def __init__(self, job_state: JobState):
-        super().__init__()
-        self.job_state = job_state
+    """
+    Routes pipeline log records to the job whose worker thread emitted them. Records below ``level`` are
+    dropped before they are formatted.
+    """
+
+    def __init__(self, service: "EngineService", level: int = logging.NOTSET):
+        super().__init__(level)
+        self.service = service
 
     def emit(self, record: logging.LogRecord) -> None:
-        entry = {
-            "time": datetime.utcfromtimestamp(record.created),
-            "level": record.levelname.lower(),
-            "message": record.getMessage(),
-            "stage": getattr(record, "stage", None),
-        }
-        if entry["stage"]:
-            self.job_state.step = entry["stage"]
-        self.job_state.logs.append(entry)
+        job_id = _current_job_id.get()
+        if job_id is None:
+            return
+        job = self.service.get_job(job_id, required=False)
+        if job is None:
+            return
+        stage = getattr(record, "stage", None)
+        if stage and stage != job.state.step:
+            job.state.step = stage
+            job.state.progress = 0.0
+        job.state.logs.append(record.created, record.levelno, record.getMessage(), stage)
 
 
 class EngineService:
+    """
+    Queue of processing jobs drained by ``JOB_WORKERS`` asyncio tasks on the process loop (``utils.process``),
+    which also supervises every external tool the pipelines start. Each job's pipeline runs on a pool thread;
+    cancelling a job kills its ffmpeg/whisper/ollama children immediately. Jobs persist to
+    ``<STATE_DIR>/jobs.json`` so queued and interrupted work is picked up again after a restart; per-stage
+    limits (download, whisper, llm) are shared by all workers.
+    """
+
     def __init__(self) -> None:
         self._lock = threading.Lock()
-        self._job_state = JobState()
-        self._results: Optional[Dict[str, str]] = None
-        self._thread: Optional[threading.Thread] = None
-
-    def start(self, url: str) -> None:
-        self.acquire()
-        # Reset state
-        self._job_state = JobState(state="running", step="init", logs=[])
-        self._results = None
-
-        self._thread = threading.Thread(target=self._run_job, args=(url,), daemon=True)
-        self._thread.start()
-
-    def _run_job(self, url: str) -> None:
-        logger = get_logger("podcast_engine")
-        handler = InMemoryLogHandler(self._job_state)
-        logger.addHandler(handler)
+        self._persist_lock = threading.Lock()
+        self._jobs: Dict[str, Job] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional["asyncio.Queue[str]"] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._workers: List["concurrent.futures.Future[None]"] = []
+        self._running: Dict[str, "concurrent.futures.Future[None]"] = {}
+        self._stopping = False
+        self._settings: Optional[Settings] = None
+        self._limiter: Optional[StageLimiter] = None
+        self._latest_job_id: Optional[str] = None
+
+    @property
+    def _jobs_path(self) -> Path:
+        assert self._settings is not None
+        return self._settings.state_dir / "jobs.json"
+
+    def _ensure_started(self) -> None:
+        with self._lock:
+            if self._loop is not None:
+                return
+            self._settings = load_settings()
+            self._limiter = StageLimiter(self._settings.stage_limits)
+            self._loop = process.event_loop()
+            self._queue = asyncio.Queue()
+            self._executor = ThreadPoolExecutor(max_workers=self._settings.job_workers, thread_name_prefix="engine-job")
+            self._load_jobs()
+            get_logger("podcast_engine").addHandler(InMemoryLogHandler(self, self._log_level))
+            self._workers = [
+                asyncio.run_coroutine_threadsafe(self._worker(), self._loop) for _ in range(self._settings.job_workers)
+            ]
+
+    def _enqueue(self, job_id: str) -> None:
+        assert self._loop is not None and self._queue is not None
+        self._loop.call_soon_threadsafe(self._queue.put_nowait, job_id)
+
+    @property
+    def _log_level(self) -> int:
+        assert self._settings is not None
+        return parse_level(self._settings.job_log_level, logging.INFO)
+
+    def _attach_log_store(self, job: Job) -> None:
+        """
+        Bounded ring plus ``<STATE_DIR>/logs/<job id>.jsonl`` for the full history.
+        """
+        assert self._settings is not None
+        job.state.logs = JobLogStore(
+            capacity=self._settings.log_buffer_size,
+            spill_path=self._settings.state_dir / "logs" / f"{job.id}.jsonl",
+            min_level=self._log_level,
+        )
+
+    def _load_jobs(self) -> None:
+        if not self._jobs_path.exists():
+            return
+        try:
+            records = json.loads(self._jobs_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        for record in records:
+            job = Job.from_record(record)
+            self._attach_log_store(job)
+            if job.state.state not in FINISHED_STATES:
+                # Interrupted by a restart: run it again from the queue.
+                job.state.state = "queued"
+                self._enqueue(job.id)
+            self._jobs[job.id] = job
+            self._latest_job_id = job.id
+
+    def _persist(self) -> None:
+        with self._lock:
+            records = [job.to_record() for job in self._jobs.values()]
+        with self._persist_lock:
+            tmp_path = self._jobs_path.with_suffix(".tmp")
+            tmp_path.write_text(json.dumps(records, indent=2), encoding="utf-8")
+            os.replace(tmp_path, self._jobs_path)
+
+    def submit(self, url: str, force: bool = False) -> Job:
+        self._ensure_started()
+        job = Job(id=uuid.uuid4().hex, url=url, created_at=datetime.utcnow(), force=force)
+        self._attach_log_store(job)
+        with self._lock:
+            self._jobs[job.id] = job
+            self._latest_job_id = job.id
+        self._persist()
+        self._enqueue(job.id)
+        return job
+
+    async def _worker(self) -> None:
+        assert self._queue is not None and self._executor is not None
+        while True:
+            job = self._jobs.get(await self._queue.get())
+            if job is None or job.state.state != "queued" or self._stopping:
+                continue
+            future = self._executor.submit(contextvars.copy_context().run, self._run_job, job)
+            self._running[job.id] = future
+            try:
+                await asyncio.wrap_future(future)
+            finally:
+                self._running.pop(job.id, None)
+
+    def _backlog(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def _run_job(self, job: Job) -> None:
+        _current_job_id.set(job.id)
+        job.state.state = "running"
+        job.state.step = "init"
+        self._persist()
+
+        def _on_progress(stage: str, percent: float) -> None:
+            job.state.step = stage
+            job.state.progress = percent
+
+        def _on_token(task: str, text: str) -> None:
+            job.state.llm_partial[task] = job.state.llm_partial.get(task, "") + text
+
+        hooks = PipelineHooks(
+            on_segment=job.state.partial_transcript.append,
+            on_progress=_on_progress,
+            on_token=_on_token,
+            on_metrics=job.metrics.__setitem__,
+            limiter=self._limiter,
+            cancel_event=job.cancel_event,
+            backlog=self._backlog,
+        )
         try:
-            paths = process_episode(url)
-            self._results = {
-                "transcript_markdown": Path(paths["transcript_md"]).read_text(encoding="utf-8"),
-                "summary_markdown": Path(paths["summary"]).read_text(encoding="utf-8"),
-                "thread_markdown": Path(paths["thread"]).read_text(encoding="utf-8"),
+            # Always resume: a job re-queued after a restart, or a URL resubmitted after a failure, picks up from the
+            # last finished stage. Forced jobs reset the checkpoint instead.
+            paths = process_episode(job.url, hooks=hooks, force=job.force, resume=not job.force)
+            job.result_paths = {
+                "transcript_markdown": str(paths["transcript_md"]),
+                "summary_markdown": str(paths["summary"]),
+                "thread_markdown": str(paths["thread"]),
             }
-            self._job_state.state = "completed"
-            self._job_state.step = "complete"
+            job.episode_id = paths["transcript_json"].stem
+            job.state.state = "completed"
+            job.state.step = "complete"
+            job.state.progress = 100.0
         except Exception as exc:  # noqa: BLE001
-            self._job_state.state = "error"
-            self._job_state.error = str(exc)
-            self._job_state.step = self._job_state.step or "error"
+            if isinstance(exc, JobCancelled) or job.cancel_event.is_set():
+                # Killed tools can surface as ordinary failures; once cancelled, that is what happened. Jobs
+                # interrupted by a server shutdown stay queued and resume on the next start.
+                job.state.state = "queued" if self._stopping else "cancelled"
+            else:
+                job.state.state = "error"
+                job.state.error = str(exc)
+                job.state.step = job.state.step or "error"
         finally:
-            logger.removeHandler(handler)
-            if self._lock.locked():
-                self._lock.release()
+            job.state.logs.close()
+            if job.state.state in FINISHED_STATES:
+                job.state.clear_partials()
+            self._persist()
 
-    def status(self) -> JobState:
-        return self._job_state
+    def get_job(self, job_id: Optional[str], required: bool = True) -> Optional[Job]:
+        job = self._jobs.get(job_id) if job_id else None
+        if job is None and required:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Job {job_id} not found.")
+        return job
 
-    def results(self) -> Dict[str, str]:
-        if self._job_state.state != "completed" or not self._results:
+    def list_jobs(self) -> List[Job]:
+        self._ensure_started()
+        return sorted(self._jobs.values(), key=lambda job: job.created_at, reverse=True)
+
+    def cancel(self, job_id: str) -> Job:
+        self._ensure_started()
+        job = self.get_job(job_id)
+        assert job is not None
+        if job.state.state in FINISHED_STATES:
             raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Results are not available. Run a job first.",
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Job {job_id} has already finished ({job.state.state}).",
             )
-        return self._results
+        process.cancel_children(job.cancel_event)
+        if job.state.state == "queued":
+            job.state.state = "cancelled"
+            job.state.logs.close()
+            self._persist()
+        return job
+
+    def shutdown(self, timeout: float = 10.0) -> None:
+        """
+        Server shutdown: kill the tools of running jobs (and any whisper-server this process started), wait up to
+        ``timeout`` for their pipelines to unwind and leave them queued in ``jobs.json`` for the next start.
+        """
+        with self._lock:
+            if self._loop is None or self._stopping:
+                return
+            self._stopping = True
+            running = dict(self._running)
+        for job_id in running:
+            process.cancel_children(self._jobs[job_id].cancel_event)
+        concurrent.futures.wait(list(running.values()), timeout=timeout)
+        for worker in self._workers:
+            worker.cancel()
+        process.shutdown()
+        stop_whisper_servers()
+        self._persist()
+
+    def logs(self, job_id: str, offset: int = 0, limit: int = 200, level: Optional[str] = None) -> List[Dict]:
+        self._ensure_started()
+        job = self.get_job(job_id)
+        assert job is not None
+        return job.state.logs_since(offset, limit=limit, min_level=parse_level(level))
 
-    def acquire(self) -> None:
-        acquired = self._lock.acquire(blocking=False)
-        if not acquired:
+    def latest_job_id(self) -> Optional[str]:
+        """
+        ID of the most recently submitted job, or None before the first.
+        """
+        self._ensure_started()
+        return self._latest_job_id
+
+    def status(self, job_id: Optional[str] = None) -> JobState:
+        self._ensure_started()
+        job = self.get_job(job_id or self._latest_job_id, required=job_id is not None)
+        return job.state if job else JobState()
+
+    def results(self, job_id: Optional[str] = None, include_transcript: bool = True) -> Dict[str, Optional[str]]:
+        """
+        Summary and thread text, plus the full transcript Markdown unless ``include_transcript`` is off (clients
+        can page the transcript through ``transcript_segments`` instead).
+        """
+        self._ensure_started()
+        job = self.get_job(job_id or self._latest_job_id, required=job_id is not None)
+        if job is None or job.state.state != "completed" or not job.result_paths:
             raise HTTPException(
-                status_code=status.HTTP_409_CONFLICT,
-                detail="A job is already running. Please wait until it completes.",
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Results are not available. Run a job first.",
             )
+        results: Dict[str, Optional[str]] = {
+            key: Path(path).read_text(encoding="utf-8")
+            for key, path in job.result_paths.items()
+            if include_transcript or key != "transcript_markdown"
+        }
+        results["episode_id"] = job.episode_id
+        return results
+
+    def _transcript_path(self, episode_id: str) -> Path:
+        self._ensure_started()
+        assert self._settings is not None
+        path = self._settings.transcripts_dir / f"{episode_id}.json"
+        if Path(episode_id).name != episode_id or not path.exists():
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Transcript {episode_id} not found.")
+        return path
+
+    def transcript_info(self, episode_id: str) -> Dict:
+        with ColumnarTranscript(ensure_columnar(self._transcript_path(episode_id))) as transcript:
+            return {**transcript.metadata, "segment_count": transcript.count}
+
+    def transcript_etag(self, episode_id: str) -> str:
+        """
+        Validator for conditional GETs: changes whenever the transcript is rewritten.
+        """
+        stat = ensure_columnar(self._transcript_path(episode_id)).stat()
+        return f'W/"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+
+    def transcript_segments(
+        self,
+        episode_id: str,
+        offset: int = 0,
+        limit: int = 200,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+    ) -> Dict:
+        """
+        Up to ``limit`` segments from row ``offset`` on, restricted to those overlapping ``[start, end)`` seconds
+        when given. Returns ``total``, the absolute ``offset`` of the first row, ``next_offset`` (None when the
+        range is exhausted) and ``segments``.
+        """
+        with ColumnarTranscript(ensure_columnar(self._transcript_path(episode_id))) as transcript:
+            first, last = transcript.locate(start, end)
+            offset = max(offset, first)
+            segments = transcript.segments(offset, max(0, min(limit, last - offset)))
+            stop = offset + len(segments)
+            return {
+                "total": transcript.count,
+                "offset": offset,
+                "next_offset": stop if stop < last else None,
+                "segments": segments,
+            }
 
 
 engine_service = EngineService()
@@ -0,0 +1,158 @@
+import json
+import logging
+import threading
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from typing import BinaryIO, Deque, Dict, Iterator, List, Optional
+
+_MARK_EVERY = 256  # the spill file's byte offset is kept for every 256th record, so paging seeks
+
+
+class LogRecord:
+    __slots__ = ("seq", "created", "levelno", "message", "stage")
+
+    def __init__(self, seq: int, created: float, levelno: int, message: str, stage: Optional[str]) -> None:
+        self.seq = seq
+        self.created = created
+        self.levelno = levelno
+        self.message = message
+        self.stage = stage
+
+    def to_dict(self) -> Dict:
+        return {
+            "seq": self.seq,
+            "time": datetime.utcfromtimestamp(self.created),
+            "level": logging.getLevelName(self.levelno).lower(),
+            "message": self.message,
+            "stage": self.stage,
+        }
+
+    def to_json(self) -> str:
+        return json.dumps(
+            {"seq": self.seq, "t": self.created, "l": self.levelno, "m": self.message, "s": self.stage},
+            ensure_ascii=False,
+        )
+
+    @classmethod
+    def from_json(cls, line: str) -> "LogRecord":
+        data = json.loads(line)
+        return cls(data["seq"], data["t"], data["l"], data["m"], data.get("s"))
+
+
+def parse_level(name: Optional[str], default: int = logging.NOTSET) -> int:
+    if not name:
+        return default
+    level = logging.getLevelName(name.strip().upper())
+    return level if isinstance(level, int) else default
+
+
+class JobLogStore:
+    """
+    Per-job log buffer: the newest ``capacity`` records stay in memory, every record is appended to a JSONL
+    file so the full history can still be paged by sequence number. ``seq`` is absolute, so cursors stay valid
+    after older records fall out of the ring; reads from the file seek to the nearest marked offset before the
+    cursor instead of scanning from the start.
+    """
+
+    def __init__(self, capacity: int = 500, spill_path: Optional[Path] = None, min_level: int = logging.INFO) -> None:
+        self.spill_path = spill_path
+        self.min_level = min_level
+        self._ring: Deque[LogRecord] = deque(maxlen=max(1, capacity))
+        self._lock = threading.Lock()
+        self._file: Optional[BinaryIO] = None
+        self._next_seq: Optional[int] = None  # counted from the spill file on first use after a restart
+        self._marks: List[int] = []  # spill-file byte offset of record ``i * _MARK_EVERY``
+        self._spill_bytes = 0
+
+    @property
+    def cursor(self) -> int:
+        with self._lock:
+            return self._seq()
+
+    def __len__(self) -> int:
+        return self.cursor
+
+    def _seq(self) -> int:
+        if self._next_seq is None:
+            self._next_seq = 0
+            if self.spill_path is not None and self.spill_path.exists():
+                with self.spill_path.open("rb") as f:
+                    for line in f:
+                        if not line.endswith(b"\n"):
+                            break
+                        self._spilled(self._next_seq, len(line))
+                        self._next_seq += 1
+        return self._next_seq
+
+    def _spilled(self, seq: int, size: int) -> None:
+        if seq % _MARK_EVERY == 0:
+            self._marks.append(self._spill_bytes)
+        self._spill_bytes += size
+
+    def append(self, created: float, levelno: int, message: str, stage: Optional[str] = None) -> Optional[LogRecord]:
+        if levelno < self.min_level:
+            return None
+        with self._lock:
+            record = LogRecord(self._seq(), created, levelno, message, stage)
+            self._next_seq = record.seq + 1
+            self._ring.append(record)
+            if self.spill_path is not None:
+                if self._file is None:
+                    self.spill_path.parent.mkdir(parents=True, exist_ok=True)
+                    self._file = self.spill_path.open("ab")
+                line = (record.to_json() + "\n").encode("utf-8")
+                self._file.write(line)
+                self._file.flush()
+                self._spilled(record.seq, len(line))
+        return record
+
+    def close(self) -> None:
+        """
+        Release the spill file once the job has finished. With a spill file the ring is dropped too, so finished
+        jobs cost no log memory and are served from disk.
+        """
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            if self.spill_path is not None:
+                self._ring.clear()
+
+    def _read_spilled(self, offset: int) -> Iterator[LogRecord]:
+        if self.spill_path is None or not self.spill_path.exists():
+            return
+        with self._lock:
+            if not self._marks:
+                return
+            mark = min(offset // _MARK_EVERY, len(self._marks) - 1)
+            position = self._marks[mark]
+        with self.spill_path.open("rb") as f:
+            f.seek(position)
+            for index, line in enumerate(f, mark * _MARK_EVERY):
+                if not line.endswith(b"\n"):  # a line still being written
+                    return
+                if index >= offset:
+                    yield LogRecord.from_json(line.decode("utf-8"))
+
+    def read(self, offset: int = 0, limit: Optional[int] = None, min_level: int = logging.NOTSET) -> List[Dict]:
+        """
+        Records with ``seq >= offset``, oldest first. Served from memory when the ring still holds ``offset``,
+        otherwise from the spill file.
+        """
+        with self._lock:
+            if offset >= self._seq():
+                return []
+            ring = list(self._ring)
+        if self.spill_path is None or (ring and offset >= ring[0].seq):
+            records: Iterator[LogRecord] = (record for record in ring if record.seq >= offset)
+        else:
+            records = self._read_spilled(offset)
+        entries = []
+        for record in records:
+            if record.levelno < min_level:
+                continue
+            entries.append(record.to_dict())
+            if limit is not None and len(entries) >= limit:
+                break
+        return entries
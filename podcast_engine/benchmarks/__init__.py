@@ -0,0 +1,4 @@
+"""
+Reproducible benchmarks for the pipeline and API against stub backends: fake ffmpeg/whisper-cli scripts,
+a stub Ollama server and a fake yt-dlp, fed with synthetic audio. Run ``python -m podcast_engine.benchmarks``.
+"""
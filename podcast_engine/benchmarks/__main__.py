@@ -0,0 +1,101 @@
+import argparse
+import json
+import logging
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+from typing import Dict, List
+
+from podcast_engine.benchmarks.suites import SUITES, BenchContext, run
+from podcast_engine.testing import FakeYoutubeDL, OllamaStubConfig, install_tools
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m podcast_engine.benchmarks",
+        description="Benchmark the pipeline and API against stub whisper/ffmpeg/Ollama/yt-dlp backends.",
+    )
+    parser.add_argument("--suite", action="append", choices=sorted(SUITES), help="Run only these (repeatable)")
+    parser.add_argument("--audio-seconds", type=float, default=300.0, help="Length of the synthetic episode")
+    parser.add_argument("--iterations", type=int, default=5, help="Timed iterations per benchmark")
+    parser.add_argument("--whisper-rtf", type=float, default=50.0, help="Fake whisper speed, audio seconds per second")
+    parser.add_argument("--whisper-load", type=float, default=0.2, help="Fake whisper model-load seconds per run")
+    parser.add_argument("--download-latency", type=float, default=0.05, help="Fake yt-dlp seconds per download")
+    parser.add_argument("--llm-tokens", type=int, default=200, help="Tokens the stub Ollama streams per request")
+    parser.add_argument("--llm-token-latency", type=float, default=0.001, help="Stub Ollama seconds per token")
+    parser.add_argument("--log-entries", type=int, default=20000, help="Log lines in the /status benchmark job")
+    parser.add_argument("--concurrent", type=int, default=50, help="Concurrent POST /process requests")
+    parser.add_argument("--json", type=Path, help="Also write results to this file")
+    parser.add_argument("--keep", action="store_true", help="Keep the temporary workspace")
+    return parser
+
+
+def _print_table(results: List[Dict]) -> None:
+    columns = ["name", "iterations", "p50_ms", "p90_ms", "p99_ms", "peak_python_mb"]
+    print("  ".join(f"{column:>24}" if index else f"{column:<26}" for index, column in enumerate(columns)))
+    for result in results:
+        cells = [f"{result['name']:<26}"] + [f"{str(result.get(column, '')):>24}" for column in columns[1:]]
+        rates = {key: value for key, value in result.items() if key not in columns and key != "mean_ms"}
+        print("  ".join(cells) + ("  " + json.dumps(rates) if rates else ""))
+
+
+def _workspace(root: Path, args: argparse.Namespace) -> None:
+    """
+    Point every directory setting at ``root`` and the binaries at the fakes, so runs never touch real data.
+    """
+    paths = install_tools(root / "bin")
+    model = root / "models" / "ggml-bench.bin"
+    model.parent.mkdir(parents=True, exist_ok=True)
+    model.write_bytes(b"bench-model")
+    for name in ("AUDIO_DIR", "TRANSCRIPTS_DIR", "OUTPUTS_DIR", "CACHE_DIR", "STATE_DIR"):
+        os.environ[name] = str(root / name.lower())
+    os.environ["WHISPER_CPP_BIN"] = str(paths["whisper-cli"])
+    os.environ["WHISPER_MODEL_PATH"] = str(model)
+    os.environ["WHISPER_BACKEND"] = "cli"
+    os.environ["LLM_BACKEND"] = "http"
+    os.environ["BENCH_WHISPER_RTF"] = str(args.whisper_rtf)
+    os.environ["BENCH_WHISPER_LOAD"] = str(args.whisper_load)
+    os.environ["TQDM_DISABLE"] = "1"
+
+    import podcast_engine.utils.downloader as downloader
+
+    downloader.YoutubeDL = FakeYoutubeDL  # type: ignore[misc]
+    FakeYoutubeDL.latency = args.download_latency
+
+
+def main(argv: List[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    # Keep pipeline log lines off stdout; the handler the API attaches per job still sees them.
+    root_logger = logging.getLogger()
+    root_logger.addHandler(logging.NullHandler())
+    root_logger.setLevel(logging.INFO)
+
+    root = Path(tempfile.mkdtemp(prefix="podcast_engine_bench_"))
+    try:
+        _workspace(root, args)
+        ctx = BenchContext(
+            work_dir=root,
+            audio_path=root / "synthetic.wav",
+            audio_seconds=args.audio_seconds,
+            iterations=max(1, args.iterations),
+            ollama=OllamaStubConfig(tokens=args.llm_tokens, token_latency=args.llm_token_latency),
+            log_entries=args.log_entries,
+            concurrent_requests=args.concurrent,
+        )
+        results = run(ctx, args.suite or list(SUITES))
+    finally:
+        if args.keep:
+            print(f"workspace kept at {root}", file=sys.stderr)
+        else:
+            shutil.rmtree(root, ignore_errors=True)
+
+    _print_table(results)
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2), encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
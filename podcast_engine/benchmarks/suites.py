@@ -0,0 +1,252 @@
+import gc
+import os
+import resource
+import statistics
+import sys
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from podcast_engine.config import load_settings
+from podcast_engine.hooks import PipelineHooks
+from podcast_engine.testing import FakeYoutubeDL, OllamaStub, OllamaStubConfig, synthetic_audio
+
+
+@dataclass
+class BenchContext:
+    work_dir: Path
+    audio_path: Path
+    audio_seconds: float
+    iterations: int
+    ollama: OllamaStubConfig
+    log_entries: int = 20000
+    concurrent_requests: int = 50
+
+
+@dataclass
+class BenchResult:
+    name: str
+    latencies: List[float]
+    units: float = 1.0  # work items per iteration, for throughput
+    unit_name: str = "ops"
+    peak_python_mb: float = 0.0
+    extra: Dict = field(default_factory=dict)
+
+    def summary(self) -> Dict:
+        ordered = sorted(self.latencies)
+
+        def _pct(p: float) -> float:
+            return ordered[min(len(ordered) - 1, int(round(p / 100.0 * (len(ordered) - 1))))]
+
+        total = sum(ordered)
+        return {
+            "name": self.name,
+            "iterations": len(ordered),
+            "p50_ms": round(_pct(50) * 1000, 2),
+            "p90_ms": round(_pct(90) * 1000, 2),
+            "p99_ms": round(_pct(99) * 1000, 2),
+            "mean_ms": round(statistics.fmean(ordered) * 1000, 2),
+            f"{self.unit_name}_per_second": round(self.units * len(ordered) / total, 2) if total else None,
+            "peak_python_mb": round(self.peak_python_mb, 2),
+            **self.extra,
+        }
+
+
+def _measure(name: str, iterations: int, call: Callable[[int], None], units: float = 1.0, unit_name: str = "ops") -> BenchResult:
+    """
+    Time ``iterations`` calls, then one more under tracemalloc for peak Python allocation (kept out of timing).
+    """
+    call(-1)  # warm-up: imports, connection pools, page cache
+    latencies = []
+    for index in range(iterations):
+        gc.collect()
+        started = time.perf_counter()
+        call(index)
+        latencies.append(time.perf_counter() - started)
+    tracemalloc.start()
+    try:
+        call(iterations)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return BenchResult(name, latencies, units=units, unit_name=unit_name, peak_python_mb=peak / 1024**2)
+
+
+def _synthetic_transcript(segments: int) -> Dict:
+    return {
+        "source": "benchmark",
+        "source_url": "https://example.invalid/episode",
+        "title": "Benchmark episode",
+        "duration": segments * 5,
+        "language": "en",
+        "segments": [
+            {"start": index * 5.0, "end": index * 5.0 + 5.0, "text": f"benchmark sentence {index} with a few more words"}
+            for index in range(segments)
+        ],
+    }
+
+
+def bench_transcribe(ctx: BenchContext) -> BenchResult:
+    from podcast_engine.utils.transcriber import transcribe_audio
+
+    settings = load_settings()
+    metadata = {"title": "bench", "duration": ctx.audio_seconds, "url": "https://example.invalid"}
+
+    def _call(index: int) -> None:
+        transcribe_audio(ctx.audio_path, settings, {**metadata, "id": f"bench-transcribe-{index}"}, hooks=PipelineHooks())
+
+    result = _measure("transcribe_audio", ctx.iterations, _call, units=ctx.audio_seconds, unit_name="audio_seconds")
+    result.extra["realtime_factor_p50"] = round(ctx.audio_seconds / sorted(result.latencies)[len(result.latencies) // 2], 1)
+    return result
+
+
+def bench_markdown(ctx: BenchContext) -> BenchResult:
+    from podcast_engine.utils.formatter import transcript_to_markdown, transcript_to_prompt_text
+
+    segments = max(1, int(ctx.audio_seconds / 5)) * 10
+    transcript = _synthetic_transcript(segments)
+
+    def _call(index: int) -> None:
+        transcript_to_markdown(transcript)
+        transcript_to_prompt_text(transcript)
+
+    return _measure("formatter", ctx.iterations * 10, _call, units=segments, unit_name="segments")
+
+
+def bench_generate(ctx: BenchContext) -> BenchResult:
+    from podcast_engine.utils.llm import generate_content
+
+    settings = load_settings()
+    transcript = "\n".join(segment["text"] for segment in _synthetic_transcript(500)["segments"])
+
+    def _call(index: int) -> None:
+        generate_content(
+            settings.ollama_model,
+            settings.summary_prompt,
+            transcript,
+            "summary",
+            host=settings.ollama_host,
+            keep_alive=settings.ollama_keep_alive,
+        )
+
+    return _measure("generate_content", ctx.iterations, _call, units=ctx.ollama.tokens, unit_name="tokens")
+
+
+def bench_process_episode(ctx: BenchContext) -> BenchResult:
+    from podcast_engine.main import process_episode
+
+    def _call(index: int) -> None:
+        process_episode(f"https://example.invalid/episode/{index}", force=True)
+
+    return _measure("process_episode", ctx.iterations, _call, units=ctx.audio_seconds, unit_name="audio_seconds")
+
+
+def _api_client(log_entries: int) -> tuple:
+    """
+    A TestClient over the real app, with the engine's pipeline replaced by one that only logs.
+    """
+    from fastapi.testclient import TestClient
+
+    import podcast_engine.backend.services.engine_service as engine_module
+    from podcast_engine.backend.app import app
+    from podcast_engine.logger import get_logger
+
+    logger = get_logger("podcast_engine")
+    outputs = load_settings().outputs_dir
+    result_file = outputs / "bench_result.md"
+    result_file.write_text("bench\n", encoding="utf-8")
+
+    def _fake_pipeline(
+        url: str, hooks: Optional[PipelineHooks] = None, force: bool = False, resume: bool = False
+    ) -> Dict[str, Path]:
+        for index in range(log_entries):
+            logger.info("bench log line %d", index, extra={"stage": "transcription"})
+        return {"transcript_json": result_file, "transcript_md": result_file, "summary": result_file, "thread": result_file}
+
+    engine_module.process_episode = _fake_pipeline
+    return TestClient(app), engine_module.engine_service
+
+
+def _wait_finished(service, job_ids: List[str], timeout: float = 120.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if all(service.get_job(job_id).state.state in ("completed", "error", "cancelled") for job_id in job_ids):
+            return
+        time.sleep(0.01)
+    raise RuntimeError("benchmark jobs did not finish in time")
+
+
+def bench_api_status(ctx: BenchContext) -> List[BenchResult]:
+    client, service = _api_client(ctx.log_entries)
+    job_id = client.post("/process", json={"url": "https://example.invalid/status"}).json()["job_id"]
+    _wait_finished(service, [job_id])
+    cursor = service.status(job_id).log_cursor
+
+    full = _measure(
+        "api_status_from_start",
+        ctx.iterations * 10,
+        lambda index: client.get(f"/jobs/{job_id}"),
+    )
+    full.extra["log_entries"] = cursor
+    delta = _measure(
+        "api_status_since_cursor",
+        ctx.iterations * 10,
+        lambda index: client.get(f"/jobs/{job_id}", params={"since": cursor}),
+    )
+    page = _measure(
+        "api_logs_page",
+        ctx.iterations * 10,
+        lambda index: client.get(f"/jobs/{job_id}/logs", params={"offset": cursor // 2, "limit": 200}),
+    )
+    return [full, delta, page]
+
+
+def bench_api_process(ctx: BenchContext) -> BenchResult:
+    client, service = _api_client(10)
+    latencies: List[float] = []
+    lock = threading.Lock()
+
+    def _submit(index: int) -> str:
+        started = time.perf_counter()
+        job_id = client.post("/process", json={"url": f"https://example.invalid/concurrent/{index}"}).json()["job_id"]
+        with lock:
+            latencies.append(time.perf_counter() - started)
+        return job_id
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        job_ids = list(pool.map(_submit, range(ctx.concurrent_requests)))
+    _wait_finished(service, job_ids)
+    elapsed = time.perf_counter() - started
+    result = BenchResult("api_process_concurrent", latencies, unit_name="requests")
+    result.extra["jobs_per_second_end_to_end"] = round(len(job_ids) / elapsed, 1)
+    return result
+
+
+SUITES: Dict[str, Callable[[BenchContext], object]] = {
+    "formatter": bench_markdown,
+    "transcribe": bench_transcribe,
+    "generate": bench_generate,
+    "process_episode": bench_process_episode,
+    "api_status": bench_api_status,
+    "api_process": bench_api_process,
+}
+
+
+def run(ctx: BenchContext, names: List[str]) -> List[Dict]:
+    synthetic_audio(ctx.audio_path, ctx.audio_seconds)
+    FakeYoutubeDL.source = ctx.audio_path
+    results: List[Dict] = []
+    with OllamaStub(ctx.ollama) as ollama:
+        os.environ["OLLAMA_HOST"] = ollama.url
+        for name in names:
+            outcome = SUITES[name](ctx)
+            for result in outcome if isinstance(outcome, list) else [outcome]:
+                results.append(result.summary())
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    results.append({"name": "process", "peak_rss_mb": round(maxrss / (1024**2 if sys.platform == "darwin" else 1024), 1)})
+    return results
@@ -1,8 +1,14 @@
 import argparse
 import sys
+from pathlib import Path
+from typing import Callable, Dict, List
 
+from podcast_engine.config import load_settings
 from podcast_engine.logger import get_logger
-from podcast_engine.main import process_episode
+from podcast_engine.main import process_batch, process_episode, process_feed
+from podcast_engine.utils.embeddings import semantic_search, sync_directory
+from podcast_engine.utils.formatter import format_timestamp
+from podcast_engine.utils.search import TranscriptIndex
 
 logger = get_logger("podcast_engine.cli")
 
@@ -11,14 +17,143 @@ def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
         description="Offline podcast transcription and summarisation engine for Spotify episodes.",
     )
-    parser.add_argument("episode_url", help="Spotify podcast episode URL")
+    parser.add_argument("episode_url", nargs="?", help="Spotify podcast episode URL")
+    parser.add_argument(
+        "--from-file",
+        type=Path,
+        help="Process every URL in this file (one per line, # comments allowed) as a pipelined batch",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Ignore cached downloads, transcripts and LLM outputs and rerun every stage",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Skip stages an earlier run already finished and continue an interrupted chunked transcription",
+    )
+    return parser
+
+
+def build_search_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m podcast_engine.cli search",
+        description="Full-text search across all transcripts.",
+    )
+    parser.add_argument("query", help='Words to match; wrap phrases in "quotes"')
+    parser.add_argument("--limit", type=int, default=20, help="Maximum number of segment hits")
+    parser.add_argument("--episode", help="Only search this episode id")
+    parser.add_argument("--reindex", action="store_true", help="Index new or changed transcript files first")
+    return parser
+
+
+def search_main(argv: List[str]) -> int:
+    args = build_search_parser().parse_args(argv)
+    settings = load_settings()
+    index = TranscriptIndex(settings.search_db)
+    if args.reindex:
+        index.sync_directory(settings.transcripts_dir)
+    for hit in index.search(args.query, limit=args.limit, episode_id=args.episode):
+        span = f"{format_timestamp(hit['start'])}-{format_timestamp(hit['end'])}"
+        print(f"{hit['episode_id']}  [{span}]  {hit['snippet']}")
+    return 0
+
+
+def build_semantic_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m podcast_engine.cli semantic",
+        description="Find transcript passages by meaning, using the OLLAMA_EMBED_MODEL embedding index.",
+    )
+    parser.add_argument("query", help="What the passage is about")
+    parser.add_argument("--limit", type=int, default=10, help="Maximum number of passages")
+    parser.add_argument("--episode", help="Only search this episode id")
+    parser.add_argument("--reindex", action="store_true", help="Embed new or changed transcript files first")
+    return parser
+
+
+def semantic_main(argv: List[str]) -> int:
+    args = build_semantic_parser().parse_args(argv)
+    settings = load_settings()
+    try:
+        if args.reindex:
+            sync_directory(settings, settings.transcripts_dir)
+        hits = semantic_search(settings, args.query, limit=args.limit, episode_id=args.episode)
+    except RuntimeError as exc:
+        logger.error("Semantic search failed", extra={"error": str(exc)})
+        return 1
+    for hit in hits:
+        span = f"{format_timestamp(hit['start'])}-{format_timestamp(hit['end'])}"
+        print(f"{hit['score']:.3f}  {hit['episode_id']}  [{span}]  {hit['text']}")
+    return 0
+
+
+def build_feed_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m podcast_engine.cli feed",
+        description="Process new episodes of RSS feeds or playlists; episodes seen before are skipped.",
+    )
+    parser.add_argument("feeds", nargs="+", help="Feed or playlist URL, or a local RSS file")
+    parser.add_argument("--limit", type=int, help="Process at most this many of the newest unseen episodes")
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Ignore cached downloads, transcripts and LLM outputs for the episodes processed",
+    )
     return parser
 
 
+def feed_main(argv: List[str]) -> int:
+    args = build_feed_parser().parse_args(argv)
+    failed = False
+    for feed in args.feeds:
+        try:
+            results = process_feed(feed, force=args.force, limit=args.limit)
+        except Exception as exc:  # noqa: BLE001
+            logger.exception("Feed failed", extra={"feed": feed, "error": str(exc)})
+            failed = True
+            continue
+        for result in results:
+            if result["error"]:
+                logger.error("Processing failed", extra={"url": result["url"], "error": result["error"]})
+                failed = True
+    return 1 if failed else 0
+
+
+SUBCOMMANDS: Dict[str, Callable[[List[str]], int]] = {
+    "search": search_main,
+    "semantic": semantic_main,
+    "feed": feed_main,
+}
+
+
+def _read_urls(path: Path) -> List[str]:
+    lines = path.read_text(encoding="utf-8").splitlines()
+    return [line.strip() for line in lines if line.strip() and not line.strip().startswith("#")]
+
+
 def main(argv: list[str] | None = None) -> int:
-    args = build_parser().parse_args(argv)
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] in SUBCOMMANDS:
+        return SUBCOMMANDS[argv[0]](argv[1:])
+
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if not args.episode_url and not args.from_file:
+        parser.error("provide an episode URL or --from-file")
+
+    if args.from_file:
+        urls = _read_urls(args.from_file)
+        if args.episode_url:
+            urls.insert(0, args.episode_url)
+        results = process_batch(urls, force=args.force, resume=args.resume)
+        for result in results:
+            if result["error"]:
+                logger.error("Processing failed", extra={"url": result["url"], "error": result["error"]})
+        return 1 if any(result["error"] for result in results) else 0
+
     try:
-        process_episode(args.episode_url)
+        process_episode(args.episode_url, force=args.force, resume=args.resume)
     except Exception as exc:  # noqa: BLE001
         logger.exception("Processing failed", extra={"error": str(exc)})
         return 1
@@ -1,5 +1,6 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Dict, Optional
 import os
 
 from dotenv import load_dotenv
@@ -14,6 +15,44 @@ class Settings:
     transcripts_dir: Path
     outputs_dir: Path
     prompts_dir: Path
+    cache_dir: Path
+    state_dir: Path
+    whisper_workers: int = 1
+    whisper_threads: int = 4
+    whisper_processors: int = 1
+    whisper_pooled_threads: Optional[int] = None  # -t of an unchunked run; default whisper_threads * whisper_workers
+    whisper_models: Dict[str, Path] = field(default_factory=dict)  # tier name -> model file, for the scheduler
+    whisper_adaptive: bool = True
+    whisper_max_threads: int = 8
+    whisper_latency_target: float = 1800.0
+    chunk_seconds: int = 600
+    chunk_overlap_seconds: float = 2.0
+    whisper_pipe_input: bool = True
+    whisper_backend: str = "cli"
+    whisper_server_url: str = "http://127.0.0.1:8178"
+    whisper_server_bin: Optional[Path] = None
+    vad_enabled: bool = True
+    vad_threshold_db: float = 12.0
+    vad_min_silence: float = 1.0
+    audio_format: str = "native"
+    archive_mp3: bool = False
+    dedup_enabled: bool = True
+    dedup_min_score: float = 0.1
+    cache_max_bytes: int = 2 * 1024**3
+    job_workers: int = 2
+    download_concurrency: int = 3
+    whisper_concurrency: int = 1
+    llm_concurrency: int = 1
+    batch_queue_size: int = 2
+    llm_backend: str = "http"
+    ollama_host: str = "http://127.0.0.1:11434"
+    ollama_keep_alive: str = "30m"
+    llm_context_tokens: int = 8192
+    embed_model: str = ""
+    embed_window_seconds: float = 30.0
+    embed_batch_size: int = 32
+    log_buffer_size: int = 500
+    job_log_level: str = "info"
 
     @property
     def summaries_dir(self) -> Path:
@@ -23,6 +62,26 @@ class Settings:
     def threads_dir(self) -> Path:
         return self.outputs_dir / "threads"
 
+    @property
+    def search_db(self) -> Path:
+        return self.state_dir / "search.sqlite3"
+
+    @property
+    def fingerprint_db(self) -> Path:
+        return self.state_dir / "fingerprints.sqlite3"
+
+    @property
+    def embeddings_dir(self) -> Path:
+        return self.state_dir / "embeddings"
+
+    @property
+    def stage_limits(self) -> Dict[str, int]:
+        return {
+            "download": self.download_concurrency,
+            "whisper": self.whisper_concurrency,
+            "llm": self.llm_concurrency,
+        }
+
     @property
     def summary_prompt(self) -> Path:
         return self.prompts_dir / "summary.txt"
@@ -31,11 +90,44 @@ class Settings:
     def x_thread_prompt(self) -> Path:
         return self.prompts_dir / "x_thread.txt"
 
+    @property
+    def chunk_summary_prompt(self) -> Path:
+        return self.prompts_dir / "chunk_summary.txt"
+
 
 def _expand_path(value: str) -> Path:
     return Path(value).expanduser().resolve()
 
 
+def _int_env(name: str, default: int) -> int:
+    value = os.getenv(name)
+    return int(value) if value else default
+
+
+def _float_env(name: str, default: float) -> float:
+    value = os.getenv(name)
+    return float(value) if value else default
+
+
+def _bool_env(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if not value:
+        return default
+    return value.strip().lower() not in {"0", "false", "no", "off"}
+
+
+def _models_env(name: str) -> Dict[str, Path]:
+    """
+    ``tier=path`` pairs separated by commas, e.g. ``tiny=./models/ggml-tiny.en.bin,medium=./models/ggml-medium.en.bin``.
+    """
+    models: Dict[str, Path] = {}
+    for entry in os.getenv(name, "").split(","):
+        tier, _, path = entry.partition("=")
+        if tier.strip() and path.strip():
+            models[tier.strip().lower()] = _expand_path(path.strip())
+    return models
+
+
 def load_settings() -> Settings:
     base_dir = Path(__file__).resolve().parent
     load_dotenv(base_dir / ".env")
@@ -43,13 +135,56 @@ def load_settings() -> Settings:
     whisper_cpp_bin = _expand_path(os.getenv("WHISPER_CPP_BIN", "./whisper.cpp/build/bin/whisper-cli"))
     whisper_model_path = _expand_path(os.getenv("WHISPER_MODEL_PATH", "./models/ggml-small.en.bin"))
     ollama_model = os.getenv("OLLAMA_MODEL", "llama3")
+    llm_backend = os.getenv("LLM_BACKEND", "http").strip().lower()
+    ollama_host = os.getenv("OLLAMA_HOST", "http://127.0.0.1:11434")
+    ollama_keep_alive = os.getenv("OLLAMA_KEEP_ALIVE", "30m")
+    llm_context_tokens = max(1024, _int_env("LLM_CONTEXT_TOKENS", 8192))
+    embed_model = os.getenv("OLLAMA_EMBED_MODEL", "").strip()
+    embed_window_seconds = max(5.0, _float_env("EMBED_WINDOW_SECONDS", 30.0))
+    embed_batch_size = max(1, _int_env("EMBED_BATCH_SIZE", 32))
+    whisper_workers = max(1, _int_env("WHISPER_WORKERS", 1))
+    whisper_threads = max(1, _int_env("WHISPER_THREADS", 4))
+    whisper_processors = max(1, _int_env("WHISPER_PROCESSORS", 1))
+    whisper_models = _models_env("WHISPER_MODELS")
+    whisper_adaptive = _bool_env("WHISPER_ADAPTIVE", True)
+    whisper_max_threads = max(1, _int_env("WHISPER_MAX_THREADS", 8))
+    whisper_latency_target = max(1.0, _float_env("WHISPER_TARGET_SECONDS", 1800.0))
+    chunk_seconds = max(60, _int_env("WHISPER_CHUNK_SECONDS", 600))
+    chunk_overlap_seconds = max(0.0, _float_env("WHISPER_CHUNK_OVERLAP", 2.0))
+    whisper_pipe_input = _bool_env("WHISPER_PIPE_INPUT", True)
+    whisper_backend = os.getenv("WHISPER_BACKEND", "cli").strip().lower()
+    whisper_server_url = os.getenv("WHISPER_SERVER_URL", "http://127.0.0.1:8178")
+    whisper_server_bin: Optional[Path] = None
+    if os.getenv("WHISPER_SERVER_BIN"):
+        whisper_server_bin = _expand_path(os.environ["WHISPER_SERVER_BIN"])
+    elif whisper_cpp_bin.with_name("whisper-server").exists():
+        whisper_server_bin = whisper_cpp_bin.with_name("whisper-server")
+    vad_enabled = _bool_env("WHISPER_VAD", True)
+    vad_threshold_db = _float_env("VAD_THRESHOLD_DB", 12.0)
+    vad_min_silence = max(0.3, _float_env("VAD_MIN_SILENCE", 1.0))
+    audio_format = os.getenv("AUDIO_FORMAT", "native").strip().lower()
+    if audio_format not in {"native", "mp3"}:
+        audio_format = "native"
+    archive_mp3 = _bool_env("ARCHIVE_MP3", False)
+    dedup_enabled = _bool_env("AUDIO_DEDUP", True)
+    dedup_min_score = min(1.0, max(0.01, _float_env("DEDUP_MIN_SCORE", 0.1)))
 
     audio_dir = _expand_path(os.getenv("AUDIO_DIR", str(base_dir / "audio")))
     transcripts_dir = _expand_path(os.getenv("TRANSCRIPTS_DIR", str(base_dir / "transcripts")))
     outputs_dir = _expand_path(os.getenv("OUTPUTS_DIR", str(base_dir / "outputs")))
     prompts_dir = _expand_path(os.getenv("PROMPTS_DIR", str(base_dir / "prompts")))
+    cache_dir = _expand_path(os.getenv("CACHE_DIR", str(base_dir / "cache")))
+    cache_max_bytes = _int_env("CACHE_MAX_MB", 2048) * 1024 * 1024
+    state_dir = _expand_path(os.getenv("STATE_DIR", str(base_dir / "state")))
+    job_workers = max(1, _int_env("JOB_WORKERS", 2))
+    download_concurrency = max(1, _int_env("DOWNLOAD_CONCURRENCY", 3))
+    whisper_concurrency = max(1, _int_env("WHISPER_CONCURRENCY", 1))
+    llm_concurrency = max(1, _int_env("LLM_CONCURRENCY", 1))
+    batch_queue_size = max(1, _int_env("BATCH_QUEUE_SIZE", 2))
+    log_buffer_size = max(1, _int_env("LOG_BUFFER_SIZE", 500))
+    job_log_level = os.getenv("JOB_LOG_LEVEL", "info").strip().lower()
 
-    for path in (audio_dir, transcripts_dir, outputs_dir, prompts_dir, outputs_dir / "summaries", outputs_dir / "threads"):
+    for path in (audio_dir, transcripts_dir, outputs_dir, prompts_dir, cache_dir, state_dir, outputs_dir / "summaries", outputs_dir / "threads"):
         path.mkdir(parents=True, exist_ok=True)
 
     return Settings(
@@ -60,4 +195,41 @@ def load_settings() -> Settings:
         transcripts_dir=transcripts_dir,
         outputs_dir=outputs_dir,
         prompts_dir=prompts_dir,
+        cache_dir=cache_dir,
+        state_dir=state_dir,
+        whisper_workers=whisper_workers,
+        whisper_threads=whisper_threads,
+        whisper_processors=whisper_processors,
+        whisper_models=whisper_models,
+        whisper_adaptive=whisper_adaptive,
+        whisper_max_threads=whisper_max_threads,
+        whisper_latency_target=whisper_latency_target,
+        chunk_seconds=chunk_seconds,
+        chunk_overlap_seconds=chunk_overlap_seconds,
+        whisper_pipe_input=whisper_pipe_input,
+        whisper_backend=whisper_backend,
+        whisper_server_url=whisper_server_url,
+        whisper_server_bin=whisper_server_bin,
+        vad_enabled=vad_enabled,
+        vad_threshold_db=vad_threshold_db,
+        vad_min_silence=vad_min_silence,
+        audio_format=audio_format,
+        archive_mp3=archive_mp3,
+        dedup_enabled=dedup_enabled,
+        dedup_min_score=dedup_min_score,
+        cache_max_bytes=cache_max_bytes,
+        job_workers=job_workers,
+        download_concurrency=download_concurrency,
+        whisper_concurrency=whisper_concurrency,
+        llm_concurrency=llm_concurrency,
+        batch_queue_size=batch_queue_size,
+        llm_backend=llm_backend,
+        ollama_host=ollama_host,
+        ollama_keep_alive=ollama_keep_alive,
+        llm_context_tokens=llm_context_tokens,
+        embed_model=embed_model,
+        embed_window_seconds=embed_window_seconds,
+        embed_batch_size=embed_batch_size,
+        log_buffer_size=log_buffer_size,
+        job_log_level=job_log_level,
     )
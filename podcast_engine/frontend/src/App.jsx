@@ -8,6 +8,18 @@ import './styles.css';
 
 const API_BASE = 'http://localhost:8000';
 
+function formatTimestamp(seconds) {
+  const total = Math.floor(seconds);
+  const h = Math.floor(total / 3600);
+  const m = String(Math.floor((total % 3600) / 60)).padStart(2, '0');
+  const s = String(total % 60).padStart(2, '0');
+  return h ? `${String(h).padStart(2, '0')}:${m}:${s}` : `${m}:${s}`;
+}
+
+function partialToMarkdown(segments) {
+  return segments.map((seg) => `- [${formatTimestamp(seg.start)} - ${formatTimestamp(seg.end)}] ${seg.text}`).join('\n');
+}
+
 function isValidUrl(url) {
   try {
     const parsed = new URL(url);
@@ -19,57 +31,109 @@ function isValidUrl(url) {
 
 export default function App() {
   const [url, setUrl] = useState('');
-  const [status, setStatus] = useState({ state: 'idle', step: null, error: null });
+  const [status, setStatus] = useState({ state: 'idle', step: null, error: null, progress: 0 });
   const [logs, setLogs] = useState([]);
-  const [transcript, setTranscript] = useState('');
+  const [liveSegments, setLiveSegments] = useState([]);
+  const [episodeId, setEpisodeId] = useState(null);
   const [summary, setSummary] = useState('');
   const [thread, setThread] = useState('');
   const [processing, setProcessing] = useState(false);
   const [error, setError] = useState('');
   const poller = useRef(null);
+  const events = useRef(null);
+  const jobId = useRef(null);
+  const cursors = useRef({ logs: 0, segments: 0 });
+  const segments = useRef([]);
+
+  const stopUpdates = () => {
+    if (poller.current) clearInterval(poller.current);
+    poller.current = null;
+    if (events.current) events.current.close();
+    events.current = null;
+  };
+
+  useEffect(() => stopUpdates, []);
+
+  const appendSegments = (items) => {
+    if (!items.length) return;
+    segments.current = segments.current.concat(items);
+    setLiveSegments(segments.current);
+  };
+
+  const handleFinished = async (data) => {
+    stopUpdates();
+    setProcessing(false);
+    if (data.state === 'completed') {
+      await fetchResults();
+    } else if (data.state === 'error' || data.state === 'cancelled') {
+      setError(data.error || (data.state === 'cancelled' ? 'Job cancelled.' : 'Processing failed.'));
+    }
+  };
 
-  useEffect(() => {
-    return () => {
-      if (poller.current) clearInterval(poller.current);
+  // Server-Sent Events push only new logs, segments and tokens; polling is the fallback.
+  const startEvents = () => {
+    stopUpdates();
+    const source = new EventSource(`${API_BASE}/jobs/${jobId.current}/events`);
+    events.current = source;
+    source.addEventListener('status', (e) => setStatus(JSON.parse(e.data)));
+    source.addEventListener('log', (e) => {
+      const entry = JSON.parse(e.data);
+      cursors.current.logs = entry.seq + 1;
+      setLogs((prev) => prev.concat(entry));
+    });
+    source.addEventListener('segment', (e) => {
+      cursors.current.segments += 1;
+      appendSegments([JSON.parse(e.data)]);
+    });
+    source.addEventListener('token', (e) => {
+      const { task, text } = JSON.parse(e.data);
+      if (task === 'summary') setSummary((prev) => prev + text);
+      if (task === 'x_thread') setThread((prev) => prev + text);
+    });
+    source.addEventListener('done', (e) => handleFinished(JSON.parse(e.data)));
+    source.onerror = () => {
+      if (events.current === source) startPolling();
     };
-  }, []);
+  };
 
   const startPolling = () => {
-    if (poller.current) clearInterval(poller.current);
+    stopUpdates();
     poller.current = setInterval(fetchStatus, 2000);
   };
 
   const fetchStatus = async () => {
     try {
-      const res = await fetch(`${API_BASE}/status`);
+      const { logs: since, segments: segmentsSince } = cursors.current;
+      const res = await fetch(`${API_BASE}/jobs/${jobId.current}?since=${since}&segments_since=${segmentsSince}`);
       const data = await res.json();
       setStatus(data);
-      setLogs(data.logs || []);
-      if (data.state === 'completed') {
-        clearInterval(poller.current);
-        setProcessing(false);
-        await fetchResults();
-      } else if (data.state === 'error') {
-        clearInterval(poller.current);
-        setProcessing(false);
-        setError(data.error || 'Processing failed.');
+      cursors.current = { logs: data.log_cursor, segments: data.segment_cursor };
+      setLogs((prev) => prev.concat(data.logs || []));
+      appendSegments(data.partial_transcript || []);
+      if (data.state === 'running' && data.llm_partial) {
+        if (data.llm_partial.summary) setSummary(data.llm_partial.summary);
+        if (data.llm_partial.x_thread) setThread(data.llm_partial.x_thread);
+      }
+      if (['completed', 'error', 'cancelled'].includes(data.state)) {
+        await handleFinished(data);
       }
     } catch (err) {
       setError(err.message || 'Status check failed.');
       setProcessing(false);
-      if (poller.current) clearInterval(poller.current);
+      stopUpdates();
     }
   };
 
+  // The transcript itself is paged by TranscriptView; only the summary and thread come back here.
   const fetchResults = async () => {
-    const res = await fetch(`${API_BASE}/results`);
+    const res = await fetch(`${API_BASE}/jobs/${jobId.current}/results?transcript=false`);
     if (!res.ok) {
       const detail = await res.text();
       setError(detail);
       return;
     }
     const data = await res.json();
-    setTranscript(data.transcript_markdown);
+    setEpisodeId(data.episode_id);
     setSummary(data.summary_markdown);
     setThread(data.thread_markdown);
   };
@@ -81,9 +145,12 @@ export default function App() {
       return;
     }
     setProcessing(true);
-    setStatus({ state: 'running', step: 'init', error: null });
+    setStatus({ state: 'running', step: 'init', error: null, progress: 0 });
     setLogs([]);
-    setTranscript('');
+    cursors.current = { logs: 0, segments: 0 };
+    segments.current = [];
+    setLiveSegments([]);
+    setEpisodeId(null);
     setSummary('');
     setThread('');
     try {
@@ -96,7 +163,9 @@ export default function App() {
         const detail = await res.json();
         throw new Error(detail.detail || 'Failed to start processing.');
       }
-      startPolling();
+      const data = await res.json();
+      jobId.current = data.job_id;
+      startEvents();
     } catch (err) {
       setError(err.message);
       setProcessing(false);
@@ -112,6 +181,19 @@ export default function App() {
     URL.revokeObjectURL(link.href);
   };
 
+  const downloadTranscript = async () => {
+    if (!episodeId) {
+      downloadFile(partialToMarkdown(segments.current), 'transcript.md');
+      return;
+    }
+    const res = await fetch(`${API_BASE}/jobs/${jobId.current}/results`);
+    if (!res.ok) {
+      setError(await res.text());
+      return;
+    }
+    downloadFile((await res.json()).transcript_markdown, 'transcript.md');
+  };
+
   return (
     <>
       <h1>Podcast Engine</h1>
@@ -119,12 +201,14 @@ export default function App() {
 
       <div className="grid">
         <UrlInput url={url} onChange={setUrl} onSubmit={onSubmit} processing={processing} error={error} />
-        <Progress state={status.state} step={status.step} />
+        <Progress state={status.state} step={status.step} progress={status.progress} />
 
         <div className="grid two">
           <TranscriptView
-            markdown={transcript}
-            onDownload={() => downloadFile(transcript, 'transcript.md')}
+            apiBase={API_BASE}
+            episodeId={episodeId}
+            segments={liveSegments}
+            onDownload={downloadTranscript}
           />
           <OutputEditor
             title="Summary"
@@ -9,14 +9,17 @@ const stepNames = {
   complete: 'Complete',
 };
 
-export default function Progress({ state, step }) {
+export default function Progress({ state, step, progress }) {
   if (state === 'idle') return null;
   const label = stepNames[step] || step || 'Running';
   return (
     <div className="card progress">
       <div className="dot" />
       <div>
-        <div>{label}</div>
+        <div>
+          {label}
+          {state === 'running' && progress > 0 ? ` (${Math.round(progress)}%)` : ''}
+        </div>
         <div className="muted">{state === 'completed' ? 'Finished' : state === 'error' ? 'Error' : 'In progress'}</div>
       </div>
     </div>
@@ -1,13 +1,152 @@
-import React from 'react';
+import React, { useEffect, useRef, useState } from 'react';
+
+const ROW_HEIGHT = 48;
+const VIEWPORT_HEIGHT = 320;
+const PAGE_SIZE = 200;
+const OVERSCAN = 10;
+
+function formatTimestamp(seconds) {
+  const total = Math.floor(seconds);
+  const h = Math.floor(total / 3600);
+  const m = String(Math.floor((total % 3600) / 60)).padStart(2, '0');
+  const s = String(total % 60).padStart(2, '0');
+  return h ? `${String(h).padStart(2, '0')}:${m}:${s}` : `${m}:${s}`;
+}
+
+function parseTimestamp(value) {
+  const parts = value.trim().split(':').map(Number);
+  if (!parts.length || parts.some((part) => Number.isNaN(part))) return null;
+  return parts.reduce((total, part) => total * 60 + part, 0);
+}
+
+// Index of the first segment still playing at `seconds` (segments are in time order).
+function findSegment(segments, seconds) {
+  let lo = 0;
+  let hi = segments.length;
+  while (lo < hi) {
+    const mid = (lo + hi) >> 1;
+    if (segments[mid].end <= seconds) lo = mid + 1;
+    else hi = mid;
+  }
+  return lo;
+}
+
+/*
+ * Renders only the rows in view. While a job runs it shows the live `segments`; once `episodeId` is set it
+ * pages rows from /transcripts/{id}/segments as they scroll into view, and seeks by time on the server.
+ */
+export default function TranscriptView({ apiBase, episodeId, segments, onDownload }) {
+  const viewport = useRef(null);
+  const pages = useRef(new Map());
+  const pending = useRef(new Set());
+  const following = useRef(true);
+  const [total, setTotal] = useState(0);
+  const [scrollTop, setScrollTop] = useState(0);
+  const [, setLoaded] = useState(0);
+  const [seek, setSeek] = useState('');
+
+  const remote = Boolean(episodeId);
+  const count = remote ? total : segments.length;
+
+  const loadPage = async (page) => {
+    if (pages.current.has(page) || pending.current.has(page)) return;
+    pending.current.add(page);
+    try {
+      const res = await fetch(`${apiBase}/transcripts/${episodeId}/segments?offset=${page * PAGE_SIZE}&limit=${PAGE_SIZE}`);
+      if (!res.ok) return;
+      const data = await res.json();
+      pages.current.set(page, data.segments);
+      setTotal(data.total);
+      setLoaded((n) => n + 1);
+    } finally {
+      pending.current.delete(page);
+    }
+  };
+
+  useEffect(() => {
+    pages.current = new Map();
+    setTotal(0);
+    setScrollTop(0);
+    if (viewport.current) viewport.current.scrollTop = 0;
+    if (episodeId) loadPage(0);
+  }, [episodeId]);
+
+  // Keep the newest live segment in view unless the user has scrolled up.
+  useEffect(() => {
+    if (!remote && following.current && viewport.current) {
+      viewport.current.scrollTop = viewport.current.scrollHeight;
+    }
+  }, [segments.length, remote]);
+
+  const first = Math.max(0, Math.floor(scrollTop / ROW_HEIGHT) - OVERSCAN);
+  const last = Math.min(count, Math.ceil((scrollTop + VIEWPORT_HEIGHT) / ROW_HEIGHT) + OVERSCAN);
+
+  useEffect(() => {
+    if (!remote || !count) return;
+    for (let page = Math.floor(first / PAGE_SIZE); page <= Math.floor((last - 1) / PAGE_SIZE); page += 1) {
+      loadPage(page);
+    }
+  }, [remote, first, last, count]);
+
+  const rowAt = (index) => {
+    if (!remote) return segments[index];
+    const page = pages.current.get(Math.floor(index / PAGE_SIZE));
+    return page ? page[index % PAGE_SIZE] : null;
+  };
+
+  const onScroll = (e) => {
+    const el = e.currentTarget;
+    following.current = el.scrollTop + el.clientHeight >= el.scrollHeight - ROW_HEIGHT;
+    setScrollTop(el.scrollTop);
+  };
+
+  const onSeek = async (e) => {
+    e.preventDefault();
+    const seconds = parseTimestamp(seek);
+    if (seconds === null || !viewport.current) return;
+    let index = findSegment(segments, seconds);
+    if (remote) {
+      const res = await fetch(`${apiBase}/transcripts/${episodeId}/segments?start=${seconds}&limit=1`);
+      if (!res.ok) return;
+      index = (await res.json()).offset;
+    }
+    following.current = false;
+    viewport.current.scrollTop = Math.min(index, Math.max(0, count - 1)) * ROW_HEIGHT;
+  };
+
+  const rows = [];
+  for (let index = first; index < last; index += 1) {
+    const seg = rowAt(index);
+    rows.push(
+      <div className="segment-row" key={index} style={{ top: index * ROW_HEIGHT, height: ROW_HEIGHT }}>
+        {seg ? (
+          <>
+            <span className="muted">[{formatTimestamp(seg.start)} - {formatTimestamp(seg.end)}]</span>
+            <span className="segment-text" title={seg.text}>{seg.text}</span>
+          </>
+        ) : (
+          <span className="muted">Loading…</span>
+        )}
+      </div>
+    );
+  }
 
-export default function TranscriptView({ markdown, onDownload }) {
   return (
     <div className="card grid">
       <div className="tabs">
         <div className="tab active">Transcript</div>
-        <button onClick={() => onDownload('transcript')}>Download .md</button>
+        <form className="seek" onSubmit={onSeek}>
+          <input type="text" placeholder="Jump to mm:ss" value={seek} onChange={(e) => setSeek(e.target.value)} />
+        </form>
+        <button onClick={() => onDownload('transcript')} disabled={!count}>Download .md</button>
+      </div>
+      <div className="transcript" ref={viewport} onScroll={onScroll} style={{ height: VIEWPORT_HEIGHT }}>
+        {count ? (
+          <div style={{ height: count * ROW_HEIGHT, position: 'relative' }}>{rows}</div>
+        ) : (
+          <div className="muted">Transcript will appear here.</div>
+        )}
       </div>
-      <textarea className="textarea" readOnly value={markdown || 'Transcript will appear here.'} />
     </div>
   );
 }
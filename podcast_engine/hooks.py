@@ -0,0 +1,94 @@
+import threading
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass
+from typing import Callable, ContextManager, Dict, Iterator, Optional
+
+
+class JobCancelled(Exception):
+    """Raised inside the pipeline when the caller has requested cancellation."""
+
+
+class StageLimiter:
+    """
+    Per-stage concurrency limits shared by every job in a process (e.g. many downloads, one Ollama call at a time).
+    Stages without a configured limit run unbounded.
+    """
+
+    def __init__(self, limits: Dict[str, int]) -> None:
+        self.limits = {stage: max(1, limit) for stage, limit in limits.items()}
+        self._semaphores = {stage: threading.BoundedSemaphore(limit) for stage, limit in self.limits.items()}
+        self._waiting = {stage: 0 for stage in self.limits}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        semaphore = self._semaphores.get(name)
+        if semaphore is None:
+            yield
+            return
+        with self._lock:
+            self._waiting[name] += 1
+        try:
+            semaphore.acquire()
+        finally:
+            with self._lock:
+                self._waiting[name] -= 1
+        try:
+            yield
+        finally:
+            semaphore.release()
+
+    def waiting(self, name: str) -> int:
+        """
+        Callers blocked waiting for a slot in ``name``.
+        """
+        return self._waiting.get(name, 0)
+
+
+@dataclass
+class PipelineHooks:
+    """
+    Optional callbacks and controls a caller (CLI, API service) can pass to ``process_episode`` to observe
+    a run as it happens, bound its stage concurrency and cancel it.
+    """
+
+    on_segment: Optional[Callable[[Dict], None]] = None  # normalized {start, end, text}
+    on_progress: Optional[Callable[[str, float], None]] = None  # (stage, percent 0-100)
+    on_token: Optional[Callable[[str, str], None]] = None  # (llm task, streamed text fragment)
+    on_metrics: Optional[Callable[[str, Dict], None]] = None  # (stage, timing/resource sample) as each stage ends
+    limiter: Optional[StageLimiter] = None
+    cancel_event: Optional[threading.Event] = None
+    backlog: Optional[Callable[[], int]] = None  # jobs accepted but not yet started (a service queue, a batch)
+
+    def segment(self, segment: Dict) -> None:
+        self.check_cancelled()
+        if self.on_segment:
+            self.on_segment(segment)
+
+    def progress(self, stage: str, percent: float) -> None:
+        if self.on_progress:
+            self.on_progress(stage, max(0.0, min(100.0, percent)))
+
+    def token(self, task: str, text: str) -> None:
+        self.check_cancelled()
+        if self.on_token:
+            self.on_token(task, text)
+
+    def metrics(self, stage: str, sample: Dict) -> None:
+        if self.on_metrics:
+            self.on_metrics(stage, sample)
+
+    def stage(self, name: str) -> ContextManager[None]:
+        self.check_cancelled()
+        return self.limiter.stage(name) if self.limiter else nullcontext()
+
+    def queued(self, stage: str) -> int:
+        """
+        Work waiting behind this run for ``stage``: callers blocked on its limit plus the caller's backlog.
+        """
+        waiting = self.limiter.waiting(stage) if self.limiter else 0
+        return waiting + (self.backlog() if self.backlog else 0)
+
+    def check_cancelled(self) -> None:
+        if self.cancel_event is not None and self.cancel_event.is_set():
+            raise JobCancelled("Job was cancelled.")
@@ -1,80 +1,717 @@
+import contextvars
+import json
+import queue
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field, replace
 from pathlib import Path
-from typing import Dict, Tuple
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 
-from podcast_engine.config import load_settings
+from podcast_engine.config import Settings, load_settings
+from podcast_engine.hooks import JobCancelled, PipelineHooks, StageLimiter
 from podcast_engine.logger import get_logger
-from podcast_engine.utils.downloader import download_audio
-from podcast_engine.utils.formatter import save_markdown
-from podcast_engine.utils.llm import generate_content
-from podcast_engine.utils.transcriber import transcribe_audio
+from podcast_engine.metrics import record_llm, record_transcription, stage_timer
+from podcast_engine.utils.cache import ArtifactCache, get_cache, hash_text
+from podcast_engine.utils.checkpoint import Checkpoint, ChunkJournal
+from podcast_engine.utils.downloader import archive_mp3_later, download_audio
+from podcast_engine.utils.embeddings import index_transcript
+from podcast_engine.utils.feeds import FeedState, feed_key, list_entries, new_entries
+from podcast_engine.utils.fingerprint import Fingerprint, FingerprintIndex, Match, align_transcript, fingerprint_audio
+from podcast_engine.utils.formatter import transcript_to_markdown, transcript_to_prompt_text
+from podcast_engine.utils.llm import estimate_tokens, generate_content
+from podcast_engine.utils.process import cancel_scope
+from podcast_engine.utils.scheduler import get_table, model_tier, more_accurate, scheduled
+from podcast_engine.utils.search import TranscriptIndex
+from podcast_engine.utils.summarizer import map_reduce_notes
+from podcast_engine.utils.transcriber import transcribe_audio, transcription_flags
+from podcast_engine.utils.transcript_store import save_transcript
+from podcast_engine.utils.vad import FrameLevels, speech_spans_from_levels
 
 logger = get_logger("podcast_engine")
 
+# A duplicate's transcript is reused when it leaves at most this much of the new audio untranscribed.
+_DEDUP_UNCOVERED_SECONDS = 60.0
+_DEDUP_UNCOVERED_SHARE = 0.05
+
 
 def _episode_id_from(metadata: Dict, audio_path: Path) -> str:
     return metadata.get("id") or audio_path.stem
 
 
-def process_episode(episode_url: str) -> Dict[str, Path]:
-    settings = load_settings()
-    logger.info("Starting processing", extra={"stage": "init", "url": episode_url})
+def _download(
+    episode_url: str,
+    settings: Settings,
+    cache: ArtifactCache,
+    force: bool,
+    hooks: PipelineHooks,
+    sample: Optional[Dict] = None,
+) -> Tuple[Path, Dict]:
+    key = cache.key("download", episode_url, settings.audio_format)
+    cached = None if force else cache.get_json(key)
+    if cached and (settings.audio_dir / cached["audio"]).exists():
+        logger.info("Download cache hit", extra={"stage": "download", "url": episode_url})
+        if sample is not None:
+            sample["cached"] = True
+        return settings.audio_dir / cached["audio"], cached["metadata"]
 
-    audio_path: Path
-    metadata: Dict
-    try:
-        audio_path, metadata = download_audio(episode_url, settings.audio_dir)
-        logger.info(
-            "Audio downloaded",
-            extra={"stage": "download", "audio": str(audio_path), "metadata": metadata},
+    with hooks.stage("download"):
+        audio_path, metadata = download_audio(episode_url, settings.audio_dir, settings.audio_format)
+    cache.put_json(key, {"audio": audio_path.name, "metadata": metadata})
+    return audio_path, metadata
+
+
+def _transcript_key(audio_digest: str, model_path: Path, settings: Settings, cache: ArtifactCache) -> str:
+    # A missing model never matches a stored key; transcribe_audio then reports the real error.
+    model_digest = cache.digest(model_path) if model_path.exists() else ""
+    return cache.key("transcript", audio_digest, model_digest, transcription_flags(settings))
+
+
+def _transcribe(
+    audio_path: Path,
+    settings: Settings,
+    metadata: Dict,
+    cache: ArtifactCache,
+    force: bool,
+    hooks: PipelineHooks,
+    sample: Optional[Dict] = None,
+    journal: Optional[ChunkJournal] = None,
+    speech_spans: Optional[List[Tuple[float, float]]] = None,
+) -> Tuple[Path, Dict]:
+    """
+    Reuse a cached transcript by the configured model or a more accurate one; otherwise let the scheduler pick
+    the model tier, threads and processors once a whisper slot is free, and feed the measured speed back to it.
+    """
+    audio_digest = cache.digest(audio_path)
+    models = [settings.whisper_model_path]
+    if settings.whisper_adaptive:
+        models = more_accurate(settings, model_tier(settings.whisper_model_path))
+    keys = [_transcript_key(audio_digest, model, settings, cache) for model in models]
+    cached = None if force else next(filter(None, map(cache.get_json, keys)), None)
+    duration = float(metadata.get("duration") or 0)
+
+    if not cached:
+        with hooks.stage("whisper"), scheduled(settings, duration, hooks.queued("whisper")) as plan:
+            planned = plan.apply(settings)
+            key = _transcript_key(audio_digest, plan.model_path, planned, cache)
+            # A faster tier chosen under load may have transcribed this audio before.
+            cached = None if force or key in keys else cache.get_json(key)
+            if not cached:
+                # A run resumed from the chunk journal transcribes only the chunks left: its time says nothing
+                # about the speed over the whole duration.
+                partial = journal is not None and journal.started()
+                started = time.perf_counter()
+                transcript_path, transcript = transcribe_audio(
+                    audio_path, planned, metadata, hooks=hooks, journal=journal, speech_spans=speech_spans
+                )
+                if not partial:
+                    get_table(settings).record(plan.tier, plan.total_threads, duration, time.perf_counter() - started)
+                cache.put_json(key, transcript)
+                if sample is not None:
+                    sample.update(plan.summary())
+                return transcript_path, transcript
+
+    logger.info("Transcription cache hit", extra={"stage": "transcription"})
+    if sample is not None:
+        sample["cached"] = True
+    cached.update(
+        source_url=metadata.get("url"),
+        title=metadata.get("title"),
+        duration=int(metadata.get("duration") or 0),
+    )
+    episode_id = _episode_id_from(metadata, audio_path)
+    transcript_path = settings.transcripts_dir / f"{episode_id}.json"
+    save_transcript(transcript_path, cached)
+    TranscriptIndex(settings.search_db).index_transcript(episode_id, cached, mtime=transcript_path.stat().st_mtime)
+    hooks.progress("transcription", 100.0)
+    return transcript_path, cached
+
+
+def _generate(
+    settings: Settings,
+    prompt_path: Path,
+    transcript_markdown: str,
+    task: str,
+    cache: ArtifactCache,
+    force: bool,
+    hooks: PipelineHooks,
+    stream: bool = True,
+    sample: Optional[Dict] = None,
+) -> str:
+    key = cache.key("llm", hash_text(transcript_markdown), cache.digest(prompt_path), settings.ollama_model)
+    cached = None if force else cache.get_text(key)
+    if cached is not None:
+        logger.info("LLM cache hit", extra={"stage": "llm", "task": task})
+        if sample is not None:
+            sample["cached"] = True
+        return cached
+
+    def _on_stats(stats: Dict) -> None:
+        usage = record_llm("chunk_notes" if task.startswith("chunk_") else task, stats)
+        if sample is not None:
+            sample.update(usage)
+
+    with hooks.stage("llm"):
+        text = generate_content(
+            settings.ollama_model,
+            prompt_path,
+            transcript_markdown,
+            task,
+            host=settings.ollama_host if settings.llm_backend == "http" else None,
+            keep_alive=settings.ollama_keep_alive,
+            on_token=(lambda token: hooks.token(task, token)) if stream else (lambda token: hooks.check_cancelled()),
+            on_stats=_on_stats,
+            num_ctx=settings.llm_context_tokens,
         )
+    cache.put_text(key, text)
+    return text
+
+
+@dataclass
+class _EpisodeRun:
+    """
+    State of one episode as it moves through the download, transcription and output stages.
+    """
+
+    url: str
+    settings: Settings
+    cache: ArtifactCache
+    hooks: PipelineHooks
+    force: bool
+    checkpoint: Checkpoint
+    resume: bool = False
+    audio_path: Optional[Path] = None
+    metadata: Dict = field(default_factory=dict)
+    transcript_json_path: Optional[Path] = None
+    transcript_data: Optional[Dict] = None
+    paths: Optional[Dict[str, Path]] = None
+    duplicate_of: Optional[str] = None  # episode whose audio this is, with its transcript and outputs reused
+    speech_spans: Optional[List[Tuple[float, float]]] = None  # VAD result of the fingerprint pass's decode
+    timings: Dict[str, float] = field(default_factory=dict)
+    metrics: Dict[str, Dict] = field(default_factory=dict)  # stage -> wall/CPU/RSS sample, see metrics.stage_timer
+    error: Optional[Exception] = None
+
+
+@contextmanager
+def _measured(run: _EpisodeRun, stage: str) -> Iterator[Dict]:
+    """
+    Time ``stage`` for this episode into ``run.metrics`` and pass the finished sample to ``hooks.metrics``.
+    """
+    try:
+        with stage_timer(stage, run.metrics) as sample:
+            yield sample
+    finally:
+        if stage in run.metrics:
+            run.hooks.metrics(stage, run.metrics[stage])
+
+
+def _resumed(run: _EpisodeRun, stage: str, inputs: str = "") -> Optional[Dict]:
+    """
+    The checkpoint record of ``stage`` when resuming and it already finished for these inputs.
+    """
+    if not run.resume:
+        return None
+    record = run.checkpoint.completed(stage, inputs)
+    if record is not None:
+        logger.info("Stage already complete; skipping", extra={"stage": stage, "completed_at": record["completed_at"]})
+    return record
+
+
+def _new_run(
+    url: str,
+    settings: Settings,
+    cache: ArtifactCache,
+    hooks: PipelineHooks,
+    force: bool,
+    resume: bool,
+) -> _EpisodeRun:
+    checkpoint = Checkpoint.for_url(settings.state_dir, url, cache.digest)
+    if force:
+        checkpoint.reset()
+    return _EpisodeRun(url=url, settings=settings, cache=cache, hooks=hooks, force=force, checkpoint=checkpoint, resume=resume)
+
+
+def _download_stage(run: _EpisodeRun) -> None:
+    started = time.perf_counter()
+    try:
+        with _measured(run, "download") as sample:
+            record = _resumed(run, "download")
+            if record is not None:
+                run.audio_path, run.metadata = record["artifacts"]["audio"], record["data"]["metadata"]
+                sample["resumed"] = True
+            else:
+                run.audio_path, run.metadata = _download(run.url, run.settings, run.cache, run.force, run.hooks, sample)
+                run.checkpoint.complete("download", {"audio": run.audio_path}, data={"metadata": run.metadata})
+        if run.settings.archive_mp3:
+            archive_mp3_later(run.audio_path)
     except Exception as exc:  # noqa: BLE001
         logger.exception("Audio download failed", extra={"stage": "download", "error": str(exc)})
         raise
+    run.timings["download"] = time.perf_counter() - started
+    logger.info(
+        "Audio downloaded",
+        extra={
+            "stage": "download",
+            "audio": str(run.audio_path),
+            "metadata": run.metadata,
+            "duration_seconds": round(run.timings["download"], 3),
+            "metrics": sample,
+        },
+    )
+
 
+def _find_duplicate(
+    run: _EpisodeRun, episode_id: str, audio_digest: str, sample: Dict
+) -> Tuple[Optional[Fingerprint], Optional[Match]]:
+    """
+    Fingerprint the episode's audio (unless it is already indexed under this ID) and look for an episode
+    processed under another URL or ID whose transcript covers this audio, give or take a different intro or outro.
+    Returns the fingerprint to index once the transcript exists, and the match if there is one. With VAD on,
+    the same decode yields ``run.speech_spans`` for transcription.
+    """
+    settings = run.settings
+    assert run.audio_path is not None
+    if not settings.dedup_enabled:
+        return None, None
+    index = FingerprintIndex(settings.fingerprint_db)
+    if index.source(episode_id) == audio_digest:
+        return None, None
     try:
-        transcript_json_path, transcript_data = transcribe_audio(audio_path, settings, metadata)
-        logger.info(
-            "Transcription complete",
-            extra={"stage": "transcription", "transcript": str(transcript_json_path)},
+        levels = FrameLevels() if settings.vad_enabled else None
+        with stage_timer("fingerprint"):
+            fingerprint = fingerprint_audio(run.audio_path, levels)
+        if levels is not None:
+            run.speech_spans = speech_spans_from_levels(
+                levels.levels, threshold_db=settings.vad_threshold_db, min_silence=settings.vad_min_silence
+            )
+        match = None if run.force else index.match(fingerprint, exclude=episode_id, min_score=settings.dedup_min_score)
+    except JobCancelled:
+        raise
+    except Exception as exc:  # noqa: BLE001
+        logger.warning(
+            "Fingerprinting failed; transcribing in full", extra={"stage": "transcription", "error": str(exc)}
         )
+        return None, None
+    if match is None or not (settings.transcripts_dir / f"{match.episode_id}.json").exists():
+        return fingerprint, None
+
+    duration = fingerprint.duration
+    covered = max(0.0, min(duration, match.offset + match.duration) - max(0.0, match.offset))
+    details = {"stage": "transcription", "duplicate_of": match.episode_id, "offset": match.offset, "score": match.score}
+    if duration - covered > max(_DEDUP_UNCOVERED_SECONDS, _DEDUP_UNCOVERED_SHARE * duration):
+        logger.info("Audio overlaps an earlier episode too little to reuse it", extra=details)
+        return fingerprint, None
+    logger.info("Duplicate audio; reusing the earlier transcript", extra=details)
+    sample.update(duplicate_of=match.episode_id, offset=match.offset, score=match.score)
+    return fingerprint, match
+
+
+def _reuse_transcript(run: _EpisodeRun, episode_id: str, match: Match) -> Tuple[Path, Dict]:
+    settings = run.settings
+    source = json.loads((settings.transcripts_dir / f"{match.episode_id}.json").read_text(encoding="utf-8"))
+    duration = int(run.metadata.get("duration") or 0)
+    transcript = align_transcript(source, match.offset, duration)
+    transcript.update(source_url=run.metadata.get("url"), title=run.metadata.get("title"), duration=duration)
+    transcript_path = settings.transcripts_dir / f"{episode_id}.json"
+    save_transcript(transcript_path, transcript)
+    TranscriptIndex(settings.search_db).index_transcript(episode_id, transcript, mtime=transcript_path.stat().st_mtime)
+    run.hooks.progress("transcription", 100.0)
+    return transcript_path, transcript
+
+
+def _transcribe_stage(run: _EpisodeRun) -> None:
+    assert run.audio_path is not None
+    started = time.perf_counter()
+    try:
+        with _measured(run, "transcription") as sample:
+            inputs = run.cache.digest(run.audio_path)
+            record = _resumed(run, "transcription", inputs)
+            if record is not None:
+                run.transcript_json_path = record["artifacts"]["transcript_json"]
+                run.transcript_data = json.loads(run.transcript_json_path.read_text(encoding="utf-8"))
+                run.duplicate_of = record["data"].get("duplicate_of")
+                run.hooks.progress("transcription", 100.0)
+                sample["resumed"] = True
+            else:
+                episode_id = _episode_id_from(run.metadata, run.audio_path)
+                fingerprint, match = _find_duplicate(run, episode_id, inputs, sample)
+                if match is not None:
+                    run.duplicate_of = match.episode_id
+                    run.transcript_json_path, run.transcript_data = _reuse_transcript(run, episode_id, match)
+                else:
+                    journal = run.checkpoint.chunk_journal()
+                    if not run.resume:
+                        journal.discard()
+                    run.transcript_json_path, run.transcript_data = _transcribe(
+                        run.audio_path,
+                        run.settings,
+                        run.metadata,
+                        run.cache,
+                        run.force,
+                        run.hooks,
+                        sample,
+                        journal,
+                        speech_spans=run.speech_spans,
+                    )
+                if fingerprint is not None:
+                    FingerprintIndex(run.settings.fingerprint_db).add(episode_id, inputs, fingerprint)
+                run.checkpoint.complete(
+                    "transcription",
+                    {"transcript_json": run.transcript_json_path},
+                    inputs,
+                    data={"duplicate_of": run.duplicate_of},
+                )
+            if not sample.get("cached") and not sample.get("resumed") and not run.duplicate_of:
+                audio_seconds = float(run.transcript_data.get("duration") or 0)
+                sample["audio_seconds"] = audio_seconds
+                sample["realtime_factor"] = record_transcription(audio_seconds, time.perf_counter() - started)
     except Exception as exc:  # noqa: BLE001
         logger.exception("Transcription failed", extra={"stage": "transcription", "error": str(exc)})
         raise
+    run.timings["transcription"] = time.perf_counter() - started
+    logger.info(
+        "Transcription complete",
+        extra={
+            "stage": "transcription",
+            "transcript": str(run.transcript_json_path),
+            "duration_seconds": round(run.timings["transcription"], 3),
+            "metrics": sample,
+        },
+    )
 
-    episode_id = _episode_id_from(metadata, audio_path)
-    transcript_md_path = settings.transcripts_dir / f"{episode_id}.md"
-    save_markdown(transcript_data, transcript_md_path)
+
+def _llm_input(run: _EpisodeRun, transcript_markdown: str) -> str:
+    """
+    The transcript text handed to the summary and thread prompts, built once in memory in the compact paragraph
+    form. Transcripts over half the model context are map-reduced into cached section notes first, so both
+    tasks reuse one set of chunk summaries.
+    """
+    settings = run.settings
+    assert run.transcript_data is not None
+    prompt_text = transcript_to_prompt_text(run.transcript_data)
+    markdown_tokens = estimate_tokens(transcript_markdown)
+    prompt_tokens = estimate_tokens(prompt_text)
+    logger.info(
+        "Prepared LLM transcript",
+        extra={
+            "stage": "llm",
+            "markdown_tokens": markdown_tokens,
+            "prompt_tokens": prompt_tokens,
+            "token_reduction": round(1.0 - prompt_tokens / markdown_tokens, 3) if markdown_tokens else 0.0,
+        },
+    )
+
+    budget = settings.llm_context_tokens // 2
+    if prompt_tokens <= budget:
+        return prompt_text
+
+    segments = run.transcript_data.get("segments", [])
+    logger.info(
+        "Transcript exceeds context budget; summarising in chunks",
+        extra={"stage": "llm", "tokens": prompt_tokens, "budget": budget},
+    )
+
+    def _summarize(text: str, task: str) -> str:
+        with stage_timer("llm_chunk_notes"):
+            return _generate(settings, settings.chunk_summary_prompt, text, task, run.cache, run.force, run.hooks, stream=False)
+
+    return map_reduce_notes(
+        segments,
+        budget,
+        _summarize,
+        max_workers=settings.llm_concurrency,
+        on_progress=lambda percent: run.hooks.progress("llm", percent),
+    )
+
+
+def _output_path(settings: Settings, task: str, episode_id: str) -> Path:
+    if task == "summary":
+        return settings.summaries_dir / f"{episode_id}_summary.md"
+    return settings.threads_dir / f"{episode_id}_x_thread.md"
+
+
+def _outputs_stage(run: _EpisodeRun) -> None:
+    assert run.audio_path is not None and run.transcript_data is not None and run.transcript_json_path is not None
+    settings, cache, force, hooks = run.settings, run.cache, run.force, run.hooks
+
+    started = time.perf_counter()
+    transcript_digest = cache.digest(run.transcript_json_path)
+    with _measured(run, "formatting") as sample:
+        episode_id = _episode_id_from(run.metadata, run.audio_path)
+        record = _resumed(run, "formatting", transcript_digest)
+        if record is not None:
+            transcript_md_path = record["artifacts"]["transcript_md"]
+            transcript_markdown = transcript_md_path.read_text(encoding="utf-8")
+            sample["resumed"] = True
+        else:
+            transcript_md_path = settings.transcripts_dir / f"{episode_id}.md"
+            transcript_markdown = transcript_to_markdown(run.transcript_data)
+            transcript_md_path.write_text(transcript_markdown, encoding="utf-8")
+            run.checkpoint.complete("formatting", {"transcript_md": transcript_md_path}, transcript_digest)
+    run.timings["formatting"] = time.perf_counter() - started
     logger.info(
         "Formatted transcript saved",
-        extra={"stage": "formatting", "markdown": str(transcript_md_path)},
+        extra={
+            "stage": "formatting",
+            "markdown": str(transcript_md_path),
+            "duration_seconds": round(run.timings["formatting"], 3),
+        },
     )
 
-    transcript_markdown = transcript_md_path.read_text(encoding="utf-8")
+    summary_output = _output_path(settings, "summary", episode_id)
+    thread_output = _output_path(settings, "x_thread", episode_id)
+    tasks = [
+        ("summary", settings.summary_prompt, summary_output, "Summary"),
+        ("x_thread", settings.x_thread_prompt, thread_output, "X thread"),
+    ]
+    task_inputs = {
+        # The context size decides how long transcripts are chunked into notes, and so what the model is given.
+        task: cache.key(
+            transcript_digest, cache.digest(prompt_path), settings.ollama_model, str(settings.llm_context_tokens)
+        )
+        for task, prompt_path, _, _ in tasks
+    }
+    pending = []
+    for task, prompt_path, output_path, label in tasks:
+        record = _resumed(run, f"llm_{task}", task_inputs[task])
+        if record is not None and record["artifacts"]["output"] == output_path:
+            continue
+        pending.append((task, prompt_path, output_path, label))
 
-    summary_output = settings.summaries_dir / f"{episode_id}_summary.md"
-    thread_output = settings.threads_dir / f"{episode_id}_x_thread.md"
+    # A duplicate of an earlier episode takes that episode's summary and thread; they do not quote timestamps.
+    if run.duplicate_of is not None:
+        for entry in list(pending):
+            task, _, output_path, label = entry
+            source = _output_path(settings, task, run.duplicate_of)
+            if not source.exists():
+                continue
+            shutil.copyfile(source, output_path)
+            run.checkpoint.complete(f"llm_{task}", {"output": output_path}, task_inputs[task])
+            pending.remove(entry)
+            logger.info(
+                f"{label} reused from duplicate",
+                extra={"stage": "llm", "output": str(output_path), "duplicate_of": run.duplicate_of},
+            )
 
-    try:
-        summary_text = generate_content(settings.ollama_model, settings.summary_prompt, transcript_markdown, "summary")
-        summary_output.write_text(summary_text + "\n", encoding="utf-8")
-        logger.info("Summary generated", extra={"stage": "llm", "output": str(summary_output)})
-    except Exception as exc:  # noqa: BLE001
-        logger.exception("Summary generation failed", extra={"stage": "llm", "error": str(exc)})
-        raise
+    llm_input = ""
+    if pending:
+        with _measured(run, "llm_input"):
+            llm_input = _llm_input(run, transcript_markdown)
 
-    try:
-        thread_text = generate_content(settings.ollama_model, settings.x_thread_prompt, transcript_markdown, "x_thread")
-        thread_output.write_text(thread_text + "\n", encoding="utf-8")
-        logger.info("X thread generated", extra={"stage": "llm", "output": str(thread_output)})
-    except Exception as exc:  # noqa: BLE001
-        logger.exception("Thread generation failed", extra={"stage": "llm", "error": str(exc)})
-        raise
+    def _task(task: str, prompt_path: Path, output_path: Path, label: str) -> None:
+        try:
+            with _measured(run, f"llm_{task}") as sample:
+                text = _generate(settings, prompt_path, llm_input, task, cache, force, hooks, sample=sample)
+                output_path.write_text(text + "\n", encoding="utf-8")
+                run.checkpoint.complete(f"llm_{task}", {"output": output_path}, task_inputs[task])
+            logger.info(f"{label} generated", extra={"stage": "llm", "output": str(output_path), "metrics": sample})
+        except Exception as exc:  # noqa: BLE001
+            logger.exception(f"{label} generation failed", extra={"stage": "llm", "error": str(exc)})
+            raise
+
+    # Both tasks are submitted together; the "llm" stage limit decides whether Ollama runs them in parallel.
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        futures = [pool.submit(contextvars.copy_context().run, _task, *args) for args in pending]
+        for future in futures:
+            future.result()
+    run.timings["llm"] = time.perf_counter() - started
 
-    logger.info("Processing finished", extra={"stage": "complete"})
-    return {
-        "audio": audio_path,
-        "transcript_json": transcript_json_path,
+    run.paths = {
+        "audio": run.audio_path,
+        "transcript_json": run.transcript_json_path,
         "transcript_md": transcript_md_path,
         "summary": summary_output,
         "thread": thread_output,
     }
+
+
+def _embedding_stage(run: _EpisodeRun) -> None:
+    """
+    Add the transcript to the semantic index when ``OLLAMA_EMBED_MODEL`` is set. Runs after the summary and
+    thread so they are not delayed, shares the Ollama stage limit, and a failure only costs search coverage.
+    """
+    settings = run.settings
+    if not settings.embed_model:
+        return
+    assert run.audio_path is not None and run.transcript_data is not None and run.transcript_json_path is not None
+    started = time.perf_counter()
+    try:
+        with _measured(run, "embedding") as sample, run.hooks.stage("llm"):
+            episode_id = _episode_id_from(run.metadata, run.audio_path)
+            sample["windows"] = index_transcript(settings, episode_id, run.transcript_data, run.transcript_json_path)
+    except JobCancelled:
+        raise
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("Embedding failed; semantic search will miss this episode", extra={"stage": "embedding", "error": str(exc)})
+        return
+    run.timings["embedding"] = time.perf_counter() - started
+    logger.info(
+        "Transcript embedded",
+        extra={"stage": "embedding", "windows": sample["windows"], "duration_seconds": round(run.timings["embedding"], 3)},
+    )
+
+
+_STAGES: List[Tuple[str, Callable[[_EpisodeRun], None]]] = [
+    ("download", _download_stage),
+    ("whisper", _transcribe_stage),
+    ("llm", _outputs_stage),
+    ("embed", _embedding_stage),
+]
+
+
+def _with_limiter(hooks: Optional[PipelineHooks], settings: Settings) -> PipelineHooks:
+    hooks = hooks or PipelineHooks()
+    if hooks.limiter is None:
+        hooks = replace(hooks, limiter=StageLimiter(settings.stage_limits))
+    return hooks
+
+
+def process_episode(
+    episode_url: str,
+    hooks: Optional[PipelineHooks] = None,
+    force: bool = False,
+    resume: bool = False,
+) -> Dict[str, Path]:
+    """
+    Run the full pipeline for one episode. Artifacts already produced for the same inputs are reused from the
+    cache unless ``force`` is set. ``hooks`` can bound per-stage concurrency and cancel between stages.
+    Finished stages are recorded in a per-episode checkpoint; with ``resume`` set, stages whose recorded
+    artifacts are intact are skipped and an interrupted chunked transcription continues from its last chunk.
+    """
+    settings = load_settings()
+    cache = get_cache(settings)
+    run = _new_run(episode_url, settings, cache, _with_limiter(hooks, settings), force, resume)
+    logger.info("Starting processing", extra={"stage": "init", "url": episode_url})
+    # External tools started by any stage are killed as soon as the caller cancels (``process.cancel_children``).
+    with cancel_scope(run.hooks.cancel_event):
+        for _, stage in _STAGES:
+            stage(run)
+
+    logger.info("Processing finished", extra={"stage": "complete", "timings": run.timings, "metrics": run.metrics})
+    assert run.paths is not None
+    return run.paths
+
+
+def process_batch(
+    episode_urls: List[str],
+    hooks: Optional[PipelineHooks] = None,
+    force: bool = False,
+    resume: bool = False,
+) -> List[Dict]:
+    """
+    Process many episodes with the stages pipelined: episode N+1 downloads while N transcribes and N-1 is
+    summarised. Each stage runs as many workers as its concurrency limit in ``Settings``; bounded queues
+    between stages (``BATCH_QUEUE_SIZE``) stop downloads racing far ahead of whisper.
+
+    Returns one ``{"url", "paths", "error", "timings", "metrics"}`` dict per URL, in input order. A failed episode does
+    not stop the batch. ``resume`` skips checkpointed stages as in ``process_episode``.
+    """
+    settings = load_settings()
+    inboxes: List["queue.Queue[Optional[_EpisodeRun]]"] = [queue.Queue()] + [
+        queue.Queue(maxsize=settings.batch_queue_size) for _ in _STAGES[1:]
+    ]
+    hooks = _with_limiter(hooks, settings)
+    if hooks.backlog is None:
+        # Downloaded episodes waiting for whisper; the transcription scheduler trades model size for throughput.
+        hooks = replace(hooks, backlog=inboxes[1].qsize)
+    cache = get_cache(settings)
+    runs = [_new_run(url, settings, cache, hooks, force, resume) for url in episode_urls]
+    logger.info("Starting batch", extra={"stage": "init", "episodes": len(runs)})
+
+    started = time.perf_counter()
+
+    def _worker(stage: Callable[[_EpisodeRun], None], inbox: "queue.Queue", outbox: Optional["queue.Queue"]) -> None:
+        while True:
+            run = inbox.get()
+            if run is None:
+                return
+            if run.error is None:
+                try:
+                    with cancel_scope(run.hooks.cancel_event):
+                        stage(run)
+                except Exception as exc:  # noqa: BLE001
+                    run.error = exc
+            if outbox is not None:
+                outbox.put(run)
+
+    layers: List[List[threading.Thread]] = []
+    for index, (name, stage) in enumerate(_STAGES):
+        outbox = inboxes[index + 1] if index + 1 < len(inboxes) else None
+        workers = [
+            threading.Thread(target=_worker, args=(stage, inboxes[index], outbox), name=f"batch-{name}-{n}", daemon=True)
+            for n in range(settings.stage_limits.get(name, 1))
+        ]
+        for worker in workers:
+            worker.start()
+        layers.append(workers)
+
+    for run in runs:
+        inboxes[0].put(run)
+    # Shut stages down front to back so every run drains through the later stages first.
+    for inbox, workers in zip(inboxes, layers):
+        for _ in workers:
+            inbox.put(None)
+        for worker in workers:
+            worker.join()
+
+    totals = {
+        stage: round(sum(run.timings.get(stage, 0.0) for run in runs), 3)
+        for stage in ("download", "transcription", "formatting", "llm", "embedding")
+    }
+    failed = sum(1 for run in runs if run.error is not None)
+    logger.info(
+        "Batch finished",
+        extra={
+            "stage": "complete",
+            "episodes": len(runs),
+            "failed": failed,
+            "wall_seconds": round(time.perf_counter() - started, 3),
+            "stage_seconds": totals,
+        },
+    )
+    return [
+        {
+            "url": run.url,
+            "paths": run.paths,
+            "error": str(run.error) if run.error else None,
+            "timings": run.timings,
+            "metrics": run.metrics,
+        }
+        for run in runs
+    ]
+
+
+def process_feed(
+    feed: str,
+    hooks: Optional[PipelineHooks] = None,
+    force: bool = False,
+    limit: Optional[int] = None,
+) -> List[Dict]:
+    """
+    Process the episodes of an RSS feed or playlist that have not been processed before. Listing the feed is a
+    single metadata fetch; entries already recorded in ``<STATE_DIR>/feeds.json`` never reach the pipeline.
+    New entries go through ``process_batch`` (oldest first, at most ``limit``) and are recorded only once
+    they succeed, so failures are retried on the next poll.
+    """
+    settings = load_settings()
+    state = FeedState(settings.state_dir / "feeds.json")
+    key = feed_key(feed)
+    entries = list_entries(feed)
+    pending = new_entries(entries, state.processed(key), limit=limit)
+    logger.info(
+        "Feed polled",
+        extra={"stage": "init", "feed": feed, "entries": len(entries), "new": len(pending)},
+    )
+    if not pending:
+        state.mark_processed(key, [])
+        return []
+
+    results = process_batch([entry.url for entry in pending], hooks=hooks, force=force)
+    state.mark_processed(key, [entry for entry, result in zip(pending, results) if result["error"] is None])
+    for entry, result in zip(pending, results):
+        result["entry_id"] = entry.id
+        result["title"] = entry.title
+    return results
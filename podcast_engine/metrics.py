@@ -0,0 +1,249 @@
+import resource
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, TypeVar
+
+LabelValues = Tuple[str, ...]
+MetricT = TypeVar("MetricT", bound="_Metric")
+
+_DURATION_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1200, 3600)
+_RATE_BUCKETS = (0.25, 0.5, 1, 2, 4, 8, 16, 32, 64, 128)
+
+
+def _format_labels(names: Sequence[str], values: LabelValues, extra: str = "") -> str:
+    pairs = [f'{name}="{value}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, help_text, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def render(self) -> List[str]:
+        with self._lock:
+            values = dict(self._values)
+        return super().render() + [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}" for key, value in sorted(values.items())
+        ]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, value: float, **labels: str) -> None:
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = _DURATION_BUCKETS,
+    ) -> None:
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[LabelValues, List[float]] = {}  # per-bucket counts, then sum, then count
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            series = self._series.setdefault(key, [0.0] * (len(self.buckets) + 2))
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[index] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self) -> List[str]:
+        with self._lock:
+            all_series = {key: list(series) for key, series in self._series.items()}
+        lines = super().render()
+        for key, series in sorted(all_series.items()):
+            for bound, count in zip(self.buckets, series):
+                le = 'le="%g"' % bound
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {_format_value(count)}")
+            le = 'le="+Inf"'
+            lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {_format_value(series[-1])}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(series[-2])}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {_format_value(series[-1])}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._metrics: List[_Metric] = []
+
+    def register(self, metric: MetricT) -> MetricT:
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        """
+        Prometheus text exposition format (version 0.0.4).
+        """
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+STAGE_SECONDS = REGISTRY.register(
+    Histogram("podcast_stage_seconds", "Wall-clock seconds spent in a pipeline stage.", ("stage",))
+)
+STAGE_CPU_SECONDS = REGISTRY.register(
+    Counter("podcast_stage_cpu_seconds_total", "CPU seconds (process and waited children) during a stage.", ("stage",))
+)
+STAGE_RUNS = REGISTRY.register(
+    Counter("podcast_stage_runs_total", "Pipeline stage executions by outcome.", ("stage", "outcome"))
+)
+SUBPROCESS_CPU_SECONDS = REGISTRY.register(
+    Counter("podcast_subprocess_cpu_seconds_total", "CPU seconds used by external tools, all tools together.")
+)
+AUDIO_SECONDS = REGISTRY.register(Counter("podcast_audio_seconds_total", "Seconds of audio transcribed."))
+REALTIME_FACTOR = REGISTRY.register(
+    Histogram(
+        "podcast_transcription_realtime_factor",
+        "Audio seconds transcribed per wall-clock second.",
+        buckets=_RATE_BUCKETS,
+    )
+)
+LLM_TOKENS = REGISTRY.register(
+    Counter("podcast_llm_tokens_total", "Tokens processed by Ollama.", ("task", "kind"))
+)
+LLM_TOKENS_PER_SECOND = REGISTRY.register(
+    Histogram("podcast_llm_tokens_per_second", "Ollama generation throughput.", ("task",), buckets=_RATE_BUCKETS)
+)
+PEAK_RSS_BYTES = REGISTRY.register(Gauge("podcast_peak_rss_bytes", "Peak resident set size.", ("process",)))
+JOBS = REGISTRY.register(Gauge("podcast_jobs", "API jobs by state.", ("state",)))
+
+_children_cpu = {"seen": 0.0}  # children CPU already added to SUBPROCESS_CPU_SECONDS
+_children_cpu_lock = threading.Lock()
+
+
+def _rss_bytes(maxrss: int) -> int:
+    return maxrss if sys.platform == "darwin" else maxrss * 1024  # Linux reports kilobytes
+
+
+def _cpu_seconds() -> float:
+    own = resource.getrusage(resource.RUSAGE_SELF)
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return own.ru_utime + own.ru_stime + children.ru_utime + children.ru_stime
+
+
+def peak_rss() -> Dict[str, int]:
+    return {
+        "self": _rss_bytes(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss),
+        "children": _rss_bytes(resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss),
+    }
+
+
+@contextmanager
+def stage_timer(stage: str, sink: Optional[Dict[str, Dict]] = None) -> Iterator[Dict]:
+    """
+    Time a pipeline stage: wall seconds, CPU seconds and peak RSS go to the registry and into ``sink[stage]``
+    (a per-episode dict that ends up in logs and job results). Callers may add fields to the yielded dict.
+    CPU is measured process-wide, so it over-attributes when stages of different episodes overlap.
+    """
+    sample: Dict = {}
+    started, cpu_started = time.perf_counter(), _cpu_seconds()
+    outcome = "error"
+    try:
+        yield sample
+        outcome = "ok"
+    finally:
+        wall = time.perf_counter() - started
+        cpu = max(0.0, _cpu_seconds() - cpu_started)
+        rss = peak_rss()
+        STAGE_SECONDS.observe(wall, stage=stage)
+        STAGE_CPU_SECONDS.inc(cpu, stage=stage)
+        STAGE_RUNS.inc(stage=stage, outcome=outcome)
+        for process, value in rss.items():
+            PEAK_RSS_BYTES.set(value, process=process)
+        sample.update(
+            {
+                "wall_seconds": round(wall, 3),
+                "cpu_seconds": round(cpu, 3),
+                "peak_rss_mb": round(max(rss.values()) / 1024**2, 1),
+                "outcome": outcome,
+            }
+        )
+        if sink is not None:
+            sink[stage] = sample
+
+
+def record_child_cpu() -> None:
+    """
+    Add the CPU of external tools reaped since the last call to the subprocess counter. Children's rusage is
+    process-wide, so tools that run at once (ffmpeg piping into whisper) cannot be told apart and the counter has
+    no per-tool label; reading the running total, rather than a delta around each tool, counts every second once.
+    """
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    with _children_cpu_lock:
+        used = usage.ru_utime + usage.ru_stime - _children_cpu["seen"]
+        if used > 0:
+            _children_cpu["seen"] += used
+            SUBPROCESS_CPU_SECONDS.inc(used)
+
+
+def record_transcription(audio_seconds: float, wall_seconds: float) -> Optional[float]:
+    if audio_seconds <= 0 or wall_seconds <= 0:
+        return None
+    factor = audio_seconds / wall_seconds
+    AUDIO_SECONDS.inc(audio_seconds)
+    REALTIME_FACTOR.observe(factor)
+    return round(factor, 2)
+
+
+def record_llm(task: str, stats: Dict) -> Dict:
+    """
+    Token counts and throughput from the final Ollama stream chunk (durations are in nanoseconds).
+    """
+    prompt_tokens = int(stats.get("prompt_eval_count") or 0)
+    eval_tokens = int(stats.get("eval_count") or 0)
+    eval_seconds = (stats.get("eval_duration") or 0) / 1e9
+    LLM_TOKENS.inc(prompt_tokens, task=task, kind="prompt")
+    LLM_TOKENS.inc(eval_tokens, task=task, kind="eval")
+    summary: Dict = {"prompt_tokens": prompt_tokens, "eval_tokens": eval_tokens}
+    if eval_tokens and eval_seconds:
+        summary["tokens_per_second"] = round(eval_tokens / eval_seconds, 1)
+        LLM_TOKENS_PER_SECOND.observe(summary["tokens_per_second"], task=task)
+    return summary
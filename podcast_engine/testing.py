@@ -0,0 +1,329 @@
+"""
+Stand-ins for the pipeline's external tools and services, shared by the benchmarks and the test suite: fake
+ffmpeg/ffprobe/whisper-cli/whisper-server scripts, a fake yt-dlp, a stub Ollama server and synthetic audio.
+"""
+import hashlib
+import json
+import os
+import shutil
+import stat
+import sys
+import threading
+import time
+import wave
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+SAMPLE_RATE = 16000
+
+# Stand-in for ffmpeg/ffprobe: the synthetic audio is already 16 kHz mono WAV, so "decoding" is slicing frames.
+# Supports the flags the pipeline uses: -ss/-t before -i, -af aselect=between(...) and silencedetect, -f wav|s16le.
+_FAKE_FFMPEG = r'''#!{python}
+import re, struct, sys, wave
+
+args = sys.argv[1:]
+if sys.argv[0].endswith("ffprobe"):
+    with wave.open(args[-1]) as w:
+        print(w.getnframes() / w.getframerate())
+    sys.exit(0)
+
+source_index = args.index("-i") + 1
+before = args[:source_index]
+
+def option(flag, scope, default=None):
+    return scope[scope.index(flag) + 1] if flag in scope else default
+
+afilter = option("-af", args, "")
+if "silencedetect" in afilter:
+    sys.exit(0)  # report no silences; chunk planning falls back to hard cuts
+
+with wave.open(args[source_index]) as w:
+    rate = w.getframerate()
+    pcm = w.readframes(w.getnframes())
+start = float(option("-ss", before, 0))
+length = option("-t", before)
+first = int(start * rate) * 2
+last = len(pcm) if length is None else min(len(pcm), first + int(float(length) * rate) * 2)
+pcm = pcm[first:last]
+spans = [(float(a), float(b)) for a, b in re.findall(r"between\(t,([\d.]+),([\d.]+)\)", afilter)]
+if spans:
+    pcm = b"".join(pcm[int(a * rate) * 2:int(b * rate) * 2] for a, b in spans)
+
+out = args[-1]
+stream = sys.stdout.buffer if out == "-" else open(out, "wb")
+if args[args.index("-f", source_index) + 1] == "wav":
+    stream.write(b"RIFF" + struct.pack("<I", 36 + len(pcm)) + b"WAVEfmt " + struct.pack("<IHHIIHH", 16, 1, 1, rate, rate * 2, 2, 16) + b"data" + struct.pack("<I", len(pcm)))
+try:
+    stream.write(pcm)
+    stream.flush()
+except BrokenPipeError:
+    pass
+'''
+
+# Stand-in for whisper-cli: sleeps a model-load time, then emits one segment per 5 s of input at BENCH_WHISPER_RTF
+# times real time, printing live segment lines and writing the -oj JSON like whisper.cpp.
+_FAKE_WHISPER = r'''#!{python}
+import json, os, sys, time
+
+args = sys.argv[1:]
+def option(flag):
+    return args[args.index(flag) + 1]
+
+source = option("-f")
+data = sys.stdin.buffer.read() if source == "-" else open(source, "rb").read()
+seconds = max(0, len(data) - 44) / (2 * 16000)
+time.sleep(float(os.environ.get("BENCH_WHISPER_LOAD", "0.2")))
+rtf = float(os.environ.get("BENCH_WHISPER_RTF", "50"))
+
+def stamp(t):
+    return "%02d:%02d:%06.3f" % (t // 3600, t % 3600 // 60, t % 60)
+
+segments, t = [], 0.0
+while t < seconds:
+    end = min(seconds, t + 5.0)
+    time.sleep((end - t) / rtf)
+    text = "benchmark sentence %d about nothing in particular, spoken at a steady pace" % len(segments)
+    print("[%s --> %s]  %s" % (stamp(t), stamp(end), text), flush=True)
+    segments.append({"offsets": {"from": int(t * 1000), "to": int(end * 1000)}, "text": " " + text})
+    t = end
+with open(option("-of") + ".json", "w") as f:
+    json.dump({"result": {"language": "en"}, "transcription": segments}, f)
+'''
+
+
+# Stand-in for whisper-server: answers /health with 503 for BENCH_WHISPER_LOAD seconds, then 200, and /inference
+# with verbose_json segments (one per 5 s, in seconds) for the WAV in the multipart upload, chunked or not.
+_FAKE_WHISPER_SERVER = r'''#!{python}
+import json, os, sys, time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+args = sys.argv[1:]
+def option(flag):
+    return args[args.index(flag) + 1]
+
+ready_at = time.monotonic() + float(os.environ.get("BENCH_WHISPER_LOAD", "0.2"))
+rtf = float(os.environ.get("BENCH_WHISPER_RTF", "50"))
+print("whisper-server pid=%d model=%s threads=%s" % (os.getpid(), option("-m"), option("-t")), flush=True)
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self._reply(200 if time.monotonic() >= ready_at else 503, {"status": "ok"})
+
+    def do_POST(self):
+        if self.headers.get("Transfer-Encoding") == "chunked":
+            body = bytearray()
+            while True:
+                size = int(self.rfile.readline().strip(), 16)
+                body += self.rfile.read(size)
+                self.rfile.readline()
+                if not size:
+                    break
+        else:
+            body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        boundary = self.headers["Content-Type"].split("boundary=")[1].encode()
+        wav = b""
+        for part in bytes(body).split(b"--" + boundary):
+            head, _, data = part.partition(b"\r\n\r\n")
+            if b'name="file"' in head:
+                wav = data[:-2]  # the CRLF before the next boundary
+        seconds = max(0, len(wav) - 44) / (2 * 16000)
+        segments, t = [], 0.0
+        while t < seconds:
+            end = min(seconds, t + 5.0)
+            segments.append({"start": t, "end": end, "text": " server sentence %d" % len(segments)})
+            t = end
+        time.sleep(seconds / rtf)
+        print("inference bytes=%d" % len(wav), flush=True)
+        self._reply(200, {"language": "en", "duration": seconds, "segments": segments})
+
+    def _reply(self, code, payload):
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        return None
+
+ThreadingHTTPServer((option("--host"), int(option("--port"))), Handler).serve_forever()
+'''
+
+
+def synthetic_audio(path: Path, seconds: float, speech_ratio: float = 0.8, seed: int = 0) -> Path:
+    """
+    16 kHz mono WAV of tone bursts ("speech", 1-6 s) separated by low noise ("dead air"), so VAD has real
+    work to do. ``speech_ratio`` is the rough share of bursts.
+    """
+    rng = np.random.default_rng(seed)
+    total = int(seconds * SAMPLE_RATE)
+    audio = rng.normal(0.0, 0.002, total).astype(np.float32)
+    position = 0
+    while position < total:
+        burst = int(rng.uniform(1.0, 6.0) * SAMPLE_RATE)
+        gap = int(burst * (1.0 - speech_ratio) / max(speech_ratio, 0.05))
+        end = min(total, position + burst)
+        t = np.arange(end - position) / SAMPLE_RATE
+        envelope = 0.5 + 0.5 * np.sin(2 * np.pi * 3.0 * t)  # syllable-rate modulation
+        audio[position:end] += 0.3 * envelope * np.sin(2 * np.pi * rng.uniform(120, 300) * t)
+        position = end + gap
+    pcm = (np.clip(audio, -1.0, 1.0) * 32767).astype("<i2")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with wave.open(str(path), "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(SAMPLE_RATE)
+        w.writeframes(pcm.tobytes())
+    return path
+
+
+def install_tools(bin_dir: Path) -> Dict[str, Path]:
+    """
+    Write executable fake ffmpeg, ffprobe, whisper-cli and whisper-server scripts into ``bin_dir``; prepend it to
+    ``PATH``.
+    """
+    bin_dir.mkdir(parents=True, exist_ok=True)
+    tools = {
+        "ffmpeg": _FAKE_FFMPEG,
+        "ffprobe": _FAKE_FFMPEG,
+        "whisper-cli": _FAKE_WHISPER,
+        "whisper-server": _FAKE_WHISPER_SERVER,
+    }
+    paths = {}
+    for name, source in tools.items():
+        path = bin_dir / name
+        path.write_text(source.replace("{python}", sys.executable), encoding="utf-8")
+        path.chmod(path.stat().st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+        paths[name] = path
+    os.environ["PATH"] = f"{bin_dir}{os.pathsep}{os.environ.get('PATH', '')}"
+    return paths
+
+
+class FakeYoutubeDL:
+    """
+    Drop-in for ``yt_dlp.YoutubeDL`` in ``utils.downloader``: "downloads" by copying the synthetic audio into
+    the output template after ``latency`` seconds.
+    """
+
+    source: Optional[Path] = None
+    latency: float = 0.0
+
+    def __init__(self, opts: Dict) -> None:
+        self.opts = opts
+
+    def __enter__(self) -> "FakeYoutubeDL":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        return None
+
+    def extract_info(self, url: str, download: bool = True) -> Dict:
+        assert self.source is not None
+        episode_id = hashlib.sha1(url.encode("utf-8")).hexdigest()[:12]
+        with wave.open(str(self.source)) as w:
+            duration = w.getnframes() / w.getframerate()
+        info = {"id": episode_id, "title": f"Benchmark {episode_id}", "duration": duration, "webpage_url": url}
+        if download:
+            time.sleep(self.latency)
+            ext = "mp3" if self.opts.get("postprocessors") else "wav"
+            target = Path(self.opts["outtmpl"].replace("%(id)s", episode_id).replace("%(ext)s", ext))
+            shutil.copyfile(self.source, target)
+            info.update(ext=ext, filepath=str(target), requested_downloads=[{"filepath": str(target)}])
+        return info
+
+
+@dataclass
+class OllamaStubConfig:
+    tokens: int = 200
+    token_latency: float = 0.002  # seconds per streamed token
+    first_token_latency: float = 0.05
+    embedding_dim: int = 64
+
+
+def _stub_embedding(text: str, dim: int) -> List[float]:
+    """
+    Deterministic bag-of-words vector: texts sharing words land close together, which is enough to exercise
+    ranking without a model.
+    """
+    vector = [0.0] * dim
+    for word in text.lower().split():
+        digest = hashlib.sha1(word.strip(".,!?").encode("utf-8")).digest()
+        vector[int.from_bytes(digest[:4], "little") % dim] += 1.0
+    return vector
+
+
+class OllamaStub:
+    """
+    Local HTTP server speaking enough of ``/api/generate`` (streamed NDJSON with final stats) and
+    ``/api/embed`` for the client.
+    """
+
+    def __init__(self, config: OllamaStubConfig) -> None:
+        stub_config = config
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self) -> None:  # noqa: N802
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                if self.path == "/api/embed":
+                    inputs = json.loads(body)["input"]
+                    inputs = [inputs] if isinstance(inputs, str) else inputs
+                    data = json.dumps({"embeddings": [_stub_embedding(text, stub_config.embedding_dim) for text in inputs]})
+                    self.send_response(200)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(data)))
+                    self.end_headers()
+                    self.wfile.write(data.encode("utf-8"))
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "application/x-ndjson")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                started = time.perf_counter()
+                time.sleep(stub_config.first_token_latency)
+                for index in range(stub_config.tokens):
+                    time.sleep(stub_config.token_latency)
+                    self._chunk({"response": f"tok{index} ", "done": False})
+                elapsed = time.perf_counter() - started
+                self._chunk(
+                    {
+                        "response": "",
+                        "done": True,
+                        "prompt_eval_count": 1000,
+                        "eval_count": stub_config.tokens,
+                        "eval_duration": int(elapsed * 1e9),
+                    }
+                )
+                self.wfile.write(b"0\r\n\r\n")
+
+            def _chunk(self, payload: Dict) -> None:
+                data = (json.dumps(payload) + "\n").encode("utf-8")
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+
+            def log_message(self, *args) -> None:
+                return None
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self) -> "OllamaStub":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._server.shutdown()
+        self._server.server_close()
@@ -0,0 +1,195 @@
+import atexit
+import fcntl
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+from podcast_engine.config import Settings
+
+
+def hash_text(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+_TOUCH_BATCH = 64  # LRU touches are written with the next change, or once this many pile up
+_TOUCH_FLUSH_SECONDS = 30.0
+
+
+class ArtifactCache:
+    """
+    Content-addressed store for pipeline artifacts (download metadata, transcripts, LLM outputs).
+    Entries are tracked in ``manifest.json`` and evicted least-recently-used once the cache exceeds ``max_bytes``.
+    Several caches (jobs in other processes, or other instances) may share the directory: each change is merged
+    into the manifest on disk under ``manifest.lock`` rather than overwriting it with this instance's view. Use
+    ``get_cache`` to share one instance per process.
+    """
+
+    def __init__(self, root: Path, max_bytes: int) -> None:
+        self.root = root
+        self.max_bytes = max_bytes
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._manifest_path = self.root / "manifest.json"
+        self._lock_path = self.root / "manifest.lock"
+        self._lock = threading.Lock()
+        self._manifest = self._load_manifest()
+        # Changes not yet merged into the manifest on disk.
+        self._added: Dict[str, Dict] = {}
+        self._touched: Dict[str, float] = {}
+        self._digests: Dict[str, str] = {}
+        self._last_flush = time.monotonic()
+
+    @staticmethod
+    def key(*parts: str) -> str:
+        return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+    def _load_manifest(self) -> Dict:
+        if self._manifest_path.exists():
+            try:
+                manifest = json.loads(self._manifest_path.read_text(encoding="utf-8"))
+                manifest.setdefault("entries", {})
+                manifest.setdefault("digests", {})
+                return manifest
+            except (OSError, ValueError):
+                pass
+        return {"entries": {}, "digests": {}}
+
+    def _flush(self) -> None:
+        """
+        Merge pending changes into the manifest on disk, evict, and write it back. Caller holds ``_lock``.
+        """
+        with self._lock_path.open("a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                manifest = self._load_manifest()
+                entries = manifest["entries"]
+                entries.update(self._added)
+                for key, accessed in self._touched.items():
+                    entry = entries.get(key)
+                    if entry is not None:
+                        entry["last_access"] = max(entry["last_access"], accessed)
+                    elif self._entry_path(key).exists():
+                        # A file the manifest lost track of: adopt it so eviction can see it again.
+                        entries[key] = {"size": self._entry_path(key).stat().st_size, "last_access": accessed}
+                manifest["digests"] = _current_digests({**manifest["digests"], **self._digests})
+                self._evict(entries)
+                fd, tmp_name = tempfile.mkstemp(prefix="manifest.", suffix=".tmp", dir=self.root)
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(manifest, f)
+                os.replace(tmp_name, self._manifest_path)
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+        self._manifest = manifest
+        self._added, self._touched, self._digests = {}, {}, {}
+        self._last_flush = time.monotonic()
+
+    def flush(self) -> None:
+        """
+        Write pending LRU touches and file digests (at exit; entries are written as they are added).
+        """
+        with self._lock:
+            if not self.root.is_dir():
+                # The cache directory was removed (a temp dir cleaned up before exit): nothing left to record.
+                self._added, self._touched, self._digests = {}, {}, {}
+            elif self._added or self._touched or self._digests:
+                self._flush()
+
+    def _entry_path(self, key: str) -> Path:
+        return self.root / key[:2] / key
+
+    def digest(self, path: Path) -> str:
+        """
+        SHA-256 of a file's contents, memoized on (path, size, mtime) so large models and audio are hashed once.
+        New digests are written to the manifest with its next change; ones for files since changed or deleted
+        are dropped then.
+        """
+        stat = path.stat()
+        stat_key = f"{path.resolve()}:{stat.st_size}:{stat.st_mtime_ns}"
+        with self._lock:
+            cached = self._digests.get(stat_key) or self._manifest["digests"].get(stat_key)
+        if cached:
+            return cached
+
+        sha = hashlib.sha256()
+        with path.open("rb") as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                sha.update(block)
+        value = sha.hexdigest()
+        with self._lock:
+            self._digests[stat_key] = value
+        return value
+
+    def get_text(self, key: str) -> Optional[str]:
+        entry_path = self._entry_path(key)
+        try:
+            text = entry_path.read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return None
+        with self._lock:
+            self._touched[key] = time.time()
+            if len(self._touched) >= _TOUCH_BATCH or time.monotonic() - self._last_flush > _TOUCH_FLUSH_SECONDS:
+                self._flush()
+        return text
+
+    def put_text(self, key: str, text: str) -> None:
+        entry_path = self._entry_path(key)
+        entry_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(prefix=f"{key}.", suffix=".tmp", dir=entry_path.parent)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp_name, entry_path)
+        with self._lock:
+            self._added[key] = {"size": entry_path.stat().st_size, "last_access": time.time()}
+            self._touched.pop(key, None)
+            self._flush()
+
+    def get_json(self, key: str) -> Optional[Dict]:
+        text = self.get_text(key)
+        return json.loads(text) if text is not None else None
+
+    def put_json(self, key: str, value: Dict) -> None:
+        self.put_text(key, json.dumps(value, ensure_ascii=False))
+
+    def _evict(self, entries: Dict[str, Dict]) -> None:
+        total = sum(entry["size"] for entry in entries.values())
+        for key in sorted(entries, key=lambda k: entries[k]["last_access"]):
+            if total <= self.max_bytes:
+                break
+            total -= entries.pop(key)["size"]
+            self._entry_path(key).unlink(missing_ok=True)
+
+
+def _current_digests(digests: Dict[str, str]) -> Dict[str, str]:
+    """
+    The memoized digests whose file still exists with the size and mtime they were taken at.
+    """
+    current = {}
+    for stat_key, value in digests.items():
+        path, size, mtime_ns = stat_key.rsplit(":", 2)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        if str(stat.st_size) == size and str(stat.st_mtime_ns) == mtime_ns:
+            current[stat_key] = value
+    return current
+
+
+_caches: Dict[Path, ArtifactCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_cache(settings: Settings) -> ArtifactCache:
+    """
+    The process-wide cache for ``settings.cache_dir``, shared by every job; pending touches are written at exit.
+    """
+    with _caches_lock:
+        cache = _caches.get(settings.cache_dir)
+        if cache is None:
+            cache = _caches[settings.cache_dir] = ArtifactCache(settings.cache_dir, settings.cache_max_bytes)
+            atexit.register(cache.flush)
+        return cache
@@ -0,0 +1,139 @@
+import json
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+from podcast_engine.utils.cache import hash_text
+
+
+class ChunkJournal:
+    """
+    Append-only record of the whisper chunks finished for one transcription plan, so a crashed or restarted
+    chunked run only re-transcribes the chunks it had not finished. The first line names the plan; a journal
+    written for a different plan (other audio, model, flags or chunk boundaries) is ignored and replaced.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+
+    def open(self, plan_key: str) -> Dict[int, Dict]:
+        """
+        Raw whisper output of the chunks already finished under ``plan_key``, by chunk index. Starts a fresh
+        journal when there is none for this plan.
+        """
+        done: Dict[int, Dict] = {}
+        with self._lock:
+            if self.path.exists():
+                try:
+                    with self.path.open("r", encoding="utf-8") as f:
+                        header = json.loads(f.readline() or "{}")
+                        if header.get("plan") == plan_key:
+                            for line in f:
+                                try:
+                                    record = json.loads(line)
+                                except ValueError:
+                                    break  # torn final line from a crash mid-write
+                                done[int(record["index"])] = record["raw"]
+                            return done
+                except (OSError, ValueError):
+                    pass
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.path.write_text(json.dumps({"plan": plan_key}) + "\n", encoding="utf-8")
+        return done
+
+    def started(self) -> bool:
+        """
+        Whether any chunk is recorded, under whatever plan: a run that resumes from it transcribes only part of
+        the audio.
+        """
+        with self._lock:
+            try:
+                with self.path.open("r", encoding="utf-8") as f:
+                    return bool(f.readline()) and bool(f.readline().strip())
+            except OSError:
+                return False
+
+    def record(self, index: int, raw: Dict) -> None:
+        line = json.dumps({"index": index, "raw": raw}, ensure_ascii=False) + "\n"
+        with self._lock:
+            with self.path.open("a", encoding="utf-8") as f:
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+
+    def discard(self) -> None:
+        with self._lock:
+            self.path.unlink(missing_ok=True)
+
+
+class Checkpoint:
+    """
+    Per-episode manifest of finished pipeline stages in ``<STATE_DIR>/checkpoints/<url hash>.json``. Each stage
+    records its artifact paths with content digests and a key of the inputs it was built from; a stage counts
+    as complete only while its artifacts are unchanged and its inputs match, so resuming never reuses output
+    derived from different audio, transcripts or prompts.
+    """
+
+    def __init__(self, path: Path, url: str, digest: Callable[[Path], str]) -> None:
+        self.path = path
+        self.url = url
+        self._digest = digest
+        self._lock = threading.Lock()
+        self._stages: Dict[str, Dict] = {}
+        if path.exists():
+            try:
+                record = json.loads(path.read_text(encoding="utf-8"))
+                if record.get("url") == url:
+                    self._stages = record.get("stages", {})
+            except (OSError, ValueError):
+                self._stages = {}
+
+    @classmethod
+    def for_url(cls, state_dir: Path, url: str, digest: Callable[[Path], str]) -> "Checkpoint":
+        return cls(state_dir / "checkpoints" / f"{hash_text(url)[:24]}.json", url, digest)
+
+    def completed(self, stage: str, inputs: str = "") -> Optional[Dict]:
+        """
+        The stage record (``artifacts`` as paths, plus any ``data``) if the stage finished for these inputs and
+        its artifacts still match their digests.
+        """
+        with self._lock:
+            record = self._stages.get(stage)
+        if record is None or record.get("inputs") != inputs:
+            return None
+        artifacts: Dict[str, Path] = {}
+        for name, artifact in record["artifacts"].items():
+            path = Path(artifact["path"])
+            if not path.exists() or self._digest(path) != artifact["sha256"]:
+                return None
+            artifacts[name] = path
+        return {**record, "artifacts": artifacts}
+
+    def complete(self, stage: str, artifacts: Dict[str, Path], inputs: str = "", data: Optional[Dict] = None) -> None:
+        record = {
+            "inputs": inputs,
+            "artifacts": {name: {"path": str(path), "sha256": self._digest(path)} for name, path in artifacts.items()},
+            "data": data or {},
+            "completed_at": datetime.utcnow().isoformat(),
+        }
+        with self._lock:
+            self._stages[stage] = record
+            self._save()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stages = {}
+            self.path.unlink(missing_ok=True)
+        self.chunk_journal().discard()
+
+    def chunk_journal(self) -> ChunkJournal:
+        return ChunkJournal(self.path.with_suffix(".chunks.jsonl"))
+
+    def _save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps({"url": self.url, "stages": self._stages}, indent=2), encoding="utf-8")
+        os.replace(tmp_path, self.path)
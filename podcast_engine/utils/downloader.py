@@ -1,20 +1,32 @@
+import os
 import shutil
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Tuple
+from typing import Dict, Optional, Tuple
 
 from tqdm import tqdm
 from yt_dlp import YoutubeDL
 from yt_dlp.utils import DownloadError, ExtractorError
 
+from podcast_engine.logger import get_logger
+from podcast_engine.utils import process
 
-def download_audio(episode_url: str, output_dir: Path) -> Tuple[Path, Dict]:
+logger = get_logger("podcast_engine")
+
+# One background encoder, so archive copies queue up instead of competing with whisper for every core.
+_ARCHIVE_POOL = ThreadPoolExecutor(max_workers=1, thread_name_prefix="mp3-archive")
+
+
+def download_audio(episode_url: str, output_dir: Path, audio_format: str = "native") -> Tuple[Path, Dict]:
     """
-    Download a Spotify podcast episode as MP3 using yt-dlp.
-    Returns the path to the MP3 file and a metadata dictionary.
+    Download a podcast episode's best audio stream using yt-dlp.
+    ``audio_format="native"`` keeps the source container (m4a/opus/webm) as served, so the only decode is the
+    one transcription does; ``"mp3"`` re-encodes to 192 kbps MP3 as older runs did.
+    Returns the path to the audio file and a metadata dictionary.
     """
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    if shutil.which("ffmpeg") is None:
+    if audio_format == "mp3" and shutil.which("ffmpeg") is None:
         raise FileNotFoundError("ffmpeg is required for audio extraction but was not found on PATH.")
 
     progress = tqdm(total=100, desc="Downloading audio", unit="%", leave=False)
@@ -34,13 +46,14 @@ def download_audio(episode_url: str, output_dir: Path) -> Tuple[Path, Dict]:
     ydl_opts = {
         "format": "bestaudio/best",
         "outtmpl": str(output_dir / "%(id)s.%(ext)s"),
-        "postprocessors": [
-            {"key": "FFmpegExtractAudio", "preferredcodec": "mp3", "preferredquality": "192"},
-        ],
         "quiet": True,
         "no_warnings": True,
         "progress_hooks": [_hook],
     }
+    if audio_format == "mp3":
+        ydl_opts["postprocessors"] = [
+            {"key": "FFmpegExtractAudio", "preferredcodec": "mp3", "preferredquality": "192"},
+        ]
 
     try:
         with YoutubeDL(ydl_opts) as ydl:
@@ -54,7 +67,7 @@ def download_audio(episode_url: str, output_dir: Path) -> Tuple[Path, Dict]:
         progress.close()
 
     episode_id = info.get("id") or "episode"
-    audio_path = output_dir / f"{episode_id}.mp3"
+    audio_path = _downloaded_path(info, output_dir, episode_id, audio_format)
 
     metadata = {
         "id": episode_id,
@@ -68,3 +81,54 @@ def download_audio(episode_url: str, output_dir: Path) -> Tuple[Path, Dict]:
         raise FileNotFoundError(f"Audio file not found at {audio_path}")
 
     return audio_path, metadata
+
+
+def _downloaded_path(info: Dict, output_dir: Path, episode_id: str, audio_format: str) -> Path:
+    if audio_format == "mp3":
+        return output_dir / f"{episode_id}.mp3"
+    for download in info.get("requested_downloads") or []:
+        if download.get("filepath"):
+            return Path(download["filepath"])
+    return output_dir / f"{episode_id}.{info.get('ext') or 'm4a'}"
+
+
+def archive_mp3(audio_path: Path) -> Path:
+    """
+    Encode a 192 kbps MP3 copy next to ``audio_path`` (a no-op when it is already MP3 or the copy exists).
+    """
+    target = audio_path.with_suffix(".mp3")
+    if target == audio_path or target.exists():
+        return target
+    if shutil.which("ffmpeg") is None:
+        raise FileNotFoundError("ffmpeg is required for audio conversion but was not found on PATH.")
+    tmp_path = target.with_suffix(".mp3.tmp")
+    cmd = [
+        "ffmpeg", "-nostdin", "-hide_banner", "-v", "error", "-y",
+        "-i", str(audio_path),
+        "-vn", "-codec:a", "libmp3lame", "-b:a", "192k", "-f", "mp3", str(tmp_path),
+    ]
+    result = process.run(cmd, nice=10)
+    if result.returncode != 0:
+        tmp_path.unlink(missing_ok=True)
+        raise RuntimeError(f"ffmpeg conversion failed: {result.stderr}")
+    os.replace(tmp_path, target)
+    return target
+
+
+def archive_mp3_later(audio_path: Path) -> Optional[Future]:
+    """
+    Queue ``archive_mp3`` on the background encoder at low priority; failures are logged, not raised.
+    """
+    if audio_path.suffix == ".mp3":
+        return None
+
+    def _run() -> Path:
+        try:
+            target = archive_mp3(audio_path)
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("MP3 archive copy failed", extra={"stage": "download", "audio": str(audio_path), "error": str(exc)})
+            raise
+        logger.info("MP3 archive copy written", extra={"stage": "download", "audio": str(target)})
+        return target
+
+    return _ARCHIVE_POOL.submit(_run)
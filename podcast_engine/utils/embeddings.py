@@ -0,0 +1,281 @@
+import fcntl
+import hashlib
+import json
+import os
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from podcast_engine.config import Settings
+from podcast_engine.utils.llm import get_client
+from podcast_engine.utils.transcript_store import ColumnarTranscript, ensure_columnar, read_transcript, transcript_files
+
+# Sidecar row per vector: which episode (numeric id from the metadata) and the window's time span.
+_ROW_DTYPE = np.dtype([("episode", "<u4"), ("start", "<f8"), ("end", "<f8")])
+_SEARCH_BLOCK_ROWS = 65536
+
+
+def segment_windows(segments: List[Dict], window_seconds: float) -> List[Dict]:
+    """
+    Group consecutive segments into windows of about ``window_seconds``. Each window starts with the last
+    segment of the previous one, so a topic that straddles a boundary is whole in at least one window.
+    """
+    windows: List[Dict] = []
+    current: List[Dict] = []
+    for segment in segments:
+        if current and segment["end"] - current[0]["start"] > window_seconds:
+            windows.append(_window(current))
+            current = current[-1:]
+        current.append(segment)
+    if current and (not windows or len(current) > 1):
+        windows.append(_window(current))
+    return windows
+
+
+def _window(segments: List[Dict]) -> Dict:
+    return {
+        "start": float(segments[0]["start"]),
+        "end": float(segments[-1]["end"]),
+        "text": " ".join(segment["text"] for segment in segments),
+    }
+
+
+def embed_texts(settings: Settings, texts: List[str]) -> np.ndarray:
+    """
+    Unit-length float32 embeddings from the Ollama embedding model, ``settings.embed_batch_size`` per request.
+    """
+    client = get_client(settings.ollama_host)
+    vectors: List[List[float]] = []
+    for first in range(0, len(texts), settings.embed_batch_size):
+        batch = texts[first : first + settings.embed_batch_size]
+        vectors.extend(client.embed(settings.embed_model, batch, keep_alive=settings.ollama_keep_alive))
+    matrix = np.asarray(vectors, dtype=np.float32)
+    if matrix.ndim != 2 or not len(matrix):
+        return np.zeros((0, 0), dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.maximum(norms, 1e-12)
+
+
+class EmbeddingIndex:
+    """
+    Append-only vector index in ``<STATE_DIR>/embeddings``: a float32 matrix (``vectors.f32``, one row per
+    transcript window) that is memory-mapped for search, a row sidecar (``rows.bin``: episode, start, end) and
+    ``index.json`` with the model, dimension and each episode's numeric id. Adding an episode appends rows;
+    re-adding one gives it a new id so its old rows drop out of results, and dead rows are compacted away once
+    they make up half the file. Writers hold an exclusive lock; searches take a shared one only while mapping.
+    """
+
+    def __init__(self, root: Path, model: str) -> None:
+        self.root = root
+        self.model = model
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._vectors_path = root / "vectors.f32"
+        self._rows_path = root / "rows.bin"
+        self._meta_path = root / "index.json"
+        self._lock_path = root / "index.lock"
+
+    @contextmanager
+    def _locked(self, mode: int) -> Iterator[None]:
+        with self._lock_path.open("a") as lock_file:
+            fcntl.flock(lock_file, mode)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _load_meta(self) -> Dict:
+        empty = {"model": self.model, "dim": 0, "rows": 0, "dead": 0, "next_id": 0, "episodes": {}}
+        if not self._meta_path.exists():
+            return empty
+        try:
+            meta = json.loads(self._meta_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return empty
+        # Vectors from another model are not comparable; start over rather than mix them.
+        return meta if meta.get("model") == self.model else empty
+
+    def _save_meta(self, meta: Dict) -> None:
+        tmp_path = self._meta_path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(meta), encoding="utf-8")
+        os.replace(tmp_path, self._meta_path)
+
+    def source(self, episode_id: str) -> Optional[str]:
+        """
+        Digest of the transcript the episode's vectors were built from, or None if it is not indexed.
+        """
+        entry = self._load_meta()["episodes"].get(episode_id)
+        return entry["source"] if entry else None
+
+    def add(self, episode_id: str, source: str, windows: List[Dict], vectors: np.ndarray) -> None:
+        rows = np.zeros(len(windows), dtype=_ROW_DTYPE)
+        with self._locked(fcntl.LOCK_EX):
+            meta = self._load_meta()
+            if meta["rows"] and vectors.size and vectors.shape[1] != meta["dim"]:
+                meta = {**meta, "dim": 0, "rows": 0, "dead": 0, "episodes": {}}
+            if vectors.size:
+                meta["dim"] = int(vectors.shape[1])
+            dim = meta["dim"]
+            # Drop anything a crashed writer appended past the last committed row.
+            with self._vectors_path.open("ab") as f:
+                f.truncate(meta["rows"] * dim * 4)
+            with self._rows_path.open("ab") as f:
+                f.truncate(meta["rows"] * _ROW_DTYPE.itemsize)
+
+            previous = meta["episodes"].get(episode_id)
+            if previous:
+                meta["dead"] += previous["count"]
+            numeric_id = meta["next_id"]
+            meta["next_id"] += 1
+            rows["episode"] = numeric_id
+            rows["start"] = [window["start"] for window in windows]
+            rows["end"] = [window["end"] for window in windows]
+            with self._vectors_path.open("ab") as f:
+                f.write(np.ascontiguousarray(vectors, dtype="<f4").tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+            with self._rows_path.open("ab") as f:
+                f.write(rows.tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+            meta["episodes"][episode_id] = {"id": numeric_id, "count": len(windows), "source": source}
+            meta["rows"] += len(windows)
+            if meta["dead"] * 2 > meta["rows"]:
+                self._compact(meta)
+            self._save_meta(meta)
+
+    def _compact(self, meta: Dict) -> None:
+        """
+        Rewrite the matrix and sidecar without dead rows. Caller holds the exclusive lock and saves ``meta``.
+        """
+        vectors, rows = self._map(meta)
+        live = np.isin(rows["episode"], [entry["id"] for entry in meta["episodes"].values()])
+        for path, data in ((self._vectors_path, vectors), (self._rows_path, rows)):
+            tmp_path = path.with_suffix(".tmp")
+            with tmp_path.open("wb") as f:
+                for first in range(0, len(live), _SEARCH_BLOCK_ROWS):
+                    block = slice(first, first + _SEARCH_BLOCK_ROWS)
+                    f.write(np.ascontiguousarray(data[block][live[block]]).tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+        meta["rows"] = int(live.sum())
+        meta["dead"] = 0
+
+    def _map(self, meta: Dict) -> Tuple[np.ndarray, np.ndarray]:
+        count, dim = meta["rows"], meta["dim"]
+        if not count or not dim:
+            return np.zeros((0, max(dim, 1)), dtype="<f4"), np.zeros(0, dtype=_ROW_DTYPE)
+        vectors = np.memmap(self._vectors_path, dtype="<f4", mode="r", shape=(count, dim))
+        rows = np.memmap(self._rows_path, dtype=_ROW_DTYPE, mode="r", shape=(count,))
+        return vectors, rows
+
+    def search(self, query: np.ndarray, limit: int = 10, episode_id: Optional[str] = None) -> List[Dict]:
+        """
+        Top ``limit`` windows by cosine similarity to the unit-length ``query``: a matrix-vector product per
+        block of rows, with ``argpartition`` keeping the best candidates of each block.
+        """
+        with self._locked(fcntl.LOCK_SH):
+            meta = self._load_meta()
+            vectors, rows = self._map(meta)
+        if not len(rows) or query.shape[-1] != meta["dim"]:
+            return []
+        episodes = meta["episodes"]
+        if episode_id is not None:
+            episodes = {episode_id: episodes[episode_id]} if episode_id in episodes else {}
+        names = {entry["id"]: name for name, entry in episodes.items()}
+        if not names:
+            return []
+        live_ids = np.fromiter(names, dtype="<u4")
+        query = query.astype(np.float32)
+
+        best_scores = np.zeros(0, dtype=np.float32)
+        best_rows = np.zeros(0, dtype=np.int64)
+        for first in range(0, len(rows), _SEARCH_BLOCK_ROWS):
+            last = min(len(rows), first + _SEARCH_BLOCK_ROWS)
+            scores = vectors[first:last] @ query
+            scores[~np.isin(rows["episode"][first:last], live_ids)] = -np.inf
+            keep = min(limit, len(scores))
+            top = np.argpartition(-scores, keep - 1)[:keep]
+            best_scores = np.concatenate([best_scores, scores[top]])
+            best_rows = np.concatenate([best_rows, top + first])
+        order = np.argsort(-best_scores, kind="stable")[:limit]
+        hits = []
+        for position in order:
+            if not np.isfinite(best_scores[position]):
+                break
+            row = rows[best_rows[position]]
+            hits.append(
+                {
+                    "episode_id": names[int(row["episode"])],
+                    "start": round(float(row["start"]), 3),
+                    "end": round(float(row["end"]), 3),
+                    "score": round(float(best_scores[position]), 4),
+                }
+            )
+        return hits
+
+
+def _transcript_source(transcript_path: Path) -> str:
+    return hashlib.sha256(transcript_path.read_bytes()).hexdigest()
+
+
+def open_index(settings: Settings) -> EmbeddingIndex:
+    if not settings.embed_model:
+        raise RuntimeError("Semantic search needs an embedding model; set OLLAMA_EMBED_MODEL (e.g. nomic-embed-text).")
+    return EmbeddingIndex(settings.embeddings_dir, settings.embed_model)
+
+
+def index_transcript(settings: Settings, episode_id: str, transcript: Dict, transcript_path: Path) -> int:
+    """
+    Embed an episode's transcript windows and append them to the index, unless the same transcript is already
+    indexed. Returns the number of windows embedded.
+    """
+    index = open_index(settings)
+    source = _transcript_source(transcript_path)
+    if index.source(episode_id) == source:
+        return 0
+    windows = segment_windows(transcript.get("segments", []), settings.embed_window_seconds)
+    vectors = embed_texts(settings, [window["text"] for window in windows]) if windows else np.zeros((0, 0), np.float32)
+    index.add(episode_id, source, windows, vectors)
+    return len(windows)
+
+
+def sync_directory(settings: Settings, transcripts_dir: Path) -> int:
+    """
+    Embed every ``<id>.json`` transcript that is new or changed since it was indexed, skipping raw whisper
+    output and JSON that is not a transcript. Returns the episode count.
+    """
+    index = open_index(settings)
+    indexed = 0
+    for path in transcript_files(transcripts_dir):
+        if index.source(path.stem) == _transcript_source(path):
+            continue
+        transcript = read_transcript(path)
+        if transcript is None:
+            continue
+        index_transcript(settings, path.stem, transcript, path)
+        indexed += 1
+    return indexed
+
+
+def semantic_search(settings: Settings, query: str, limit: int = 10, episode_id: Optional[str] = None) -> List[Dict]:
+    """
+    Windows closest in meaning to ``query``, with their transcript text and episode title.
+    """
+    index = open_index(settings)
+    query_vector = embed_texts(settings, [query])
+    if not query_vector.size:
+        return []
+    hits = index.search(query_vector[0], limit=limit, episode_id=episode_id)
+    for hit in hits:
+        hit.update(title=None, text="")
+        transcript_path = settings.transcripts_dir / f"{hit['episode_id']}.json"
+        if not transcript_path.exists():
+            continue
+        with ColumnarTranscript(ensure_columnar(transcript_path)) as transcript:
+            first, last = transcript.locate(hit["start"], hit["end"])
+            hit["title"] = transcript.metadata.get("title")
+            hit["text"] = " ".join(segment["text"] for segment in transcript.segments(first, last - first))
+    return hits
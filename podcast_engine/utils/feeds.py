@@ -0,0 +1,139 @@
+import json
+import os
+import threading
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from yt_dlp import YoutubeDL
+from yt_dlp.utils import DownloadError, ExtractorError
+
+
+@dataclass(frozen=True)
+class FeedEntry:
+    id: str
+    url: str
+    title: Optional[str] = None
+    published: Optional[str] = None
+
+
+def _parse_rss(xml_text: str) -> List[FeedEntry]:
+    """
+    Episodes of an RSS 2.0 podcast feed, keyed by ``<guid>`` (falling back to the enclosure URL).
+    """
+    root = ET.fromstring(xml_text)
+    entries = []
+    for item in root.iter("item"):
+        enclosure = item.find("enclosure")
+        url = enclosure.get("url") if enclosure is not None else (item.findtext("link") or "").strip()
+        if not url:
+            continue
+        guid = (item.findtext("guid") or "").strip() or url
+        entries.append(
+            FeedEntry(
+                id=guid,
+                url=url,
+                title=(item.findtext("title") or "").strip() or None,
+                published=(item.findtext("pubDate") or "").strip() or None,
+            )
+        )
+    return entries
+
+
+def _extract_playlist(feed_url: str) -> List[FeedEntry]:
+    """
+    List a playlist or feed with yt-dlp's flat extraction: one metadata request, nothing downloaded.
+    """
+    opts = {"extract_flat": "in_playlist", "skip_download": True, "quiet": True, "no_warnings": True}
+    try:
+        with YoutubeDL(opts) as ydl:
+            info = ydl.extract_info(feed_url, download=False)
+    except (DownloadError, ExtractorError) as exc:
+        raise RuntimeError(f"Could not list feed {feed_url}: {exc}") from exc
+
+    items = info.get("entries")
+    if items is None:
+        items = [info]  # a single episode rather than a playlist
+    entries = []
+    for item in items:
+        if not item:
+            continue
+        url = item.get("webpage_url") or item.get("url")
+        if not url:
+            continue
+        entries.append(
+            FeedEntry(
+                id=str(item.get("id") or url),
+                url=url,
+                title=item.get("title"),
+                published=item.get("upload_date"),
+            )
+        )
+    return entries
+
+
+def feed_key(feed: str) -> str:
+    """
+    Stable state key for a feed: local files by absolute path, URLs as given.
+    """
+    path = Path(feed).expanduser()
+    return str(path.resolve()) if path.is_file() else feed
+
+
+def list_entries(feed: str) -> List[FeedEntry]:
+    """
+    Episodes of a feed, newest first as published. ``feed`` is a local RSS file or any URL yt-dlp can list
+    (podcast RSS feeds, YouTube playlists and channels, ...).
+    """
+    path = Path(feed).expanduser()
+    if path.is_file():
+        return _parse_rss(path.read_text(encoding="utf-8"))
+    return _extract_playlist(feed)
+
+
+class FeedState:
+    """
+    Episode ids already processed per feed, persisted in ``<STATE_DIR>/feeds.json`` so re-polling a feed only
+    runs the pipeline for entries it has not seen.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._feeds: Dict[str, Dict] = {}
+        if path.exists():
+            try:
+                self._feeds = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                self._feeds = {}
+
+    def processed(self, feed: str) -> Dict[str, Dict]:
+        with self._lock:
+            return dict(self._feeds.get(feed, {}).get("processed", {}))
+
+    def mark_processed(self, feed: str, entries: List[FeedEntry]) -> None:
+        now = datetime.utcnow().isoformat()
+        with self._lock:
+            record = self._feeds.setdefault(feed, {"processed": {}})
+            for entry in entries:
+                record["processed"][entry.id] = {"url": entry.url, "title": entry.title, "processed_at": now}
+            record["polled_at"] = now
+            self._save()
+
+    def _save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(self._feeds, indent=2), encoding="utf-8")
+        os.replace(tmp_path, self.path)
+
+
+def new_entries(entries: List[FeedEntry], processed: Dict[str, Dict], limit: Optional[int] = None) -> List[FeedEntry]:
+    """
+    Entries not processed yet, at most ``limit`` of the newest, returned oldest first.
+    """
+    fresh = [entry for entry in entries if entry.id not in processed]
+    if limit is not None:
+        fresh = fresh[:limit]
+    return list(reversed(fresh))
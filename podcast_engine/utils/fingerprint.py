@@ -0,0 +1,255 @@
+import sqlite3
+from contextlib import closing
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from podcast_engine.utils.vad import SAMPLE_RATE, FrameLevels, pcm_blocks, pcm_stream
+
+# Landmark fingerprint: spectral peaks of 64 ms frames, paired with the next few peaks up to 4 s later. Each pair
+# hashes (anchor bin, target bin, frame gap) into 24 bits and is stored with the anchor's frame, so two copies
+# of an episode share many hashes at one constant frame offset even after re-encoding or a different intro.
+_FFT_SIZE = 2048
+_HOP = 1024  # 64 ms at 16 kHz; bins are 7.8 Hz apart
+_MIN_BIN, _MAX_BIN = 8, 512  # 62 Hz - 4 kHz, where speech and music survive lossy codecs
+_PEAK_FRAMES = 10  # a peak is the loudest point within +-10 frames
+_PEAK_BINS = 20  # and +-20 bins
+_PEAK_MIN_LEVEL = -1.0  # log magnitude; quieter "peaks" are noise in silence
+_PEAK_OVER_MEDIAN = 1.5  # log magnitude over the frame's median (about 13 dB)
+_FAN_OUT = 3
+_MAX_GAP_FRAMES = 63
+_MAX_PAIR_BINS = 128
+_PAIR_SEARCH = 32  # later peaks looked at per anchor
+FRAME_SECONDS = _HOP / SAMPLE_RATE
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS fingerprinted (
+    id INTEGER PRIMARY KEY,
+    episode_id TEXT UNIQUE NOT NULL,
+    source TEXT NOT NULL,
+    duration REAL NOT NULL,
+    hashes INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS hashes (
+    hash INTEGER NOT NULL,
+    episode INTEGER NOT NULL,
+    frame INTEGER NOT NULL,
+    PRIMARY KEY (hash, episode, frame)
+) WITHOUT ROWID;
+"""
+
+
+@dataclass
+class Fingerprint:
+    hashes: np.ndarray  # uint32
+    frames: np.ndarray  # uint32 anchor frame of each hash
+    duration: float
+
+
+@dataclass(frozen=True)
+class Match:
+    episode_id: str
+    offset: float  # seconds the content starts later in the new audio than in the matched episode
+    score: float  # share of the smaller fingerprint's hashes that line up at that offset
+    duration: float  # of the matched episode
+
+
+def _spectrogram_blocks(blocks: Iterator[np.ndarray]) -> Iterator[np.ndarray]:
+    """
+    Log-magnitude spectrum rows (``_MIN_BIN`` to ``_MAX_BIN``) of consecutive frames, one block per sample block.
+    """
+    window = np.hanning(_FFT_SIZE).astype(np.float32)
+    carry = np.empty(0, dtype=np.float32)
+    for block in blocks:
+        samples = np.concatenate([carry, block])
+        count = (len(samples) - _FFT_SIZE) // _HOP + 1 if len(samples) >= _FFT_SIZE else 0
+        if count <= 0:
+            carry = samples
+            continue
+        frames = np.lib.stride_tricks.sliding_window_view(samples, _FFT_SIZE)[::_HOP][:count]
+        spectrum = np.abs(np.fft.rfft(frames * window, axis=1))[:, _MIN_BIN:_MAX_BIN]
+        carry = samples[count * _HOP :]
+        yield np.log(spectrum + 1e-6).astype(np.float32)
+
+
+def _max_filter(values: np.ndarray, rows: int, cols: int) -> np.ndarray:
+    """
+    Maximum over a (2 * rows + 1) x (2 * cols + 1) neighbourhood, as two one-dimensional passes.
+    """
+    across = values.copy()
+    for shift in range(1, cols + 1):
+        np.maximum(across[:, shift:], values[:, :-shift], out=across[:, shift:])
+        np.maximum(across[:, :-shift], values[:, shift:], out=across[:, :-shift])
+    result = across.copy()
+    for shift in range(1, rows + 1):
+        np.maximum(result[shift:], across[:-shift], out=result[shift:])
+        np.maximum(result[:-shift], across[shift:], out=result[:-shift])
+    return result
+
+
+def _peaks(blocks: Iterator[np.ndarray]) -> Tuple[np.ndarray, np.ndarray, int]:
+    """
+    Frame and bin of every spectral peak, in frame order, plus the frame count. Blocks are joined with enough
+    context on both sides that a peak near a block edge is judged against its whole neighbourhood.
+    """
+    frames: List[np.ndarray] = []
+    bins: List[np.ndarray] = []
+    held = np.empty((0, _MAX_BIN - _MIN_BIN), dtype=np.float32)
+    held_start = 0  # frame number of held[0]
+    context = 0  # leading rows of ``held`` already judged, kept as context
+    total = 0
+    finished = False
+    while not finished:
+        block = next(blocks, None)
+        finished = block is None
+        if block is not None:
+            held = np.concatenate([held, block])
+            total += len(block)
+        decide_to = len(held) if finished else len(held) - _PEAK_FRAMES
+        if decide_to <= context:
+            continue
+        neighbourhood = _max_filter(held, _PEAK_FRAMES, _PEAK_BINS)
+        region = held[context:decide_to]
+        floor = np.median(region, axis=1, keepdims=True) + _PEAK_OVER_MEDIAN
+        is_peak = (region == neighbourhood[context:decide_to]) & (region > floor) & (region > _PEAK_MIN_LEVEL)
+        rows, cols = np.nonzero(is_peak)
+        frames.append(rows + held_start + context)
+        bins.append(cols)
+        keep_from = max(0, decide_to - _PEAK_FRAMES)
+        held, held_start, context = held[keep_from:], held_start + keep_from, decide_to - keep_from
+    if not frames:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), total
+    return np.concatenate(frames).astype(np.int64), np.concatenate(bins).astype(np.int64), total
+
+
+def _pair_hashes(frames: np.ndarray, bins: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Pair each peak with up to ``_FAN_OUT`` of the peaks after it: 9 bits anchor bin, 9 bits target bin, 6 bits gap.
+    """
+    count = np.zeros(len(frames), dtype=np.int64)
+    hashes: List[np.ndarray] = []
+    anchors: List[np.ndarray] = []
+    for step in range(1, min(_PAIR_SEARCH, len(frames) - 1) + 1):
+        first, second = slice(0, len(frames) - step), slice(step, len(frames))
+        gap = frames[second] - frames[first]
+        usable = (
+            (gap >= 1)
+            & (gap <= _MAX_GAP_FRAMES)
+            & (np.abs(bins[second] - bins[first]) <= _MAX_PAIR_BINS)
+            & (count[first] < _FAN_OUT)
+        )
+        count[: len(frames) - step] += usable
+        hashes.append(((bins[first] << 15) | (bins[second] << 6) | gap)[usable])
+        anchors.append(frames[first][usable])
+    if not hashes:
+        return np.empty(0, dtype=np.uint32), np.empty(0, dtype=np.uint32)
+    return np.concatenate(hashes).astype(np.uint32), np.concatenate(anchors).astype(np.uint32)
+
+
+def fingerprint_audio(audio_path: Path, levels: Optional[FrameLevels] = None) -> Fingerprint:
+    """
+    Landmark hashes of the decoded audio, streamed so only the peaks (a few per second) are held in memory.
+    With ``levels``, the same decode also feeds the VAD frame levels, so the audio is not decoded again for VAD.
+    """
+    with pcm_stream(audio_path) as stream:
+        blocks = pcm_blocks(stream)
+        frames, bins, total = _peaks(_spectrogram_blocks(levels.tap(blocks) if levels is not None else blocks))
+    hashes, anchors = _pair_hashes(frames, bins)
+    return Fingerprint(hashes, anchors, total * FRAME_SECONDS)
+
+
+class FingerprintIndex:
+    """
+    Audio fingerprints of processed episodes in SQLite, clustered by hash, so the copies of an episode that
+    arrive under other URLs and IDs (re-uploads, RSS enclosure vs. video) are found without transcribing them.
+    """
+
+    def __init__(self, db_path: Path) -> None:
+        self.db_path = db_path
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as conn:
+            conn.executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def source(self, episode_id: str) -> Optional[str]:
+        """
+        Digest of the audio the episode was fingerprinted from, or None if it is not indexed.
+        """
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT source FROM fingerprinted WHERE episode_id = ?", (episode_id,)).fetchone()
+        return row["source"] if row else None
+
+    def add(self, episode_id: str, source: str, fingerprint: Fingerprint) -> None:
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "DELETE FROM hashes WHERE episode IN (SELECT id FROM fingerprinted WHERE episode_id = ?)", (episode_id,)
+            )
+            conn.execute("DELETE FROM fingerprinted WHERE episode_id = ?", (episode_id,))
+            cursor = conn.execute(
+                "INSERT INTO fingerprinted (episode_id, source, duration, hashes) VALUES (?, ?, ?, ?)",
+                (episode_id, source, fingerprint.duration, len(fingerprint.hashes)),
+            )
+            numeric_id = cursor.lastrowid
+            conn.executemany(
+                "INSERT OR IGNORE INTO hashes (hash, episode, frame) VALUES (?, ?, ?)",
+                ((int(h), numeric_id, int(f)) for h, f in zip(fingerprint.hashes, fingerprint.frames)),
+            )
+
+    def match(self, fingerprint: Fingerprint, exclude: Optional[str] = None, min_score: float = 0.1) -> Optional[Match]:
+        """
+        The indexed episode sharing the most hashes with ``fingerprint`` at one frame offset (give or take a
+        frame), if that share of the smaller fingerprint reaches ``min_score``.
+        """
+        if not len(fingerprint.hashes):
+            return None
+        with closing(self._connect()) as conn:
+            conn.execute("CREATE TEMP TABLE probe (hash INTEGER NOT NULL, frame INTEGER NOT NULL)")
+            conn.executemany(
+                "INSERT INTO probe (hash, frame) VALUES (?, ?)",
+                ((int(h), int(f)) for h, f in zip(fingerprint.hashes, fingerprint.frames)),
+            )
+            rows = conn.execute(
+                """
+                SELECT e.episode_id, e.duration, e.hashes, h.frame - p.frame AS delta, COUNT(*) AS aligned
+                FROM probe p
+                JOIN hashes h ON h.hash = p.hash
+                JOIN fingerprinted e ON e.id = h.episode
+                WHERE e.episode_id != ?
+                GROUP BY h.episode, delta
+                """,
+                (exclude or "",),
+            ).fetchall()
+        # Re-encoding jitters peaks by a frame: an offset's votes include its neighbours', its own break ties.
+        counts = {(row["episode_id"], row["delta"]): row["aligned"] for row in rows}
+        info = {row["episode_id"]: row for row in rows}
+        best: Optional[Match] = None
+        best_rank = (0.0, 0)
+        for (episode_id, delta), aligned in counts.items():
+            votes = sum(counts.get((episode_id, delta + step), 0) for step in (-1, 0, 1))
+            score = min(1.0, votes / min(len(fingerprint.hashes), info[episode_id]["hashes"] or 1))
+            if score >= min_score and (score, aligned) > best_rank:
+                best_rank = (score, aligned)
+                offset = round(-delta * FRAME_SECONDS, 3)
+                best = Match(episode_id, offset, round(score, 3), info[episode_id]["duration"])
+        return best
+
+
+def align_transcript(transcript: Dict, offset: float, duration: float) -> Dict:
+    """
+    A matched episode's transcript moved ``offset`` seconds onto the new audio's timeline, without segments
+    that fall outside its ``duration``.
+    """
+    segments = []
+    for segment in transcript.get("segments", []):
+        start, end = float(segment["start"]) + offset, float(segment["end"]) + offset
+        if end <= 0 or (duration and start >= duration):
+            continue
+        segments.append({**segment, "start": round(max(0.0, start), 3), "end": round(end, 3)})
+    return {**transcript, "segments": segments}
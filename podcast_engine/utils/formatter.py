@@ -1,8 +1,7 @@
-from pathlib import Path
-from typing import Dict
+from typing import Dict, List
 
 
-def _format_timestamp(seconds: float) -> str:
+def format_timestamp(seconds: float) -> str:
     total_seconds = int(seconds)
     hours, remainder = divmod(total_seconds, 3600)
     minutes, secs = divmod(remainder, 60)
@@ -11,6 +10,19 @@ def _format_timestamp(seconds: float) -> str:
     return f"{minutes:02d}:{secs:02d}"
 
 
+_format_timestamp = format_timestamp  # earlier name, kept for existing callers
+
+
+def segment_lines(segments: List[Dict]) -> List[str]:
+    lines = []
+    for segment in segments:
+        start = format_timestamp(segment.get("start", 0.0))
+        end = format_timestamp(segment.get("end", 0.0))
+        text = segment.get("text", "").strip()
+        lines.append(f"- [{start} - {end}] {text}")
+    return lines
+
+
 def transcript_to_markdown(transcript: Dict) -> str:
     title = transcript.get("title") or "Podcast Episode"
     duration = transcript.get("duration", 0)
@@ -21,23 +33,46 @@ def transcript_to_markdown(transcript: Dict) -> str:
         f"# {title}",
         "",
         f"- Source: {source_url}",
-        f"- Duration: {_format_timestamp(duration)}",
+        f"- Duration: {format_timestamp(duration)}",
         f"- Language: {language}",
         "",
         "## Transcript",
     ]
 
-    for segment in transcript.get("segments", []):
-        start = _format_timestamp(segment.get("start", 0.0))
-        end = _format_timestamp(segment.get("end", 0.0))
-        text = segment.get("text", "").strip()
-        lines.append(f"- [{start} - {end}] {text}")
+    lines.extend(segment_lines(transcript.get("segments", [])))
 
     return "\n".join(lines).strip() + "\n"
 
 
-def save_markdown(transcript: Dict, output_path: Path) -> Path:
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    markdown = transcript_to_markdown(transcript)
-    output_path.write_text(markdown, encoding="utf-8")
-    return output_path
+def segments_to_paragraphs(segments: List[Dict], paragraph_seconds: float = 60.0) -> List[str]:
+    """
+    Merge consecutive segments into paragraphs spanning about ``paragraph_seconds``, each prefixed with a single
+    coarse ``[mm:ss]`` start time instead of a start/end pair per line.
+    """
+    paragraphs: List[str] = []
+    texts: List[str] = []
+    paragraph_start = 0.0
+    for segment in segments:
+        text = segment.get("text", "").strip()
+        if not text:
+            continue
+        if texts and segment.get("start", 0.0) - paragraph_start >= paragraph_seconds:
+            paragraphs.append(f"[{format_timestamp(paragraph_start)}] " + " ".join(texts))
+            texts = []
+        if not texts:
+            paragraph_start = segment.get("start", 0.0)
+        texts.append(text)
+    if texts:
+        paragraphs.append(f"[{format_timestamp(paragraph_start)}] " + " ".join(texts))
+    return paragraphs
+
+
+def transcript_to_prompt_text(transcript: Dict, paragraph_seconds: float = 60.0) -> str:
+    """
+    Compact rendering for LLM prompts: a title line and timestamped paragraphs, without the Markdown header
+    and per-segment timestamps that only add prompt tokens.
+    """
+    title = transcript.get("title") or "Podcast Episode"
+    paragraphs = segments_to_paragraphs(transcript.get("segments", []), paragraph_seconds)
+    return f"Title: {title}\n\n" + "\n\n".join(paragraphs) + "\n"
+
@@ -1,6 +1,20 @@
+import http.client
+import json
+import queue
 import shutil
-import subprocess
+import threading
 from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from podcast_engine.utils import process
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Cheap token estimate (~4 characters per token for English) used for context budgeting.
+    """
+    return len(text) // 4 + 1
 
 
 def _load_prompt(prompt_path: Path) -> str:
@@ -9,25 +23,182 @@ def _load_prompt(prompt_path: Path) -> str:
     return prompt_path.read_text(encoding="utf-8").strip()
 
 
-def generate_content(model: str, prompt_path: Path, transcript_markdown: str, task: str) -> str:
-    prompt_template = _load_prompt(prompt_path)
-    composed_prompt = f"{prompt_template}\n\nTranscript:\n{transcript_markdown}"
+class OllamaClient:
+    """
+    Minimal client for the local Ollama HTTP API. Connections are kept alive in a small pool and reused across
+    tasks and episodes, and ``keep_alive`` asks the server to keep the model loaded between requests.
+    """
+
+    def __init__(self, host: str, pool_size: int = 4, timeout: float = 600.0) -> None:
+        parts = urlsplit(host if "://" in host else f"http://{host}")
+        self.host = host
+        self._hostname = parts.hostname or "127.0.0.1"
+        self._port = parts.port or 11434
+        self._timeout = timeout
+        self._pool: "queue.LifoQueue[http.client.HTTPConnection]" = queue.LifoQueue(maxsize=pool_size)
+
+    def _connect(self) -> http.client.HTTPConnection:
+        return http.client.HTTPConnection(self._hostname, self._port, timeout=self._timeout)
+
+    def _acquire(self) -> http.client.HTTPConnection:
+        try:
+            return self._pool.get_nowait()
+        except queue.Empty:
+            return self._connect()
+
+    def _release(self, conn: http.client.HTTPConnection) -> None:
+        try:
+            self._pool.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    def _post(
+        self, conn: http.client.HTTPConnection, path: str, body: str
+    ) -> Tuple[http.client.HTTPConnection, http.client.HTTPResponse]:
+        headers = {"Content-Type": "application/json"}
+        try:
+            conn.request("POST", path, body=body, headers=headers)
+            return conn, conn.getresponse()
+        except (OSError, http.client.HTTPException):
+            # A pooled connection may have been closed by the server while idle; retry once on a fresh one.
+            conn.close()
+            conn = self._connect()
+            try:
+                conn.request("POST", path, body=body, headers=headers)
+                return conn, conn.getresponse()
+            except (OSError, http.client.HTTPException) as exc:
+                conn.close()
+                raise RuntimeError(
+                    f"Ollama server not reachable at {self.host}. Ensure `ollama serve` is running."
+                ) from exc
+
+    def generate(
+        self,
+        model: str,
+        prompt: str,
+        keep_alive: str = "30m",
+        on_token: Optional[Callable[[str], None]] = None,
+        num_ctx: Optional[int] = None,
+    ) -> Tuple[str, Dict]:
+        """
+        Stream a completion from ``/api/generate``. Returns the full text and the final stats chunk
+        (``eval_count``, ``eval_duration``, ...). ``on_token`` sees each fragment as it arrives. ``num_ctx`` sets
+        the context window; Ollama's default (2048 tokens on many versions) silently truncates longer prompts.
+        """
+        payload: Dict = {"model": model, "prompt": prompt, "stream": True, "keep_alive": keep_alive}
+        if num_ctx:
+            payload["options"] = {"num_ctx": num_ctx}
+        body = json.dumps(payload)
+        conn = self._acquire()
+        reusable = False
+        try:
+            conn, response = self._post(conn, "/api/generate", body)
+            if response.status != 200:
+                detail = response.read().decode("utf-8", errors="ignore")
+                raise RuntimeError(f"Ollama returned HTTP {response.status}: {detail}")
+
+            pieces = []
+            stats: Dict = {}
+            for line in response:
+                if not line.strip():
+                    continue
+                chunk = json.loads(line)
+                if chunk.get("error"):
+                    raise RuntimeError(f"Ollama error: {chunk['error']}")
+                token = chunk.get("response", "")
+                if token:
+                    pieces.append(token)
+                    if on_token:
+                        on_token(token)
+                if chunk.get("done"):
+                    stats = chunk
+            response.read()  # drain to the end so the connection can serve the next request
+            reusable = not response.will_close
+            return "".join(pieces), stats
+        finally:
+            if reusable:
+                self._release(conn)
+            else:
+                conn.close()
 
+    def embed(self, model: str, inputs: List[str], keep_alive: str = "30m") -> List[List[float]]:
+        """
+        One embedding per input from ``/api/embed``; a whole batch goes in a single request.
+        """
+        body = json.dumps({"model": model, "input": inputs, "keep_alive": keep_alive})
+        conn = self._acquire()
+        reusable = False
+        try:
+            conn, response = self._post(conn, "/api/embed", body)
+            payload = response.read()
+            if response.status != 200:
+                raise RuntimeError(f"Ollama returned HTTP {response.status}: {payload.decode('utf-8', errors='ignore')}")
+            reusable = not response.will_close
+            data = json.loads(payload)
+            if data.get("error"):
+                raise RuntimeError(f"Ollama error: {data['error']}")
+            embeddings = data.get("embeddings") or []
+            if len(embeddings) != len(inputs):
+                raise RuntimeError(f"Ollama returned {len(embeddings)} embeddings for {len(inputs)} inputs")
+            return embeddings
+        finally:
+            if reusable:
+                self._release(conn)
+            else:
+                conn.close()
+
+
+_clients: Dict[str, OllamaClient] = {}
+_clients_lock = threading.Lock()
+
+
+def get_client(host: str) -> OllamaClient:
+    with _clients_lock:
+        if host not in _clients:
+            _clients[host] = OllamaClient(host)
+        return _clients[host]
+
+
+def _generate_cli(model: str, composed_prompt: str, task: str) -> str:
     if shutil.which("ollama") is None:
         raise FileNotFoundError("Ollama CLI not found on PATH. Install and ensure it is available offline.")
 
-    try:
-        result = subprocess.run(
-            ["ollama", "run", model],
-            input=composed_prompt,
-            capture_output=True,
-            text=True,
-            check=True,
+    result = process.run(["ollama", "run", model], input=composed_prompt.encode("utf-8"))
+    if result.returncode != 0:
+        output = result.stderr or result.stdout.decode(errors="ignore")
+        raise RuntimeError(f"Ollama generation failed for {task}: {output}")
+    return result.stdout.decode("utf-8", errors="ignore")
+
+
+def generate_content(
+    model: str,
+    prompt_path: Path,
+    transcript_markdown: str,
+    task: str,
+    host: Optional[str] = None,
+    keep_alive: str = "30m",
+    on_token: Optional[Callable[[str], None]] = None,
+    on_stats: Optional[Callable[[Dict], None]] = None,
+    num_ctx: Optional[int] = None,
+) -> str:
+    """
+    Generate ``task`` output from a prompt file plus transcript. With ``host`` set, streams from the Ollama
+    HTTP API over a pooled connection (``on_stats`` receives the final token counts and durations) with a
+    ``num_ctx`` token context window; otherwise falls back to one ``ollama run`` subprocess.
+    """
+    prompt_template = _load_prompt(prompt_path)
+    composed_prompt = f"{prompt_template}\n\nTranscript:\n{transcript_markdown}"
+
+    if host:
+        output, stats = get_client(host).generate(
+            model, composed_prompt, keep_alive=keep_alive, on_token=on_token, num_ctx=num_ctx
         )
-    except subprocess.CalledProcessError as exc:
-        raise RuntimeError(f"Ollama generation failed for {task}: {exc.stderr or exc.stdout}") from exc
+        if on_stats and stats:
+            on_stats(stats)
+    else:
+        output = _generate_cli(model, composed_prompt, task)
 
-    output = result.stdout.strip()
+    output = output.strip()
     if not output:
         raise RuntimeError(f"Ollama returned empty output for {task}")
     return output
@@ -0,0 +1,364 @@
+import asyncio
+import atexit
+import concurrent.futures
+import contextvars
+import os
+import queue
+import signal
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, Any, Callable, Dict, Iterator, List, Optional, Set
+
+from podcast_engine.hooks import JobCancelled
+from podcast_engine.metrics import record_child_cpu
+
+PIPE = asyncio.subprocess.PIPE
+DEVNULL = asyncio.subprocess.DEVNULL
+
+_STDERR_TAIL_BYTES = 64 * 1024  # keep the end of a tool's stderr for error messages, not all of it
+_LINE_LIMIT = 1 << 20
+_KILL_GRACE_SECONDS = 2.0
+
+_cancel_event: contextvars.ContextVar[Optional[threading.Event]] = contextvars.ContextVar(
+    "process_cancel_event", default=None
+)
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+_children: Set[asyncio.subprocess.Process] = set()
+_scoped: Dict[threading.Event, Set[asyncio.Task]] = {}
+
+
+class ProcessError(RuntimeError):
+    def __init__(self, cmd: List[str], returncode: Optional[int], stderr: str, reason: str = "") -> None:
+        self.cmd = cmd
+        self.returncode = returncode
+        self.stderr = stderr
+        super().__init__(f"{Path(cmd[0]).name} {reason or f'exited with status {returncode}'}: {stderr.strip()}")
+
+
+class ProcessTimeout(ProcessError):
+    pass
+
+
+@dataclass
+class Completed:
+    returncode: int
+    stdout: bytes
+    stderr: str  # the last 64 KiB
+
+    def check(self, cmd: List[str]) -> "Completed":
+        if self.returncode != 0:
+            raise ProcessError(cmd, self.returncode, self.stderr)
+        return self
+
+
+def event_loop() -> asyncio.AbstractEventLoop:
+    """
+    The event loop that owns every external tool process, running on its own daemon thread. Pipeline code is
+    threaded and calls the blocking wrappers below; async code can await ``run_async`` on this loop directly.
+    """
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="process-loop", daemon=True).start()
+            _loop = loop
+            atexit.register(shutdown)
+        return _loop
+
+
+async def _kill(process: asyncio.subprocess.Process) -> None:
+    """
+    SIGTERM the child's process group, then SIGKILL it if it has not exited within the grace period.
+    """
+    for sig in (signal.SIGTERM, signal.SIGKILL):
+        if process.returncode is not None:
+            return
+        try:
+            os.killpg(process.pid, sig)
+        except ProcessLookupError:
+            return
+        try:
+            await asyncio.wait_for(process.wait(), _KILL_GRACE_SECONDS)
+        except asyncio.TimeoutError:
+            continue
+
+
+async def run_async(
+    cmd: List[str],
+    *,
+    input: Optional[bytes] = None,
+    stdin: Any = DEVNULL,
+    stdout: Any = PIPE,
+    on_line: Optional[Callable[[bytes], None]] = None,
+    on_stderr_line: Optional[Callable[[bytes], None]] = None,
+    timeout: Optional[float] = None,
+    nice: int = 0,
+    spawned: Optional[threading.Event] = None,
+) -> Completed:
+    """
+    Run ``cmd`` in its own process group with stdout and stderr read as they are produced. stdout is handed to
+    ``on_line`` line by line when given, otherwise collected; only the tail of stderr is kept unless
+    ``on_stderr_line`` wants every line. The child is killed when ``timeout`` passes (``ProcessTimeout``) or
+    when the awaiting task is cancelled, so no tool outlives the job that started it. The child's CPU is added
+    to the subprocess metrics once it has been reaped.
+    """
+    stderr_tail = bytearray()
+    stdout_chunks: List[bytes] = []
+
+    # Lowered priority comes from nice(1) rather than preexec_fn, which is unsafe to fork with while other
+    # threads (the pipeline's) are running.
+    argv = ["nice", "-n", str(nice), *cmd] if nice else cmd
+    try:
+        process = await asyncio.create_subprocess_exec(
+            *argv,
+            stdin=PIPE if input is not None else stdin,
+            stdout=stdout,
+            stderr=PIPE,
+            start_new_session=True,
+            limit=_LINE_LIMIT,
+        )
+    finally:
+        if spawned is not None:
+            spawned.set()
+    _children.add(process)
+
+    async def _feed() -> None:
+        assert process.stdin is not None
+        try:
+            process.stdin.write(input or b"")
+            await process.stdin.drain()
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # the tool exited without reading everything; its status tells the story
+        finally:
+            process.stdin.close()
+
+    async def _drain_stderr() -> None:
+        assert process.stderr is not None
+        while True:
+            block = await (process.stderr.readline() if on_stderr_line else process.stderr.read(1 << 16))
+            if not block:
+                return
+            if on_stderr_line:
+                on_stderr_line(block)
+            stderr_tail.extend(block)
+            del stderr_tail[:-_STDERR_TAIL_BYTES]
+
+    async def _read_stdout() -> None:
+        if process.stdout is None:
+            return
+        if on_line is None:
+            stdout_chunks.append(await process.stdout.read())
+            return
+        async for line in process.stdout:
+            on_line(line)
+
+    tasks = [asyncio.ensure_future(_drain_stderr()), asyncio.ensure_future(_read_stdout())]
+    if input is not None:
+        tasks.append(asyncio.ensure_future(_feed()))
+    try:
+        await asyncio.wait_for(asyncio.gather(*tasks, process.wait()), timeout)
+    except asyncio.TimeoutError:
+        await _kill(process)
+        stderr = stderr_tail.decode(errors="ignore")
+        raise ProcessTimeout(cmd, process.returncode, stderr, f"timed out after {timeout:g}s") from None
+    except BaseException:
+        await _kill(process)
+        raise
+    finally:
+        for task in tasks:
+            task.cancel()
+        _children.discard(process)
+        record_child_cpu()
+
+    assert process.returncode is not None
+    return Completed(process.returncode, b"".join(stdout_chunks), stderr_tail.decode(errors="ignore"))
+
+
+@contextmanager
+def cancel_scope(event: Optional[threading.Event]) -> Iterator[None]:
+    """
+    Tie every tool started in this context (including threads started with a copy of it) to ``event``:
+    ``cancel_children(event)`` kills them and their callers raise ``JobCancelled``.
+    """
+    token = _cancel_event.set(event)
+    try:
+        yield
+    finally:
+        _cancel_event.reset(token)
+
+
+async def _in_scope(coro: Any, event: Optional[threading.Event]) -> Any:
+    if event is None:
+        return await coro
+    if event.is_set():
+        coro.close()
+        raise asyncio.CancelledError()
+    task = asyncio.current_task()
+    assert task is not None
+    _scoped.setdefault(event, set()).add(task)
+    try:
+        return await coro
+    finally:
+        tasks = _scoped.get(event)
+        if tasks is not None:
+            tasks.discard(task)
+            if not tasks:
+                del _scoped[event]
+
+
+def _cancel_scoped(event: threading.Event) -> None:
+    for task in list(_scoped.get(event, ())):
+        task.cancel()
+
+
+def cancel_children(event: threading.Event) -> None:
+    """
+    Set ``event`` and kill every tool running under ``cancel_scope(event)`` now, rather than at the pipeline's
+    next cancellation check.
+    """
+    event.set()
+    if _loop is not None:
+        _loop.call_soon_threadsafe(_cancel_scoped, event)
+
+
+class _Call:
+    """
+    A ``run_async`` scheduled on the process loop from another thread, in the caller's cancel scope.
+    """
+
+    def __init__(self, coro: Any) -> None:
+        self._finished = threading.Event()
+        self.future: "concurrent.futures.Future[Completed]" = asyncio.run_coroutine_threadsafe(
+            self._run(coro, _cancel_event.get()), event_loop()
+        )
+
+    async def _run(self, coro: Any, event: Optional[threading.Event]) -> Completed:
+        try:
+            return await _in_scope(coro, event)
+        finally:
+            self._finished.set()
+
+    def result(self, timeout: Optional[float] = None) -> Completed:
+        try:
+            return self.future.result(timeout)
+        except concurrent.futures.CancelledError:
+            raise JobCancelled("Job was cancelled.") from None
+        except concurrent.futures.TimeoutError:
+            raise
+        except BaseException:
+            # KeyboardInterrupt and the like: do not leave the child running behind us.
+            self.cancel()
+            raise
+
+    def cancel(self) -> None:
+        """
+        Kill the tool and wait until it is gone (the future reports cancelled before the loop has acted).
+        """
+        self.future.cancel()
+        self._finished.wait(_KILL_GRACE_SECONDS * 2 + 1)
+
+
+def run(
+    cmd: List[str],
+    *,
+    input: Optional[bytes] = None,
+    stdout: Any = PIPE,
+    on_stderr_line: Optional[Callable[[bytes], None]] = None,
+    timeout: Optional[float] = None,
+    nice: int = 0,
+) -> Completed:
+    """
+    Blocking ``run_async`` for threaded callers: the thread waits while the loop reads the pipes. Raises
+    ``JobCancelled`` when the surrounding ``cancel_scope`` is cancelled.
+    """
+    coro = run_async(cmd, input=input, stdout=stdout, on_stderr_line=on_stderr_line, timeout=timeout, nice=nice)
+    return _Call(coro).result()
+
+
+def stream_lines(
+    cmd: List[str],
+    *,
+    stdin: Any = DEVNULL,
+    timeout: Optional[float] = None,
+) -> Iterator[str]:
+    """
+    Yield the tool's stdout lines as it prints them. Closing the iterator early (the consumer raised or was
+    cancelled) kills the tool. A non-zero exit raises ``ProcessError`` once the output is exhausted.
+    """
+    lines: "queue.Queue[Optional[bytes]]" = queue.Queue()
+    call = _Call(run_async(cmd, stdin=stdin, on_line=lines.put, timeout=timeout))
+    call.future.add_done_callback(lambda _: lines.put(None))
+    try:
+        while True:
+            line = lines.get()
+            if line is None:
+                break
+            yield line.decode(errors="ignore")
+        call.result().check(cmd)
+    finally:
+        if not call.future.done():
+            call.cancel()
+
+
+class Child:
+    """
+    A tool started in the background whose stdout is a pipe read in the calling thread (or handed on as another
+    tool's stdin).
+    """
+
+    def __init__(self, cmd: List[str], timeout: Optional[float] = None) -> None:
+        self.cmd = cmd
+        read_fd, write_fd = os.pipe()
+        spawned = threading.Event()
+        try:
+            self._call = _Call(run_async(cmd, stdout=write_fd, timeout=timeout, spawned=spawned))
+            # The child holds its own copy of the write end once it exists; ours must close so readers see EOF.
+            while not spawned.wait(0.05) and not self._call.future.done():
+                pass
+        finally:
+            os.close(write_fd)
+        self.stdout: IO[bytes] = os.fdopen(read_fd, "rb")
+        if self._call.future.done():
+            try:
+                self._call.result()  # failed to start (or already cancelled)
+            except BaseException:
+                self.stdout.close()
+                raise
+
+    def wait(self, timeout: Optional[float] = None) -> Completed:
+        """
+        The finished process; kills it when ``timeout`` passes first.
+        """
+        try:
+            return self._call.result(timeout)
+        except concurrent.futures.TimeoutError:
+            self.kill()
+            raise ProcessTimeout(self.cmd, None, "", f"did not exit within {timeout:g}s") from None
+
+    def kill(self) -> None:
+        if not self._call.future.done():
+            self._call.cancel()
+
+
+def start(cmd: List[str], *, timeout: Optional[float] = None) -> Child:
+    return Child(cmd, timeout=timeout)
+
+
+async def terminate_all() -> None:
+    await asyncio.gather(*(_kill(process) for process in list(_children)), return_exceptions=True)
+
+
+def shutdown(timeout: float = 10.0) -> None:
+    """
+    Kill every tool still running (ffmpeg, whisper-cli, ollama). Called on server shutdown and at exit.
+    """
+    if _loop is None or not _loop.is_running():
+        return
+    try:
+        asyncio.run_coroutine_threadsafe(terminate_all(), _loop).result(timeout)
+    except (concurrent.futures.TimeoutError, RuntimeError):
+        pass
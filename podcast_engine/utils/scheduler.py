@@ -0,0 +1,243 @@
+import json
+import math
+import os
+import re
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from podcast_engine.config import Settings
+from podcast_engine.logger import get_logger
+
+logger = get_logger("podcast_engine")
+
+# Most to least accurate. Tiers with other names (custom models) rank after these, with the speed of "small".
+TIER_ORDER = ["large", "medium", "small", "base", "tiny"]
+# Rough whisper.cpp CPU speeds (audio seconds per wall second) at 4 threads, used until a tier has been measured.
+_PRIOR_RTF = {"large": 0.6, "medium": 1.5, "small": 4.0, "base": 10.0, "tiny": 20.0}
+_PRIOR_THREADS = 4
+_THREAD_SCALING = 0.7  # whisper is memory-bandwidth bound: speed grows roughly with threads**0.7
+_EWMA_WEIGHT = 0.3
+_TIER_RE = re.compile(r"(tiny|base|small|medium|large)")
+
+_running_lock = threading.Lock()
+_running = {"jobs": 0, "threads": 0}  # whisper work this process has scheduled and not yet finished
+_tables: Dict[Path, "RtfTable"] = {}
+_tables_lock = threading.Lock()
+
+
+def model_tier(model_path: Path) -> str:
+    """
+    Tier name of a whisper.cpp model file: ``ggml-small.en.bin`` is ``small``, ``ggml-large-v3.bin`` is ``large``.
+    """
+    match = _TIER_RE.search(model_path.name.lower())
+    return match.group(1) if match else model_path.stem
+
+
+def available_tiers(settings: Settings) -> Dict[str, Path]:
+    """
+    ``WHISPER_MODELS`` entries whose files exist, plus ``WHISPER_MODEL_PATH`` under its own tier name.
+    """
+    tiers = {tier: path for tier, path in settings.whisper_models.items() if path.exists()}
+    tiers.setdefault(model_tier(settings.whisper_model_path), settings.whisper_model_path)
+    return tiers
+
+
+def _rank(tier: str) -> int:
+    return TIER_ORDER.index(tier) if tier in TIER_ORDER else len(TIER_ORDER)
+
+
+def more_accurate(settings: Settings, tier: str) -> List[Path]:
+    """
+    Models at least as accurate as ``tier``, most accurate first: transcripts any of them produced are good
+    enough to reuse from the cache.
+    """
+    tiers = available_tiers(settings)
+    return [tiers[name] for name in sorted(tiers, key=_rank) if _rank(name) <= _rank(tier)]
+
+
+class RtfTable:
+    """
+    Measured whisper speed (audio seconds per wall second) per model tier and total thread count, kept as an
+    exponentially weighted average in ``<STATE_DIR>/whisper_rtf.json`` so predictions follow this machine.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._table: Dict[str, Dict[str, float]] = self._load()
+
+    def _load(self) -> Dict[str, Dict[str, float]]:
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def record(self, tier: str, threads: int, audio_seconds: float, wall_seconds: float) -> None:
+        if audio_seconds <= 0 or wall_seconds <= 0:
+            return
+        observed = audio_seconds / wall_seconds
+        with self._lock:
+            entries = self._table.setdefault(tier, {})
+            previous = entries.get(str(threads))
+            if previous is not None:
+                observed = previous + _EWMA_WEIGHT * (observed - previous)
+            entries[str(threads)] = round(observed, 4)
+            tmp_path = self.path.with_suffix(".tmp")
+            tmp_path.write_text(json.dumps(self._table, indent=2, sort_keys=True), encoding="utf-8")
+            os.replace(tmp_path, self.path)
+
+    def predict(self, tier: str, threads: int) -> float:
+        """
+        Expected speed of ``tier`` on ``threads`` threads: the nearest measured thread count scaled by
+        ``threads**0.7``. An unmeasured tier uses its prior, corrected by how this machine ran the measured ones.
+        """
+        with self._lock:
+            table = {name: {int(count): rtf for count, rtf in rows.items()} for name, rows in self._table.items()}
+        entries = table.get(tier)
+        if entries:
+            nearest = min(entries, key=lambda count: abs(count - threads))
+            return entries[nearest] * (threads / nearest) ** _THREAD_SCALING
+        ratios = [
+            rtf / _prior(name, count) for name, measured in table.items() for count, rtf in measured.items() if rtf > 0
+        ]
+        calibration = math.exp(sum(map(math.log, ratios)) / len(ratios)) if ratios else 1.0
+        return _prior(tier, threads) * calibration
+
+
+def _prior(tier: str, threads: int) -> float:
+    return _PRIOR_RTF.get(tier, _PRIOR_RTF["small"]) * (threads / _PRIOR_THREADS) ** _THREAD_SCALING
+
+
+def get_table(settings: Settings) -> RtfTable:
+    path = settings.state_dir / "whisper_rtf.json"
+    with _tables_lock:
+        table = _tables.get(path)
+        if table is None:
+            table = _tables[path] = RtfTable(path)
+        return table
+
+
+@dataclass(frozen=True)
+class WhisperPlan:
+    tier: str
+    model_path: Path
+    threads: int  # -t per whisper process
+    processors: int  # -p per whisper process
+    processes: int  # whisper processes running at once (chunked transcription)
+    predicted_seconds: Optional[float] = None
+
+    @property
+    def total_threads(self) -> int:
+        return self.threads * self.processors * self.processes
+
+    def apply(self, settings: Settings) -> Settings:
+        """
+        Settings that run exactly this plan: a chunked run keeps ``processes`` whisper processes of ``threads``
+        each, and a single (unchunked) run gets all ``threads`` in one process.
+        """
+        if self.processes > 1:
+            return replace(
+                settings,
+                whisper_model_path=self.model_path,
+                whisper_workers=self.processes,
+                whisper_threads=self.threads,
+                whisper_processors=self.processors,
+            )
+        return replace(
+            settings,
+            whisper_model_path=self.model_path,
+            # Per process in case the run is chunked after all: planned without a known duration, it is probed.
+            whisper_threads=max(1, self.threads // settings.whisper_workers),
+            whisper_pooled_threads=self.threads,
+            whisper_processors=self.processors,
+        )
+
+    def summary(self) -> Dict:
+        summary: Dict = {
+            "whisper_model": self.tier,
+            "threads": self.threads,
+            "processors": self.processors,
+            "processes": self.processes,
+        }
+        if self.predicted_seconds is not None:
+            summary["predicted_seconds"] = round(self.predicted_seconds, 1)
+        return summary
+
+
+def _fixed_plan(settings: Settings, duration: float) -> WhisperPlan:
+    chunked = settings.whisper_workers > 1 and duration > settings.chunk_seconds
+    processes = min(settings.whisper_workers, math.ceil(duration / settings.chunk_seconds)) if chunked else 1
+    threads = settings.whisper_threads if chunked else settings.whisper_threads * settings.whisper_workers
+    model_path = settings.whisper_model_path
+    return WhisperPlan(model_tier(model_path), model_path, threads, settings.whisper_processors, processes)
+
+
+def _cpu_budget(settings: Settings, queued: int) -> int:
+    """
+    Threads this job may use: cores not busy with other work or other jobs' whisper, shared with queued jobs
+    that could start alongside it, capped at ``WHISPER_MAX_THREADS``. Caller holds ``_running_lock``.
+    """
+    cores = os.cpu_count() or 1
+    try:
+        load = os.getloadavg()[0]
+    except OSError:
+        load = 0.0
+    # The load average includes the whisper threads we started; only the rest is someone else's work.
+    external = max(0.0, load - _running["threads"])
+    free = max(1, int(round(cores - external)) - _running["threads"])
+    open_slots = max(0, settings.whisper_concurrency - _running["jobs"] - 1)
+    return max(1, min(settings.whisper_max_threads, free // (1 + min(queued, open_slots))))
+
+
+def plan_transcription(settings: Settings, duration: float, queued: int = 0) -> WhisperPlan:
+    """
+    Choose the model tier and threads for one transcription. The latency target is shared with
+    the ``queued`` jobs waiting behind this one, and the most accurate tier predicted to finish within that share
+    wins (the fastest tier when none does). Unknown durations are planned as short clips. The plan scales with
+    chunk processes and threads, never ``-p``: whisper's processors only print segments once all of them finish
+    and cut the audio at blind split points, which stalls live segments and costs accuracy there. Caller holds
+    ``_running_lock``.
+    """
+    budget = _cpu_budget(settings, queued)
+    chunked = settings.whisper_workers > 1 and duration > settings.chunk_seconds
+    processes = min(settings.whisper_workers, math.ceil(duration / settings.chunk_seconds)) if chunked else 1
+    threads = max(1, budget // processes)
+    total = threads * processes
+
+    table = get_table(settings)
+    share = settings.whisper_latency_target / (1 + queued / settings.whisper_concurrency)
+    tiers = available_tiers(settings)
+    predicted = {tier: duration / table.predict(tier, total) for tier in tiers}
+    fitting = [tier for tier in tiers if predicted[tier] <= share]
+    tier = min(fitting, key=_rank) if fitting else min(predicted, key=lambda name: predicted[name])
+    return WhisperPlan(tier, tiers[tier], threads, 1, processes, predicted[tier])
+
+
+@contextmanager
+def scheduled(settings: Settings, duration: float, queued: int = 0) -> Iterator[WhisperPlan]:
+    """
+    Plan a transcription and hold its threads against this process's budget until the block exits. With
+    ``WHISPER_ADAPTIVE`` off, or the whisper-server backend (whose threads are fixed at startup), the plan is the
+    configured model and thread counts.
+    """
+    with _running_lock:
+        if settings.whisper_adaptive and settings.whisper_backend != "server":
+            plan = plan_transcription(settings, duration, queued)
+        else:
+            plan = _fixed_plan(settings, duration)
+        _running["jobs"] += 1
+        _running["threads"] += plan.total_threads
+    logger.info(
+        "Scheduled transcription",
+        extra={"stage": "transcription", "audio_seconds": round(duration, 1), "queued": queued, **plan.summary()},
+    )
+    try:
+        yield plan
+    finally:
+        with _running_lock:
+            _running["jobs"] -= 1
+            _running["threads"] -= plan.total_threads
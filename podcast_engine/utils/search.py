@@ -0,0 +1,109 @@
+import re
+import sqlite3
+from contextlib import closing
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from podcast_engine.utils.transcript_store import read_transcript, transcript_files
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS episodes (
+    episode_id TEXT PRIMARY KEY,
+    title TEXT,
+    source_url TEXT,
+    mtime REAL
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS segments USING fts5(
+    text,
+    episode_id UNINDEXED,
+    start UNINDEXED,
+    end UNINDEXED,
+    tokenize = 'unicode61 remove_diacritics 2'
+);
+"""
+
+_QUERY_TOKEN_RE = re.compile(r'"([^"]+)"|(\S+)')
+
+
+def _fts_query(query: str) -> str:
+    """
+    Turn user input into an FTS5 expression: "quoted text" stays a phrase, other words must all match.
+    Everything is quoted so FTS operators in user input are treated as plain text.
+    """
+    terms = []
+    for phrase, word in _QUERY_TOKEN_RE.findall(query):
+        term = (phrase or word).replace('"', '""').strip()
+        if term:
+            terms.append(f'"{term}"')
+    return " ".join(terms)
+
+
+class TranscriptIndex:
+    """
+    Full-text index over transcript segments in SQLite FTS5, so phrase queries across the whole library return
+    segment-level hits with timestamps without opening any transcript JSON.
+    """
+
+    def __init__(self, db_path: Path) -> None:
+        self.db_path = db_path
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as conn:
+            conn.executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def index_transcript(self, episode_id: str, transcript: Dict, mtime: Optional[float] = None) -> None:
+        rows = [
+            (segment["text"], episode_id, float(segment["start"]), float(segment["end"]))
+            for segment in transcript.get("segments", [])
+            if segment.get("text")
+        ]
+        with closing(self._connect()) as conn, conn:
+            conn.execute("DELETE FROM segments WHERE episode_id = ?", (episode_id,))
+            conn.executemany("INSERT INTO segments (text, episode_id, start, end) VALUES (?, ?, ?, ?)", rows)
+            conn.execute(
+                "INSERT OR REPLACE INTO episodes (episode_id, title, source_url, mtime) VALUES (?, ?, ?, ?)",
+                (episode_id, transcript.get("title"), transcript.get("source_url"), mtime),
+            )
+
+    def sync_directory(self, transcripts_dir: Path) -> int:
+        """
+        Index every ``<id>.json`` transcript that is new or changed since it was last indexed, skipping raw
+        whisper output and JSON that is not a transcript. Returns the count.
+        """
+        with closing(self._connect()) as conn:
+            known = {row["episode_id"]: row["mtime"] for row in conn.execute("SELECT episode_id, mtime FROM episodes")}
+        indexed = 0
+        for path in transcript_files(transcripts_dir):
+            mtime = path.stat().st_mtime
+            if known.get(path.stem) == mtime:
+                continue
+            transcript = read_transcript(path)
+            if transcript is None:
+                continue
+            self.index_transcript(path.stem, transcript, mtime=mtime)
+            indexed += 1
+        return indexed
+
+    def search(self, query: str, limit: int = 20, episode_id: Optional[str] = None) -> List[Dict]:
+        expression = _fts_query(query)
+        if not expression:
+            return []
+        sql = (
+            "SELECT s.episode_id, e.title, e.source_url, s.start, s.end, s.text, "
+            "snippet(segments, 0, '[', ']', '…', 16) AS snippet "
+            "FROM segments s LEFT JOIN episodes e ON e.episode_id = s.episode_id "
+            "WHERE segments MATCH ?"
+        )
+        params: List = [expression]
+        if episode_id:
+            sql += " AND s.episode_id = ?"
+            params.append(episode_id)
+        sql += " ORDER BY bm25(segments) LIMIT ?"
+        params.append(limit)
+        with closing(self._connect()) as conn:
+            return [dict(row) for row in conn.execute(sql, params)]
@@ -0,0 +1,100 @@
+import contextvars
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, List
+
+from podcast_engine.logger import get_logger
+from podcast_engine.utils.formatter import segments_to_paragraphs
+from podcast_engine.utils.llm import estimate_tokens
+
+logger = get_logger("podcast_engine")
+
+
+def chunk_segments(segments: List[Dict], budget_tokens: int) -> List[List[Dict]]:
+    """
+    Group consecutive segments into chunks of at most ``budget_tokens``, cutting only on segment boundaries.
+    """
+    chunks: List[List[Dict]] = []
+    current: List[Dict] = []
+    used = 0
+    for segment in segments:
+        cost = estimate_tokens(segment.get("text", "")) + 1
+        if current and used + cost > budget_tokens:
+            chunks.append(current)
+            current, used = [], 0
+        current.append(segment)
+        used += cost
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _group_notes(notes: List[str], budget_tokens: int) -> List[str]:
+    groups: List[str] = []
+    current: List[str] = []
+    used = 0
+    for note in notes:
+        cost = estimate_tokens(note)
+        if current and used + cost > budget_tokens:
+            groups.append("\n\n".join(current))
+            current, used = [], 0
+        current.append(note)
+        used += cost
+    if current:
+        groups.append("\n\n".join(current))
+    return groups
+
+
+def _fit_notes(notes: List[str], budget_tokens: int) -> str:
+    """
+    ``notes`` joined after cutting each one (on a word boundary where possible) to an equal share of
+    ``budget_tokens``, so every section of the episode stays represented.
+    """
+    limit = 4 * max(1, budget_tokens // len(notes) - 1)  # characters, at estimate_tokens' 4 per token
+    fitted = []
+    for note in notes:
+        if len(note) > limit:
+            cut = note[:limit]
+            note = cut.rsplit(None, 1)[0] if " " in cut.strip() else cut
+        fitted.append(note)
+    return "\n\n".join(fitted)
+
+
+def map_reduce_notes(
+    segments: List[Dict],
+    budget_tokens: int,
+    summarize: Callable[[str, str], str],
+    max_workers: int = 2,
+    on_progress: Callable[[float], None] = lambda percent: None,
+) -> str:
+    """
+    Condense a transcript too long for one prompt into section notes that fit ``budget_tokens``.
+
+    ``summarize(text, task)`` produces notes for one chunk (callers cache it, so the summary and thread tasks
+    share the same map results). Chunks are summarised in parallel; if the joined notes are still over budget
+    they are grouped and summarised again until they fit. When they cannot shrink further (one note left, or
+    notes each too long to group), every note is cut to an equal share of the budget and a warning is logged.
+    """
+    texts = ["\n\n".join(segments_to_paragraphs(chunk)) for chunk in chunk_segments(segments, budget_tokens)]
+    level = 0
+    while True:
+        notes = [""] * len(texts)
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = {
+                pool.submit(contextvars.copy_context().run, summarize, text, f"chunk_l{level}_{index}"): index
+                for index, text in enumerate(texts)
+            }
+            for done, future in enumerate(as_completed(futures), start=1):
+                notes[futures[future]] = future.result()
+                on_progress(100.0 * done / len(texts))
+        joined = "\n\n".join(notes)
+        if estimate_tokens(joined) <= budget_tokens:
+            return joined
+        texts = _group_notes(notes, budget_tokens) if len(notes) > 1 else notes
+        if len(texts) >= len(notes):
+            # Notes are individually too large to merge further: trim them rather than overflow the context.
+            logger.warning(
+                "Section notes exceed the context budget; truncating them",
+                extra={"stage": "llm", "tokens": estimate_tokens(joined), "budget": budget_tokens},
+            )
+            return _fit_notes(notes, budget_tokens)
+        level += 1
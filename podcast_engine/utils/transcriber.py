@@ -1,96 +1,371 @@
+import contextvars
 import json
+import re
 import shutil
-import subprocess
+import signal
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Tuple
+from typing import IO, Callable, Dict, Iterator, List, Optional, Tuple
 
 from tqdm import tqdm
 
 from podcast_engine.config import Settings
+from podcast_engine.hooks import PipelineHooks
+from podcast_engine.logger import get_logger
+from podcast_engine.metrics import stage_timer
+from podcast_engine.utils.cache import hash_text
+from podcast_engine.utils import process
+from podcast_engine.utils.checkpoint import ChunkJournal
+from podcast_engine.utils.search import TranscriptIndex
+from podcast_engine.utils.transcript_store import save_transcript, stream_json_object
+from podcast_engine.utils.vad import SpeechMap, detect_speech, is_pcm16k, silences_between
+from podcast_engine.utils.whisper_server import serving
 
+logger = get_logger("podcast_engine")
 
-def transcribe_audio(
-    audio_path: Path,
-    settings: Settings,
-    metadata: Dict,
-    source: str = "spotify",
-) -> Tuple[Path, Dict]:
-    """
-    Run whisper.cpp to produce a transcript JSON and normalize it to the required schema.
-    """
-    transcripts_dir = settings.transcripts_dir
-    transcripts_dir.mkdir(parents=True, exist_ok=True)
+_PROBE_TIMEOUT_SECONDS = 60.0
+_SILENCE_START_RE = re.compile(r"silence_start:\s*(-?[\d.]+)")
+_SILENCE_END_RE = re.compile(r"silence_end:\s*(-?[\d.]+)")
+# whisper.cpp prints "[00:01:02.340 --> 00:01:05.120]  text" per segment as it decodes.
+_SEGMENT_LINE_RE = re.compile(r"^\[(\d+):(\d+):([\d.]+) --> (\d+):(\d+):([\d.]+)\]\s*(.*)$")
+
+
+@dataclass(frozen=True)
+class Chunk:
+    index: int
+    start: float  # audio window sent to whisper, including overlap
+    end: float
+    keep_from: float  # segments whose midpoint falls in [keep_from, keep_to) belong to this chunk
+    keep_to: float
 
-    episode_id = metadata.get("id", audio_path.stem)
-    tmp_output_base = transcripts_dir / f"{episode_id}_raw"
-    raw_json_path = Path(f"{tmp_output_base}.json")
 
+def _resolve_whisper_bin(settings: Settings) -> Path:
+    if not settings.whisper_model_path.exists():
+        raise FileNotFoundError(f"Whisper model not found at {settings.whisper_model_path}")
     whisper_bin = settings.whisper_cpp_bin
+    if settings.whisper_backend == "server":
+        return whisper_bin  # whisper-server is resolved and started by utils.whisper_server
     if whisper_bin.name == "main":
         candidate = whisper_bin.with_name("whisper-cli")
         if candidate.exists():
             whisper_bin = candidate
     if not whisper_bin.exists():
         raise FileNotFoundError(f"whisper.cpp binary not found at {whisper_bin}")
-    if not settings.whisper_model_path.exists():
-        raise FileNotFoundError(f"Whisper model not found at {settings.whisper_model_path}")
+    return whisper_bin
 
-    progress = tqdm(total=1, desc="Transcribing audio", leave=False)
 
-    # Convert to a whisper-friendly wav to avoid format issues.
-    wav_path = Path(tempfile.mkstemp(suffix=".wav")[1])
+def _decode_cmd(
+    audio_path: Path,
+    output: str,
+    start: float = 0.0,
+    duration: Optional[float] = None,
+    speech: Optional[SpeechMap] = None,
+) -> List[str]:
+    cmd = ["ffmpeg", "-nostdin", "-hide_banner", "-v", "error", "-y"]
+    if start:
+        cmd += ["-ss", f"{start:.3f}"]
+    if duration is not None:
+        cmd += ["-t", f"{duration:.3f}"]  # input option: bounds the window read, before any speech filtering
+    cmd += ["-i", str(audio_path)]
+    if speech is not None:
+        cmd += ["-af", speech.select_filter()]
+    cmd += ["-ar", "16000", "-ac", "1", "-f", "wav", output]
+    return cmd
+
+
+@contextmanager
+def _decoded_audio(
+    audio_path: Path,
+    settings: Settings,
+    start: float = 0.0,
+    duration: Optional[float] = None,
+    speech: Optional[SpeechMap] = None,
+) -> Iterator[Tuple[str, Optional[IO[bytes]]]]:
+    """
+    Yield the ``-f`` argument and stdin for whisper.cpp. By default ffmpeg decodes 16 kHz mono WAV onto a pipe
+    that whisper reads as ``-f -``, so no intermediate file touches the disk. Older whisper builds without stdin
+    support can set ``WHISPER_PIPE_INPUT=0`` to decode into a temporary file that is always removed.
+    With ``speech`` set, only those spans (relative to ``start``) are decoded, back to back. Whole 16 kHz PCM
+    input is handed to whisper as is.
+    """
+    if not start and duration is None and speech is None and is_pcm16k(audio_path):
+        yield str(audio_path), None
+        return
+    if shutil.which("ffmpeg") is None:
+        raise FileNotFoundError("ffmpeg is required for audio conversion but was not found on PATH.")
+
+    if not settings.whisper_pipe_input:
+        with tempfile.TemporaryDirectory(prefix="podcast_engine_") as work:
+            wav_path = Path(work) / "audio.wav"
+            result = process.run(_decode_cmd(audio_path, str(wav_path), start, duration, speech))
+            if result.returncode != 0:
+                raise RuntimeError(f"ffmpeg conversion failed: {result.stderr}")
+            yield str(wav_path), None
+        return
+
+    decoder = process.start(_decode_cmd(audio_path, "-", start, duration, speech))
     try:
-        if shutil.which("ffmpeg") is None:
-            raise FileNotFoundError("ffmpeg is required for audio conversion but was not found on PATH.")
-        convert_cmd = [
-            "ffmpeg",
-            "-y",
-            "-i",
-            str(audio_path),
-            "-ar",
-            "16000",
-            "-ac",
-            "1",
-            str(wav_path),
-        ]
-        subprocess.run(convert_cmd, check=True, capture_output=True)
-    except subprocess.CalledProcessError as exc:
-        progress.close()
-        stdout = exc.stdout.decode(errors="ignore") if exc.stdout else ""
-        stderr = exc.stderr.decode(errors="ignore") if exc.stderr else ""
-        raise RuntimeError(f"ffmpeg conversion failed: {stderr or stdout}") from exc
+        yield "-", decoder.stdout
+    except BaseException:
+        # The reader's error is the one to report: ffmpeg failing on the pipe it left behind is a consequence.
+        decoder.stdout.close()
+        decoder.kill()
+        raise
+    decoder.stdout.close()
+    result = decoder.wait(timeout=10)
+    # A broken pipe after whisper exits is expected; only report genuine decode failures.
+    if result.returncode not in (0, -signal.SIGPIPE) and result.stderr:
+        raise RuntimeError(f"ffmpeg conversion failed: {result.stderr}")
+
+
+@contextmanager
+def _decoded_once(audio_path: Path, settings: Settings, chunked: bool) -> Iterator[Path]:
+    """
+    16 kHz mono WAV of the episode for chunked transcription. Silence detection, the VAD pass and every chunk
+    would otherwise decode the compressed source again, so it is decoded once into a temporary file that is
+    removed afterwards. Unchunked runs, and PCM input, use the source as is: the VAD pass (or the fingerprint
+    pass it shares a decode with) reads ffmpeg's output on a pipe and whisper gets its own piped decode, so a
+    full-length WAV never touches the disk. That is two decodes of compressed audio, accepted over the disk
+    write: whisper's decode cannot feed VAD, because it is cut to the speech spans VAD has to find first.
+    """
+    if is_pcm16k(audio_path) or not chunked:
+        yield audio_path
+        return
+    if shutil.which("ffmpeg") is None:
+        raise FileNotFoundError("ffmpeg is required for audio conversion but was not found on PATH.")
+    with tempfile.TemporaryDirectory(prefix="podcast_engine_") as work:
+        wav_path = Path(work) / "audio.wav"
+        with stage_timer("decode"):
+            result = process.run(_decode_cmd(audio_path, str(wav_path)))
+        if result.returncode != 0:
+            raise RuntimeError(f"ffmpeg conversion failed: {result.stderr}")
+        yield wav_path
+
+
+def _probe_duration(audio_path: Path) -> float:
+    if shutil.which("ffprobe") is None:
+        return 0.0
+    try:
+        result = process.run(
+            [
+                "ffprobe",
+                "-v",
+                "error",
+                "-show_entries",
+                "format=duration",
+                "-of",
+                "default=noprint_wrappers=1:nokey=1",
+                str(audio_path),
+            ],
+            timeout=_PROBE_TIMEOUT_SECONDS,
+        )
+        return float(result.stdout.decode(errors="ignore").strip())
+    except (process.ProcessTimeout, ValueError):
+        return 0.0
+
 
+def _detect_silences(audio_path: Path, noise_db: int = -30, min_silence: float = 0.5) -> List[Tuple[float, float]]:
+    """
+    Use ffmpeg's silencedetect filter to list (start, end) silence spans in seconds.
+    """
     cmd = [
-        str(whisper_bin),
-        "-m",
-        str(settings.whisper_model_path),
+        "ffmpeg",
+        "-hide_banner",
+        "-nostats",
+        "-i",
+        str(audio_path),
+        "-ac",
+        "1",
+        "-af",
+        f"silencedetect=noise={noise_db}dB:d={min_silence}",
         "-f",
-        str(wav_path),
-        "-of",
-        str(tmp_output_base),
-        "-oj",
+        "null",
+        "-",
     ]
+    lines: List[str] = []
+    process.run(cmd, on_stderr_line=lambda line: lines.append(line.decode(errors="ignore")))
+    silences: List[Tuple[float, float]] = []
+    pending_start: Optional[float] = None
+    for line in lines:
+        start_match = _SILENCE_START_RE.search(line)
+        if start_match:
+            pending_start = max(0.0, float(start_match.group(1)))
+            continue
+        end_match = _SILENCE_END_RE.search(line)
+        if end_match and pending_start is not None:
+            silences.append((pending_start, float(end_match.group(1))))
+            pending_start = None
+    return silences
+
+
+def _plan_chunks(
+    duration: float,
+    silences: List[Tuple[float, float]],
+    chunk_seconds: float,
+    overlap: float,
+) -> List[Chunk]:
+    """
+    Cut roughly every ``chunk_seconds`` at the nearest silence midpoint, falling back to a hard cut
+    when no silence lies within a quarter chunk of the target.
+    """
+    midpoints = [(start + end) / 2.0 for start, end in silences]
+    tolerance = chunk_seconds / 4.0
+    cuts = [0.0]
+    while duration - cuts[-1] > chunk_seconds + tolerance:
+        target = cuts[-1] + chunk_seconds
+        candidates = [m for m in midpoints if abs(m - target) <= tolerance and m > cuts[-1]]
+        cuts.append(min(candidates, key=lambda m: abs(m - target)) if candidates else target)
+    cuts.append(duration)
 
+    chunks = []
+    for index, (keep_from, keep_to) in enumerate(zip(cuts, cuts[1:])):
+        chunks.append(
+            Chunk(
+                index=index,
+                start=max(0.0, keep_from - overlap),
+                end=min(duration, keep_to + overlap),
+                keep_from=keep_from,
+                keep_to=keep_to if index < len(cuts) - 2 else float("inf"),
+            )
+        )
+    return chunks
+
+
+def _parse_timestamp(hours: str, minutes: str, seconds: str) -> float:
+    return int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+
+
+def _stream_whisper(cmd: List[str], stdin: Optional[IO[bytes]] = None) -> Iterator[Dict]:
+    """
+    Run whisper.cpp and yield segments as it prints them to stdout, before the JSON file is written.
+    """
     try:
-        subprocess.run(cmd, check=True, capture_output=True)
-    except subprocess.CalledProcessError as exc:
-        progress.close()
-        stdout = exc.stdout.decode() if exc.stdout else ""
-        stderr = exc.stderr.decode() if exc.stderr else ""
-        raise RuntimeError(f"whisper.cpp failed: {stderr or stdout}") from exc
+        for line in process.stream_lines(cmd, stdin=stdin if stdin is not None else process.DEVNULL):
+            match = _SEGMENT_LINE_RE.match(line.strip())
+            if not match:
+                continue
+            text = match.group(7).strip()
+            if not text:
+                continue
+            yield {
+                "start": _parse_timestamp(*match.group(1, 2, 3)),
+                "end": _parse_timestamp(*match.group(4, 5, 6)),
+                "text": text,
+            }
+    except process.ProcessError as exc:
+        raise RuntimeError(f"whisper.cpp failed: {exc.stderr.strip()}") from exc
+
 
-    progress.update(1)
-    progress.close()
-    if wav_path.exists():
-        wav_path.unlink()
+def _run_whisper(
+    whisper_bin: Path,
+    settings: Settings,
+    audio_path: Path,
+    output_base: Path,
+    threads: int,
+    start: float = 0.0,
+    duration: Optional[float] = None,
+    on_segment: Optional[Callable[[Dict], None]] = None,
+    speech: Optional[SpeechMap] = None,
+) -> Dict:
+    if settings.whisper_backend == "server":
+        return _run_whisper_server(settings, audio_path, start, duration, on_segment, speech)
 
+    with _decoded_audio(audio_path, settings, start, duration, speech) as (input_arg, stdin):
+        cmd = [
+            str(whisper_bin),
+            "-m",
+            str(settings.whisper_model_path),
+            "-t",
+            str(threads),
+            *(["-p", str(settings.whisper_processors)] if settings.whisper_processors > 1 else []),
+            "-f",
+            input_arg,
+            "-of",
+            str(output_base),
+            "-oj",
+        ]
+        for segment in _stream_whisper(cmd, stdin=stdin):
+            if on_segment:
+                on_segment(_map_segment(segment, start, speech))
+
+    raw_json_path = Path(f"{output_base}.json")
     if not raw_json_path.exists():
         raise FileNotFoundError(f"whisper.cpp did not produce JSON at {raw_json_path}")
 
-    with raw_json_path.open("r", encoding="utf-8") as f:
-        raw_data = json.load(f)
+    raw_data = _read_whisper_json(raw_json_path)
+    # Clean up raw output to avoid clutter but keep the normalized version.
+    raw_json_path.unlink()
+    return raw_data
+
 
+def _read_whisper_json(raw_json_path: Path) -> Dict:
+    """
+    Stream whisper.cpp's ``-oj`` file into compact ``{"language", "segments"}`` form (seconds, trimmed text),
+    so multi-hour output is never held as one parsed document.
+    """
+    segments: List[Dict] = []
+
+    def _on_item(item: Dict) -> None:
+        text = item.get("text", "").strip()
+        if not text:
+            return
+        offsets = item.get("offsets", {})
+        segments.append(
+            {
+                "start": float(offsets.get("from", 0) or 0) / 1000.0,
+                "end": float(offsets.get("to", 0) or 0) / 1000.0,
+                "text": text,
+            }
+        )
+
+    fields = stream_json_object(raw_json_path, "transcription", _on_item)
+    return {"language": _raw_language(fields), "segments": segments}
+
+
+def _run_whisper_server(
+    settings: Settings,
+    audio_path: Path,
+    start: float = 0.0,
+    duration: Optional[float] = None,
+    on_segment: Optional[Callable[[Dict], None]] = None,
+    speech: Optional[SpeechMap] = None,
+) -> Dict:
+    """
+    Stream the decoded window to the warm whisper-server instead of spawning whisper-cli, so the model is
+    loaded once per process rather than once per episode. Segments arrive with the response, not live.
+    """
+
+    @contextmanager
+    def _open_wav() -> Iterator[IO[bytes]]:
+        with _decoded_audio(audio_path, settings, start, duration, speech) as (input_arg, stdin):
+            if stdin is not None:
+                yield stdin
+            else:
+                with open(input_arg, "rb") as wav:
+                    yield wav
+
+    with serving(settings) as server:
+        raw_data = server.transcribe(_open_wav)
+    if on_segment:
+        for segment in _parse_segments(raw_data):
+            on_segment(_map_segment(segment, start, speech))
+    return raw_data
+
+
+def _map_segment(segment: Dict, offset: float = 0.0, speech: Optional[SpeechMap] = None) -> Dict:
+    """
+    Shift a segment from whisper's input timeline (a seeked window, possibly speech-only) to original time.
+    """
+    start, end = segment["start"], segment["end"]
+    if speech is not None:
+        start, end = speech.to_original(start), speech.to_original(end)
+    return {**segment, "start": start + offset, "end": end + offset}
+
+
+def _parse_segments(raw_data: Dict, offset: float = 0.0, speech: Optional[SpeechMap] = None) -> List[Dict]:
     segments = []
     if "segments" in raw_data:
         for segment in raw_data.get("segments", []):
@@ -119,13 +394,267 @@ def transcribe_audio(
                     "text": text,
                 }
             )
+    return [_map_segment(segment, offset, speech) for segment in segments]
+
+
+def _raw_language(raw_data: Dict) -> Optional[str]:
+    return raw_data.get("language") or raw_data.get("result", {}).get("language")
+
+
+class _Stitcher:
+    """
+    Merge per-chunk segment lists (already shifted to absolute time) in chunk order. Each chunk owns the
+    segments whose midpoint falls inside its keep window; a repeated line straddling a cut is dropped.
+    """
+
+    def __init__(self) -> None:
+        self.segments: List[Dict] = []
+
+    def add(self, chunk: Chunk, segments: List[Dict]) -> List[Dict]:
+        added = []
+        for segment in segments:
+            midpoint = (segment["start"] + segment["end"]) / 2.0
+            if not chunk.keep_from <= midpoint < chunk.keep_to:
+                continue
+            if self.segments:
+                previous = self.segments[-1]
+                if segment["text"].lower() == previous["text"].lower() and segment["start"] < previous["end"]:
+                    continue
+            self.segments.append(segment)
+            added.append(segment)
+        return added
+
+
+def _transcribe_chunked(
+    whisper_bin: Path,
+    settings: Settings,
+    audio_path: Path,
+    output_base: Path,
+    chunks: List[Chunk],
+    on_segment: Callable[[Dict], None],
+    on_progress: Callable[[float], None],
+    check_cancelled: Callable[[], None],
+    speech: Optional[SpeechMap] = None,
+    done: Optional[Dict[int, Dict]] = None,
+    on_chunk: Optional[Callable[[int, Dict], None]] = None,
+) -> Tuple[List[Dict], Optional[str]]:
+    """
+    ``done`` holds raw whisper output of chunks finished by an earlier run, which are not transcribed again;
+    ``on_chunk`` receives each newly finished chunk.
+    """
+    progress = tqdm(total=len(chunks), desc="Transcribing chunks", leave=False)
+    duration = chunks[-1].end or 1.0
+    done = done or {}
+
+    def _run(chunk: Chunk) -> Dict:
+        if chunk.index in done:
+            return done[chunk.index]
+        check_cancelled()
+        window = speech.window(chunk.start, chunk.end) if speech is not None else None
+        if window is not None and not window.spans:
+            return {}  # nothing but silence in this window
+        raw = _run_whisper(
+            whisper_bin,
+            settings,
+            audio_path,
+            Path(f"{output_base}_{chunk.index:04d}"),
+            settings.whisper_threads,
+            start=chunk.start,
+            duration=chunk.end - chunk.start,
+            speech=window,
+        )
+        if on_chunk:
+            on_chunk(chunk.index, raw)
+        return raw
+
+    stitcher = _Stitcher()
+    language: Optional[str] = None
+    done_seconds = 0.0
+    try:
+        with ThreadPoolExecutor(max_workers=settings.whisper_workers) as pool:
+            futures = [pool.submit(contextvars.copy_context().run, _run, chunk) for chunk in chunks]
+            # Emit chunks in order so streamed segments stay monotonic even when later chunks finish first.
+            for chunk, future in zip(chunks, futures):
+                raw = future.result()
+                language = language or _raw_language(raw)
+                window = speech.window(chunk.start, chunk.end) if speech is not None else None
+                for segment in stitcher.add(chunk, _parse_segments(raw, offset=chunk.start, speech=window)):
+                    on_segment(segment)
+                done_seconds += min(chunk.keep_to, duration) - chunk.keep_from
+                progress.update(1)
+                on_progress(100.0 * done_seconds / duration)
+    finally:
+        progress.close()
+
+    return stitcher.segments, language
+
+
+def transcription_flags(settings: Settings) -> str:
+    """
+    The whisper options that change transcript output, for cache keys. Thread and processor counts are left
+    out: they change speed, and ``-p`` only where segments break at its split points.
+    """
+    flags = "-oj"
+    if settings.whisper_workers > 1:
+        flags += f" chunked:{settings.chunk_seconds}:{settings.chunk_overlap_seconds}"
+    if settings.vad_enabled:
+        flags += f" vad:{settings.vad_threshold_db}:{settings.vad_min_silence}"
+    return flags
+
+
+def _plan_key(audio_path: Path, settings: Settings, chunks: List[Chunk]) -> str:
+    """
+    Identifies a chunked transcription: the same audio file, model, output flags and chunk windows.
+    """
+    audio, model = audio_path.stat(), settings.whisper_model_path.stat()
+    parts = [
+        str(audio_path.resolve()),
+        audio.st_size,
+        audio.st_mtime_ns,
+        str(settings.whisper_model_path),
+        model.st_size,
+        transcription_flags(settings),
+        [(chunk.start, chunk.end) for chunk in chunks],
+    ]
+    return hash_text(json.dumps(parts))
+
+
+def _speech_map(
+    audio_path: Path, settings: Settings, duration: float, spans: Optional[List[Tuple[float, float]]] = None
+) -> Optional[SpeechMap]:
+    """
+    Speech spans from the VAD pass (or ``spans`` already detected), or None when VAD is off or trimming would
+    not save meaningful compute (no speech found, or under 5% of the audio is non-speech).
+    """
+    if not settings.vad_enabled:
+        return None
+    if spans is None:
+        with stage_timer("vad"):
+            spans = detect_speech(audio_path, settings.vad_threshold_db, settings.vad_min_silence)
+    speech = SpeechMap(spans)
+    total = duration or (spans[-1][1] if spans else 0.0)
+    if not spans or speech.speech_seconds >= 0.95 * total:
+        return None
+    logger.info(
+        "Trimmed non-speech audio",
+        extra={
+            "stage": "transcription",
+            "speech_seconds": round(speech.speech_seconds, 1),
+            "total_seconds": round(total, 1),
+            "spans": len(spans),
+        },
+    )
+    return speech
+
+
+def transcribe_audio(
+    audio_path: Path,
+    settings: Settings,
+    metadata: Dict,
+    source: str = "spotify",
+    hooks: Optional[PipelineHooks] = None,
+    journal: Optional[ChunkJournal] = None,
+    speech_spans: Optional[List[Tuple[float, float]]] = None,
+) -> Tuple[Path, Dict]:
+    """
+    Run whisper.cpp to produce a transcript JSON and normalize it to the required schema.
+    Long audio is split on silence into overlapping chunks transcribed by a pool of
+    ``settings.whisper_workers`` whisper.cpp processes when more than one worker is configured.
+    With VAD enabled, non-speech audio is cut before whisper sees it and timestamps are mapped back to
+    original time (``speech_spans`` from a pass that already decoded the audio skip the VAD pass).
+    Compressed audio that chunking reads several times is decoded once to a temporary
+    16 kHz WAV. Segments are reported through ``hooks`` and appended to ``<id>.partial.jsonl`` while
+    whisper runs.
+    With a ``journal``, chunked runs record each finished chunk and skip chunks an interrupted earlier run of
+    the same plan already finished.
+    The finished transcript is added to the full-text search index.
+    """
+    hooks = hooks or PipelineHooks()
+    transcripts_dir = settings.transcripts_dir
+    transcripts_dir.mkdir(parents=True, exist_ok=True)
+
+    episode_id = metadata.get("id", audio_path.stem)
+    whisper_bin = _resolve_whisper_bin(settings)
+    partial_path = transcripts_dir / f"{episode_id}.partial.jsonl"
+
+    # ffmpeg decodes straight into whisper, so duration comes from metadata (or ffprobe) rather than a WAV header.
+    duration = float(metadata.get("duration") or 0) or _probe_duration(audio_path)
+    chunked = settings.whisper_workers > 1 and duration > settings.chunk_seconds
+
+    with _decoded_once(audio_path, settings, chunked) as pcm_path:
+        speech = _speech_map(pcm_path, settings, duration, speech_spans)
+
+        with partial_path.open("w", encoding="utf-8") as partial:
+
+            def _emit(segment: Dict) -> None:
+                partial.write(json.dumps(segment, ensure_ascii=False) + "\n")
+                partial.flush()
+                hooks.segment(segment)
+
+            chunks: List[Chunk] = []
+            if chunked:
+                silences = silences_between(speech.spans, duration) if speech else _detect_silences(pcm_path)
+                chunks = _plan_chunks(
+                    duration,
+                    silences,
+                    settings.chunk_seconds,
+                    settings.chunk_overlap_seconds,
+                )
+
+            if len(chunks) > 1:
+                done: Dict[int, Dict] = {}
+                if journal is not None:
+                    done = journal.open(_plan_key(audio_path, settings, chunks))
+                    if done:
+                        logger.info(
+                            "Resuming chunked transcription",
+                            extra={"stage": "transcription", "chunks_done": len(done), "chunks": len(chunks)},
+                        )
+                segments, language = _transcribe_chunked(
+                    whisper_bin,
+                    settings,
+                    pcm_path,
+                    transcripts_dir / f"{episode_id}_raw",
+                    chunks,
+                    on_segment=_emit,
+                    on_progress=lambda percent: hooks.progress("transcription", percent),
+                    check_cancelled=hooks.check_cancelled,
+                    speech=speech,
+                    done=done,
+                    on_chunk=journal.record if journal is not None else None,
+                )
+            else:
+                progress = tqdm(total=100, desc="Transcribing audio", unit="%", leave=False)
+
+                def _on_live_segment(segment: Dict) -> None:
+                    _emit(segment)
+                    percent = 100.0 * segment["end"] / duration if duration else 0.0
+                    progress.n = int(min(percent, 100.0))
+                    progress.refresh()
+                    hooks.progress("transcription", percent)
+
+                try:
+                    threads = settings.whisper_pooled_threads or settings.whisper_threads * settings.whisper_workers
+                    raw_data = _run_whisper(
+                        whisper_bin,
+                        settings,
+                        pcm_path,
+                        transcripts_dir / f"{episode_id}_raw",
+                        threads,
+                        on_segment=_on_live_segment,
+                        speech=speech,
+                    )
+                finally:
+                    progress.close()
+                segments = _parse_segments(raw_data, speech=speech)
+                language = _raw_language(raw_data)
 
     transcript = {
         "source": source,
         "source_url": metadata.get("url"),
         "title": metadata.get("title"),
         "duration": int(metadata.get("duration") or 0),
-        "language": raw_data.get("language") or raw_data.get("result", {}).get("language") or "unknown",
+        "language": language or "unknown",
         "segments": segments,
     }
 
@@ -133,11 +662,11 @@ def transcribe_audio(
         raise RuntimeError("Transcription produced no segments. Check audio quality, model path, or whisper binary.")
 
     final_path = transcripts_dir / f"{episode_id}.json"
-    with final_path.open("w", encoding="utf-8") as f:
-        json.dump(transcript, f, ensure_ascii=False, indent=2)
-
-    # Clean up raw output to avoid clutter but keep the normalized version.
-    if raw_json_path.exists():
-        raw_json_path.unlink()
+    save_transcript(final_path, transcript)
+    partial_path.unlink(missing_ok=True)
+    if journal is not None:
+        journal.discard()
+    TranscriptIndex(settings.search_db).index_transcript(episode_id, transcript, mtime=final_path.stat().st_mtime)
+    hooks.progress("transcription", 100.0)
 
     return final_path, transcript
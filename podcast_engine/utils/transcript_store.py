@@ -0,0 +1,282 @@
+import json
+import mmap
+import os
+import re
+import struct
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_DECODER = json.JSONDecoder()
+
+# Columnar transcript: header, metadata JSON (padded to 8 bytes), then float64 starts (sorted), float64 ends,
+# float64 running maximum of ends (sorted, for range lookups), uint64 text offsets (count + 1) and the UTF-8
+# text of every segment back to back.
+_MAGIC = b"PESEG02\0"
+_HEADER = struct.Struct("<8sQQ")  # magic, segment count, metadata bytes
+# whisper.cpp output left behind by an interrupted run: <id>_raw.json, or <id>_raw_0003.json per chunk.
+_RAW_STEM_RE = re.compile(r"_raw(_\d+)?$")
+
+
+class _JsonReader:
+    """
+    Pull JSON values one at a time from a text stream, holding roughly one block in memory.
+    """
+
+    def __init__(self, stream: IO[str], block_size: int = 1 << 16) -> None:
+        self._stream = stream
+        self._block_size = block_size
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self) -> bool:
+        if self._eof:
+            return False
+        data = self._stream.read(self._block_size)
+        if not data:
+            self._eof = True
+            return False
+        self._buffer = self._buffer[self._pos :] + data
+        self._pos = 0
+        return True
+
+    def peek(self) -> str:
+        while True:
+            self._pos = _WHITESPACE.match(self._buffer, self._pos).end()
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char: str) -> None:
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Expected {char!r} in JSON stream, found {found or 'end of input'!r}")
+        self._pos += 1
+
+    def skip_if(self, char: str) -> bool:
+        if self.peek() != char:
+            return False
+        self._pos += 1
+        return True
+
+    def value(self) -> Any:
+        self.peek()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # A number that ends the buffer may continue in the next block.
+            if end >= len(self._buffer) and self._fill():
+                continue
+            self._pos = end
+            return value
+
+
+def stream_json_object(path: Path, array_key: str, on_item: Callable[[Any], None]) -> Dict:
+    """
+    Parse a JSON object without materialising its ``array_key`` array: each element is passed to ``on_item``
+    as it is decoded and the remaining (small) fields are returned.
+    """
+    fields: Dict = {}
+    with path.open("r", encoding="utf-8") as f:
+        reader = _JsonReader(f)
+        reader.expect("{")
+        if reader.peek() == "}":
+            return fields
+        while True:
+            key = reader.value()
+            reader.expect(":")
+            if key == array_key and reader.skip_if("["):
+                if not reader.skip_if("]"):
+                    on_item(reader.value())
+                    while reader.skip_if(","):
+                        on_item(reader.value())
+                    reader.expect("]")
+            else:
+                fields[key] = reader.value()
+            if not reader.skip_if(","):
+                break
+        reader.expect("}")
+    return fields
+
+
+@contextmanager
+def _atomic_write(path: Path, mode: str, **kwargs) -> Iterator[IO]:
+    """
+    Write to a temp file of its own next to ``path`` and swap it in on success. The API and the pipeline may
+    write the same transcript at once; a shared temp name would let one rename the other's half-written file.
+    """
+    fd, tmp_name = tempfile.mkstemp(prefix=f"{path.name}.", suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(fd, mode, **kwargs) as f:
+            yield f
+        os.replace(tmp_name, path)
+    except BaseException:
+        os.unlink(tmp_name)
+        raise
+
+
+def write_transcript_json(path: Path, transcript: Dict) -> None:
+    """
+    Normalized transcript JSON with one segment per line: readable and diffable like ``indent=2``, at a
+    fraction of the size, written incrementally and swapped in atomically.
+    """
+    with _atomic_write(path, "w", encoding="utf-8") as f:
+        f.write("{\n")
+        for key, value in transcript.items():
+            if key != "segments":
+                f.write(f"  {json.dumps(key)}: {json.dumps(value, ensure_ascii=False)},\n")
+        f.write('  "segments": [')
+        for index, segment in enumerate(transcript.get("segments", [])):
+            f.write(",\n    " if index else "\n    ")
+            f.write(json.dumps(segment, ensure_ascii=False))
+        f.write("\n  ]\n}\n")
+
+
+def transcript_files(transcripts_dir: Path) -> Iterator[Path]:
+    """
+    ``<id>.json`` files in ``transcripts_dir`` in name order, without raw whisper output.
+    """
+    for path in sorted(transcripts_dir.glob("*.json")):
+        if not _RAW_STEM_RE.search(path.stem):
+            yield path
+
+
+def read_transcript(path: Path) -> Optional[Dict]:
+    """
+    The transcript in ``path``, or None when the file is not valid JSON or holds no ``segments`` list.
+    """
+    try:
+        transcript = json.loads(path.read_text(encoding="utf-8"))
+    except ValueError:
+        return None
+    if not isinstance(transcript, dict) or not isinstance(transcript.get("segments"), list):
+        return None
+    return transcript
+
+
+def columnar_path(json_path: Path) -> Path:
+    return json_path.with_suffix(".seg")
+
+
+def write_columnar(path: Path, metadata: Dict, segments: Iterable[Dict]) -> None:
+    rows = sorted(segments, key=lambda segment: float(segment["start"]))  # stable; whisper output is already ordered
+    starts = np.asarray([float(segment["start"]) for segment in rows], dtype="<f8")
+    ends = np.asarray([float(segment["end"]) for segment in rows], dtype="<f8")
+    texts = [segment["text"].encode("utf-8") for segment in rows]
+    offsets = np.zeros(len(texts) + 1, dtype="<u8")
+    np.cumsum([len(text) for text in texts], out=offsets[1:])
+
+    meta = json.dumps(metadata, ensure_ascii=False).encode("utf-8")
+    meta += b" " * (-len(meta) % 8)
+    with _atomic_write(path, "wb") as f:
+        f.write(_HEADER.pack(_MAGIC, len(texts), len(meta)))
+        f.write(meta)
+        f.write(starts.tobytes())
+        f.write(ends.tobytes())
+        f.write(np.maximum.accumulate(ends).tobytes() if len(ends) else b"")
+        f.write(offsets.tobytes())
+        for text in texts:
+            f.write(text)
+
+
+def save_transcript(path: Path, transcript: Dict) -> None:
+    """
+    Write the JSON transcript (the source of truth) and its columnar copy for paged reads.
+    """
+    write_transcript_json(path, transcript)
+    metadata = {key: value for key, value in transcript.items() if key != "segments"}
+    write_columnar(columnar_path(path), metadata, transcript.get("segments", []))
+
+
+def _is_current(path: Path, json_path: Path) -> bool:
+    if not path.exists() or path.stat().st_mtime_ns < json_path.stat().st_mtime_ns:
+        return False
+    with path.open("rb") as f:
+        return f.read(len(_MAGIC)) == _MAGIC
+
+
+def ensure_columnar(json_path: Path) -> Path:
+    """
+    The columnar copy of a transcript, (re)built by streaming the JSON when it is missing, older or written
+    in an earlier format.
+    """
+    path = columnar_path(json_path)
+    if _is_current(path, json_path):
+        return path
+    segments: List[Dict] = []
+    metadata = stream_json_object(json_path, "segments", segments.append)
+    write_columnar(path, metadata, segments)
+    return path
+
+
+class ColumnarTranscript:
+    """
+    Read-only view of a columnar transcript. The file is memory-mapped, so opening it costs the header and
+    a page or two; ``segments(offset, limit)`` touches only the rows it returns.
+    """
+
+    def __init__(self, path: Path) -> None:
+        with path.open("rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, count, meta_size = _HEADER.unpack_from(self._mmap, 0)
+        if magic != _MAGIC:
+            self._mmap.close()
+            raise ValueError(f"{path} is not a columnar transcript")
+        position = _HEADER.size
+        self.count: int = count
+        self.metadata: Dict = json.loads(self._mmap[position : position + meta_size].decode("utf-8"))
+        position += meta_size
+        self.starts = np.frombuffer(self._mmap, dtype="<f8", count=count, offset=position)
+        position += 8 * count
+        self.ends = np.frombuffer(self._mmap, dtype="<f8", count=count, offset=position)
+        position += 8 * count
+        self._max_ends = np.frombuffer(self._mmap, dtype="<f8", count=count, offset=position)
+        position += 8 * count
+        self._offsets = np.frombuffer(self._mmap, dtype="<u8", count=count + 1, offset=position)
+        self._text_base = position + 8 * (count + 1)
+
+    def __enter__(self) -> "ColumnarTranscript":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        # numpy views pin the buffer; drop them before unmapping.
+        self.starts = self.ends = self._max_ends = self._offsets = None  # type: ignore[assignment]
+        self._mmap.close()
+
+    def text(self, index: int) -> str:
+        first, last = int(self._offsets[index]), int(self._offsets[index + 1])
+        return self._mmap[self._text_base + first : self._text_base + last].decode("utf-8")
+
+    def segments(self, offset: int = 0, limit: Optional[int] = None) -> List[Dict]:
+        first = max(0, offset)
+        stop = self.count if limit is None else min(self.count, first + limit)
+        if first >= stop:
+            return []
+        starts, ends = self.starts[first:stop].tolist(), self.ends[first:stop].tolist()
+        bounds = (self._offsets[first : stop + 1] + self._text_base).tolist()
+        return [
+            {"start": start, "end": end, "text": self._mmap[bounds[row] : bounds[row + 1]].decode("utf-8")}
+            for row, (start, end) in enumerate(zip(starts, ends))
+        ]
+
+    def locate(self, start: Optional[float] = None, end: Optional[float] = None) -> Tuple[int, int]:
+        """
+        Row range ``[first, last)`` of the segments overlapping ``[start, end)`` seconds, by binary search over
+        the sorted start times and the running maximum of end times.
+        """
+        first = 0 if start is None else int(np.searchsorted(self._max_ends, start, side="right"))
+        last = self.count if end is None else int(np.searchsorted(self.starts, end, side="left"))
+        return first, max(first, last)
@@ -0,0 +1,221 @@
+import bisect
+import shutil
+import wave
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Iterator, List, Tuple
+
+import numpy as np
+
+from podcast_engine.utils import process
+
+SAMPLE_RATE = 16000
+FRAME_SECONDS = 0.03
+_READ_BYTES = SAMPLE_RATE * 2 * 30  # 30 s of s16le per read
+
+
+def pcm_blocks(stream: IO[bytes]) -> Iterator[np.ndarray]:
+    """
+    Float samples of 16 kHz mono s16le PCM read from ``stream``, about 30 s per block.
+    """
+    pending = b""
+    while True:
+        block = stream.read(_READ_BYTES)
+        if not block:
+            return
+        block = pending + block
+        usable = len(block) - len(block) % 2
+        pending = block[usable:]
+        yield np.frombuffer(block[:usable], dtype="<i2").astype(np.float32) / 32768.0
+
+
+class FrameLevels:
+    """
+    RMS level in dBFS of each ``frame_seconds`` frame, fed sample blocks incrementally so only the per-frame
+    levels (not the audio) are held in memory. ``tap`` lets another pass over the same decode feed it.
+    """
+
+    def __init__(self, frame_seconds: float = FRAME_SECONDS) -> None:
+        self._frame_samples = int(SAMPLE_RATE * frame_seconds)
+        self._levels: List[np.ndarray] = []
+        self._carry = np.empty(0, dtype=np.float32)
+
+    def feed(self, samples: np.ndarray) -> None:
+        samples = np.concatenate([self._carry, samples])
+        whole = len(samples) - len(samples) % self._frame_samples
+        frames = samples[:whole].reshape(-1, self._frame_samples)
+        self._carry = samples[whole:]
+        if len(frames):
+            self._levels.append(10.0 * np.log10(np.mean(frames * frames, axis=1) + 1e-10))
+
+    def tap(self, blocks: Iterator[np.ndarray]) -> Iterator[np.ndarray]:
+        for block in blocks:
+            self.feed(block)
+            yield block
+
+    @property
+    def levels(self) -> np.ndarray:
+        return np.concatenate(self._levels) if self._levels else np.empty(0, dtype=np.float32)
+
+
+def speech_spans_from_levels(
+    levels: np.ndarray,
+    frame_seconds: float = FRAME_SECONDS,
+    threshold_db: float = 12.0,
+    min_silence: float = 1.0,
+    min_speech: float = 0.25,
+    padding: float = 0.25,
+) -> List[Tuple[float, float]]:
+    """
+    Mark frames louder than the noise floor (10th percentile level) by ``threshold_db`` as speech, bridge gaps
+    shorter than ``min_silence``, drop blips shorter than ``min_speech`` and pad each span by ``padding``.
+    """
+    if not len(levels):
+        return []
+    floor = float(np.percentile(levels, 10))
+    active = levels > max(floor + threshold_db, -60.0)
+
+    # Run boundaries of the boolean mask: starts where it flips on, ends where it flips off.
+    edges = np.diff(np.concatenate([[0], active.astype(np.int8), [0]]))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    if not len(starts):
+        return []
+
+    duration = len(levels) * frame_seconds
+    spans: List[List[float]] = []
+    for start, end in zip(starts * frame_seconds, ends * frame_seconds):
+        if spans and start - spans[-1][1] < min_silence:
+            spans[-1][1] = float(end)
+        else:
+            spans.append([float(start), float(end)])
+
+    padded: List[Tuple[float, float]] = []
+    for start, end in spans:
+        if end - start < min_speech:
+            continue
+        start, end = max(0.0, start - padding), min(duration, end + padding)
+        if padded and start <= padded[-1][1]:
+            padded[-1] = (padded[-1][0], end)
+        else:
+            padded.append((start, end))
+    return padded
+
+
+def is_pcm16k(audio_path: Path) -> bool:
+    """
+    True for a 16 kHz mono 16-bit WAV: the format whisper.cpp reads natively, which needs no decoding.
+    """
+    try:
+        with wave.open(str(audio_path), "rb") as w:
+            return w.getframerate() == SAMPLE_RATE and w.getnchannels() == 1 and w.getsampwidth() == 2
+    except (OSError, EOFError, wave.Error):
+        return False
+
+
+class _WavStream:
+    """
+    ``read(size)`` over a WAV file's sample data, like a decoder's stdout pipe.
+    """
+
+    def __init__(self, wav: wave.Wave_read) -> None:
+        self._wav = wav
+
+    def read(self, size: int) -> bytes:
+        return self._wav.readframes(size // 2)
+
+
+@contextmanager
+def pcm_stream(audio_path: Path) -> Iterator[IO[bytes]]:
+    """
+    16 kHz mono s16le samples of ``audio_path`` to ``read()`` incrementally: straight from a 16 kHz PCM WAV,
+    otherwise decoded by ffmpeg on a pipe (killed if the reader stops early with an error).
+    """
+    if is_pcm16k(audio_path):
+        with wave.open(str(audio_path), "rb") as w:
+            yield _WavStream(w)  # type: ignore[misc]
+        return
+    if shutil.which("ffmpeg") is None:
+        raise FileNotFoundError("ffmpeg is required for audio conversion but was not found on PATH.")
+    cmd = [
+        "ffmpeg", "-nostdin", "-hide_banner", "-v", "error",
+        "-i", str(audio_path),
+        "-ar", str(SAMPLE_RATE), "-ac", "1", "-f", "s16le", "-",
+    ]
+    decoder = process.start(cmd)
+    try:
+        yield decoder.stdout
+    except BaseException:
+        decoder.kill()
+        raise
+    finally:
+        decoder.stdout.close()
+    result = decoder.wait()
+    if result.returncode != 0:
+        raise RuntimeError(f"ffmpeg conversion failed: {result.stderr}")
+
+
+def detect_speech(
+    audio_path: Path,
+    threshold_db: float = 12.0,
+    min_silence: float = 1.0,
+) -> List[Tuple[float, float]]:
+    """
+    Decode ``audio_path`` to 16 kHz mono PCM on a pipe and return its speech spans in seconds. Audio that is
+    already 16 kHz PCM is read directly.
+    """
+    meter = FrameLevels()
+    with pcm_stream(audio_path) as stream:
+        for block in pcm_blocks(stream):
+            meter.feed(block)
+    return speech_spans_from_levels(meter.levels, threshold_db=threshold_db, min_silence=min_silence)
+
+
+class SpeechMap:
+    """
+    Maps time in the condensed audio (speech spans played back to back) to time in the original audio.
+    """
+
+    def __init__(self, spans: List[Tuple[float, float]]) -> None:
+        self.spans = spans
+        self._condensed_starts: List[float] = []
+        position = 0.0
+        for start, end in spans:
+            self._condensed_starts.append(position)
+            position += end - start
+        self.speech_seconds = position
+
+    def to_original(self, seconds: float) -> float:
+        if not self.spans:
+            return seconds
+        index = max(0, bisect.bisect_right(self._condensed_starts, seconds) - 1)
+        start, end = self.spans[index]
+        return min(start + seconds - self._condensed_starts[index], end)
+
+    def window(self, start: float, end: float) -> "SpeechMap":
+        """
+        The spans inside ``[start, end)`` of the original audio, relative to ``start`` (for a seeked decode).
+        """
+        return SpeechMap([(max(s, start) - start, min(e, end) - start) for s, e in self.spans if e > start and s < end])
+
+    def select_filter(self) -> str:
+        """
+        ffmpeg audio filter that keeps only the speech spans and closes the gaps between them.
+        """
+        terms = "+".join(f"between(t,{start:.3f},{end:.3f})" for start, end in self.spans)
+        return f"aselect='{terms}',asetpts=N/SR/TB"
+
+
+def silences_between(spans: List[Tuple[float, float]], duration: float) -> List[Tuple[float, float]]:
+    """
+    The non-speech gaps around ``spans``, in the same (start, end) form as ffmpeg's silencedetect.
+    """
+    gaps = []
+    position = 0.0
+    for start, end in spans:
+        if start > position:
+            gaps.append((position, start))
+        position = end
+    if duration > position:
+        gaps.append((position, duration))
+    return gaps
@@ -0,0 +1,251 @@
+import atexit
+import http.client
+import json
+import subprocess
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Callable, ContextManager, Dict, Iterable, Iterator, Optional, Tuple
+from urllib.parse import urlsplit
+
+from podcast_engine.config import Settings
+
+_UPLOAD_BLOCK = 1 << 20
+
+
+class WhisperServer:
+    """
+    A long-lived whisper.cpp ``whisper-server`` with the model resident in memory, shared by every job in the
+    process. The server is started on first use, health-checked before each request and restarted when it
+    has died or stopped answering, or when a request needs another model or thread count. Point
+    ``WHISPER_SERVER_URL`` at an already running server and leave the binary unset to use it without managing
+    its lifetime (it then keeps the model it was started with).
+    """
+
+    def __init__(
+        self,
+        url: str,
+        binary: Optional[Path],
+        model_path: Path,
+        threads: int,
+        log_path: Optional[Path] = None,
+        startup_timeout: float = 120.0,
+        request_timeout: float = 3600.0,
+    ) -> None:
+        parts = urlsplit(url if "://" in url else f"http://{url}")
+        self.url = url
+        self.binary = binary
+        self.model_path = model_path
+        self.threads = threads
+        self.log_path = log_path
+        self.startup_timeout = startup_timeout
+        self.request_timeout = request_timeout
+        self._hostname = parts.hostname or "127.0.0.1"
+        self._port = parts.port or 8080
+        self._process: Optional[subprocess.Popen] = None
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._active = 0  # callers holding the server through ``configured``
+        self.restarts = 0
+
+    def _request(
+        self,
+        method: str,
+        path: str,
+        body: Optional[Iterable[bytes]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Optional[float] = None,
+    ) -> Tuple[int, bytes]:
+        conn = http.client.HTTPConnection(self._hostname, self._port, timeout=timeout or self.request_timeout)
+        try:
+            # An iterable body without a Content-Length goes out in chunked transfer encoding as it is produced.
+            conn.request(method, path, body=body, headers=headers or {})
+            response = conn.getresponse()
+            return response.status, response.read()
+        finally:
+            conn.close()
+
+    def healthy(self) -> bool:
+        try:
+            code, _ = self._request("GET", "/health", timeout=5)
+        except (OSError, http.client.HTTPException):
+            return False
+        return code == 200  # whisper-server answers 503 while the model is still loading
+
+    def _start(self) -> None:
+        if self.binary is None:
+            raise RuntimeError(f"whisper server not reachable at {self.url} and WHISPER_SERVER_BIN is not set.")
+        if not self.binary.exists():
+            raise FileNotFoundError(f"whisper-server binary not found at {self.binary}")
+        self._stop_process()
+        cmd = [
+            str(self.binary),
+            "-m",
+            str(self.model_path),
+            "-t",
+            str(self.threads),
+            "--host",
+            self._hostname,
+            "--port",
+            str(self._port),
+        ]
+        # The server logs every request; send that to a file rather than a pipe nobody drains.
+        # Not started through utils.process: the server outlives the job that first needed it and serves all of
+        # them, so it must not sit in that job's cancel scope (cancel_children would kill it under the others)
+        # nor hold a process-loop task for its whole life. stop_all() ends it on service shutdown and at exit.
+        log = self.log_path.open("ab") if self.log_path else subprocess.DEVNULL
+        try:
+            self._process = subprocess.Popen(cmd, stdout=log, stderr=subprocess.STDOUT)
+        finally:
+            if self.log_path:
+                log.close()
+        deadline = time.monotonic() + self.startup_timeout
+        while time.monotonic() < deadline:
+            if self._process.poll() is not None:
+                tail = self.log_path.read_text(errors="ignore")[-2000:] if self.log_path else ""
+                raise RuntimeError(f"whisper-server exited during startup: {tail.strip()}")
+            if self.healthy():
+                return
+            time.sleep(0.25)
+        self._stop_process()
+        raise RuntimeError(f"whisper-server did not become healthy within {self.startup_timeout:.0f}s")
+
+    def ensure_running(self) -> None:
+        with self._lock:
+            if self.healthy():
+                return
+            if self._process is not None:
+                # Ours but no longer answering. A killed server closes its socket before it can be reaped, so
+                # poll() may still report it running here; _start() stops whatever is left of it.
+                self.restarts += 1
+            self._start()
+
+    def _stop_process(self) -> None:
+        if self._process is None:
+            return
+        if self._process.poll() is None:
+            self._process.terminate()
+            try:
+                self._process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self._process.kill()
+                self._process.wait()
+        self._process = None
+
+    def stop(self) -> None:
+        with self._lock:
+            self._stop_process()
+
+    @contextmanager
+    def configured(self, binary: Optional[Path], model_path: Path, threads: int) -> Iterator["WhisperServer"]:
+        """
+        Hold the server for requests with this binary, model and thread count. A server started with other ones
+        is stopped once the requests in flight on it have finished, and the next request starts it again.
+        """
+        config = (binary, model_path, threads)
+        with self._idle:
+            while self._active and (self.binary, self.model_path, self.threads) != config:
+                self._idle.wait()
+            if (self.binary, self.model_path, self.threads) != config:
+                self._stop_process()
+                self.binary, self.model_path, self.threads = config
+            self._active += 1
+        try:
+            yield self
+        finally:
+            with self._idle:
+                self._active -= 1
+                self._idle.notify_all()
+
+    @staticmethod
+    def _multipart(wav: IO[bytes], fields: Dict[str, str], boundary: str) -> Iterator[bytes]:
+        for name, value in fields.items():
+            yield f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode("utf-8")
+        yield (
+            f'--{boundary}\r\nContent-Disposition: form-data; name="file"; filename="audio.wav"\r\n'
+            "Content-Type: audio/wav\r\n\r\n"
+        ).encode("utf-8")
+        yield from iter(lambda: wav.read(_UPLOAD_BLOCK), b"")
+        yield f"\r\n--{boundary}--\r\n".encode("utf-8")
+
+    def transcribe(self, open_wav: Callable[[], ContextManager[IO[bytes]]]) -> Dict:
+        """
+        POST 16 kHz mono WAV to ``/inference`` and return the ``verbose_json`` result (``segments`` with
+        start/end in seconds, plus ``language``). The WAV is streamed from ``open_wav()`` as it is read, never
+        held in memory. A request that fails at the connection level restarts the server and is retried once
+        on a fresh stream.
+        """
+        fields = {"response_format": "verbose_json", "temperature": "0.0"}
+        boundary = uuid.uuid4().hex
+        headers = {"Content-Type": f"multipart/form-data; boundary={boundary}"}
+        for attempt in range(2):
+            self.ensure_running()
+            try:
+                with open_wav() as wav:
+                    code, payload = self._request(
+                        "POST", "/inference", body=self._multipart(wav, fields, boundary), headers=headers
+                    )
+            except (OSError, http.client.HTTPException) as exc:
+                if attempt:
+                    raise RuntimeError(f"whisper server request failed: {exc}") from exc
+                with self._lock:
+                    self._stop_process()
+                    self.restarts += 1
+                continue
+            if code != 200:
+                raise RuntimeError(f"whisper server returned HTTP {code}: {payload.decode(errors='ignore')}")
+            data = json.loads(payload)
+            if isinstance(data, dict) and data.get("error"):
+                raise RuntimeError(f"whisper server error: {data['error']}")
+            return data
+        raise RuntimeError("whisper server request failed")
+
+
+_servers: Dict[str, WhisperServer] = {}
+_servers_lock = threading.Lock()
+
+
+def _server_threads(settings: Settings) -> int:
+    return settings.whisper_threads * settings.whisper_workers
+
+
+def get_server(settings: Settings) -> WhisperServer:
+    """
+    The process-wide server at ``WHISPER_SERVER_URL``, created on first use and stopped at interpreter exit.
+    Servers are keyed by URL alone: there is one listening socket per URL, whatever model it serves.
+    """
+    with _servers_lock:
+        server = _servers.get(settings.whisper_server_url)
+        if server is None:
+            server = WhisperServer(
+                settings.whisper_server_url,
+                settings.whisper_server_bin,
+                settings.whisper_model_path,
+                _server_threads(settings),
+                log_path=settings.state_dir / "whisper-server.log",
+            )
+            _servers[settings.whisper_server_url] = server
+            atexit.register(server.stop)
+        return server
+
+
+@contextmanager
+def serving(settings: Settings) -> Iterator[WhisperServer]:
+    """
+    ``get_server`` held for these settings' binary, model and threads (restarting it if it runs others).
+    """
+    server = get_server(settings)
+    with server.configured(settings.whisper_server_bin, settings.whisper_model_path, _server_threads(settings)):
+        yield server
+
+
+def stop_all() -> None:
+    """
+    Stop every whisper-server this process started (on API shutdown; interpreter exit does the same).
+    """
+    with _servers_lock:
+        servers = list(_servers.values())
+    for server in servers:
+        server.stop()
@@ -0,0 +1,71 @@
+import os
+import wave
+from pathlib import Path
+from typing import Callable, Dict, Iterator
+
+import numpy as np
+import pytest
+
+from podcast_engine.testing import SAMPLE_RATE, FakeYoutubeDL, OllamaStub, OllamaStubConfig, install_tools
+
+
+def tone_notes(seconds: float, seed: int) -> np.ndarray:
+    """
+    Short harmonic notes of random pitch and length back to back: dense, distinctive spectral peaks.
+    """
+    rng = np.random.default_rng(seed)
+    out = np.zeros(int(seconds * SAMPLE_RATE), dtype=np.float32)
+    position = 0
+    while position < len(out):
+        length = int(rng.uniform(0.08, 0.4) * SAMPLE_RATE)
+        pitch = rng.uniform(90, 500)
+        t = np.arange(min(length, len(out) - position)) / SAMPLE_RATE
+        envelope = np.sin(np.pi * t / (length / SAMPLE_RATE))
+        note = sum((0.6 / k) * np.sin(2 * np.pi * pitch * k * t + rng.uniform(0, 6)) for k in range(1, 6))
+        out[position : position + len(t)] += 0.3 * envelope * note
+        position += length + int(rng.uniform(0, 0.1) * SAMPLE_RATE)
+    return out
+
+
+@pytest.fixture
+def write_wav() -> Callable[[Path, np.ndarray], Path]:
+    def _write(path: Path, samples: np.ndarray) -> Path:
+        pcm = (np.clip(samples, -1.0, 1.0) * 32767).astype("<i2")
+        with wave.open(str(path), "wb") as w:
+            w.setnchannels(1)
+            w.setsampwidth(2)
+            w.setframerate(SAMPLE_RATE)
+            w.writeframes(pcm.tobytes())
+        return path
+
+    return _write
+
+
+@pytest.fixture
+def workspace(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Iterator[Dict[str, Path]]:
+    """
+    Every directory setting under ``tmp_path``, fake ffmpeg/whisper-cli/yt-dlp and a stub Ollama server, as the
+    benchmarks use them.
+    """
+    monkeypatch.setenv("PATH", os.environ.get("PATH", ""))  # install_tools prepends to it; restored afterwards
+    paths = install_tools(tmp_path / "bin")
+    model = tmp_path / "models" / "ggml-small.bin"
+    model.parent.mkdir()
+    model.write_bytes(b"test-model")
+    for name in ("AUDIO_DIR", "TRANSCRIPTS_DIR", "OUTPUTS_DIR", "CACHE_DIR", "STATE_DIR"):
+        monkeypatch.setenv(name, str(tmp_path / name.lower()))
+    env = {
+        "WHISPER_CPP_BIN": str(paths["whisper-cli"]),
+        "WHISPER_MODEL_PATH": str(model),
+        "WHISPER_BACKEND": "cli",
+        "LLM_BACKEND": "http",
+        "BENCH_WHISPER_RTF": "500",
+        "BENCH_WHISPER_LOAD": "0.01",
+        "TQDM_DISABLE": "1",
+    }
+    for name, value in env.items():
+        monkeypatch.setenv(name, value)
+    monkeypatch.setattr("podcast_engine.utils.downloader.YoutubeDL", FakeYoutubeDL)
+    with OllamaStub(OllamaStubConfig(token_latency=0.0)) as ollama:
+        monkeypatch.setenv("OLLAMA_HOST", ollama.url)
+        yield {"root": tmp_path, **paths}
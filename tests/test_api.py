@@ -0,0 +1,124 @@
+import asyncio
+import json
+from typing import Dict, List, Optional
+
+import pytest
+
+from podcast_engine.backend import api
+from podcast_engine.backend.services.engine_service import JobState
+
+
+class _Service:
+    """
+    The parts of ``EngineService`` the event stream reads: jobs by ID and the most recently submitted one.
+    """
+
+    def __init__(self) -> None:
+        self.jobs: Dict[str, JobState] = {}
+        self.latest: Optional[str] = None
+
+    def add(self, job_id: str, state: JobState) -> JobState:
+        self.jobs[job_id] = state
+        self.latest = job_id
+        return state
+
+    def latest_job_id(self) -> Optional[str]:
+        return self.latest
+
+    def status(self, job_id: Optional[str] = None) -> JobState:
+        return self.jobs[job_id or self.latest]
+
+
+class _Request:
+    def __init__(self, headers: Optional[Dict[str, str]] = None) -> None:
+        self.headers = headers or {}
+
+    async def is_disconnected(self) -> bool:
+        return False
+
+
+@pytest.fixture
+def service(monkeypatch: pytest.MonkeyPatch) -> _Service:
+    service = _Service()
+    monkeypatch.setattr(api, "engine_service", service)
+    sleep = asyncio.sleep
+    monkeypatch.setattr(api.asyncio, "sleep", lambda _: sleep(0))
+    return service
+
+
+def _running(logs: int, segments: int, summary: str = "") -> JobState:
+    state = JobState(state="running")
+    for index in range(logs):
+        state.logs.append(float(index), 20, f"line {index}")
+    state.partial_transcript = [{"start": float(i), "end": i + 1.0, "text": f"s{i}"} for i in range(segments)]
+    state.llm_partial = {"summary": summary} if summary else {}
+    return state
+
+
+def _events(headers: Optional[Dict[str, str]] = None, after_first_segment=None) -> List[Dict]:
+    """
+    Events of ``GET /events`` until ``done``; ``after_first_segment`` runs once the first segment is received.
+    """
+
+    async def _collect() -> List[Dict]:
+        response = await api.stream_events(_Request(headers), since=0, segments_since=0)
+        events: List[Dict] = []
+        hook = after_first_segment
+        async for chunk in response.body_iterator:
+            fields = dict(line.split(": ", 1) for line in chunk.strip().splitlines())
+            events.append({"event": fields["event"], "id": fields.get("id"), "data": json.loads(fields["data"])})
+            if fields["event"] == "done":
+                return events
+            if hook is not None and fields["event"] == "segment":
+                hook()
+                hook = None
+        return events
+
+    return asyncio.run(_collect())
+
+
+def test_latest_job_stream_stays_on_the_job_it_opened_with(service: _Service) -> None:
+    first = service.add("first", _running(logs=2, segments=1))
+
+    def _new_job_submitted() -> None:
+        service.add("second", _running(logs=5, segments=4))
+        first.state = "completed"
+
+    events = _events(after_first_segment=_new_job_submitted)
+
+    assert [e["data"]["message"] for e in events if e["event"] == "log"] == ["line 0", "line 1"]
+    assert [e["data"]["text"] for e in events if e["event"] == "segment"] == ["s0"]
+    assert events[-1]["event"] == "done" and events[-1]["data"]["state"] == "completed"
+
+
+def test_reconnect_resumes_from_last_event_id(service: _Service) -> None:
+    state = service.add("job", _running(logs=4, segments=3, summary="Hello"))
+    state.state = "completed"
+    first = _events()
+    last_id = [e["id"] for e in first if e["id"]][-1]
+    assert last_id == "4:3:summary=5"
+
+    state.logs.append(9.0, 20, "line 4")
+    state.partial_transcript.append({"start": 3.0, "end": 4.0, "text": "s3"})
+    state.llm_partial["summary"] += " world"
+    again = _events({"last-event-id": "2:3:summary=5"})
+
+    assert [e["data"]["message"] for e in again if e["event"] == "log"] == ["line 2", "line 3", "line 4"]
+    assert [e["data"]["text"] for e in again if e["event"] == "segment"] == ["s3"]
+    assert [e["data"]["text"] for e in again if e["event"] == "token"] == [" world"]
+
+
+@pytest.mark.parametrize("header", ["12:x", "1:-2", "nonsense", "3:4:summary"])
+def test_malformed_last_event_id_is_ignored(header: str) -> None:
+    assert api._resume_position(header) is None
+
+
+def test_if_none_match_compares_whole_tags() -> None:
+    etag = 'W/"1a2b-40"'
+
+    assert api._etag_matches('"x", W/"1a2b-40"', etag)
+    assert api._etag_matches('"1a2b-40"', etag)
+    assert api._etag_matches("*", etag)
+    assert not api._etag_matches('W/"1a2b-4"', etag)
+    assert not api._etag_matches('W/"1a2b-40-old"', etag)
+    assert not api._etag_matches("", etag)
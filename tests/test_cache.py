@@ -0,0 +1,127 @@
+import dataclasses
+import json
+import os
+import shutil
+from pathlib import Path
+
+from podcast_engine.config import load_settings
+from podcast_engine.utils.cache import ArtifactCache, get_cache
+
+
+def _manifest_keys(root: Path) -> set:
+    return set(json.loads((root / "manifest.json").read_text(encoding="utf-8"))["entries"])
+
+
+def test_round_trip_and_miss(tmp_path: Path) -> None:
+    cache = ArtifactCache(tmp_path, max_bytes=1 << 20)
+    key = cache.key("transcript", "abc")
+
+    assert cache.get_json(key) is None
+    cache.put_json(key, {"segments": [1, 2]})
+
+    assert cache.get_json(key) == {"segments": [1, 2]}
+    assert cache.key("transcript", "abc") == key != cache.key("transcript", "abd")
+
+
+def test_evicts_least_recently_used(tmp_path: Path) -> None:
+    cache = ArtifactCache(tmp_path, max_bytes=25)
+    first, second, third = (cache.key(name) for name in ("first", "second", "third"))
+    cache.put_text(first, "a" * 10)
+    cache.put_text(second, "b" * 10)
+
+    assert cache.get_text(first) is not None  # now more recent than ``second``
+    cache.put_text(third, "c" * 10)
+
+    assert cache.get_text(second) is None
+    assert cache.get_text(first) == "a" * 10
+    assert cache.get_text(third) == "c" * 10
+    assert _manifest_keys(tmp_path) == {first, third}
+
+
+def test_two_instances_keep_each_others_entries(tmp_path: Path) -> None:
+    one = ArtifactCache(tmp_path, max_bytes=1 << 20)
+    other = ArtifactCache(tmp_path, max_bytes=1 << 20)
+
+    one.put_text(one.key("one"), "from one")
+    other.put_text(other.key("other"), "from other")
+    one.put_text(one.key("again"), "from one again")
+
+    assert _manifest_keys(tmp_path) == {one.key("one"), one.key("other"), one.key("again")}
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_eviction_counts_entries_written_by_another_instance(tmp_path: Path) -> None:
+    one = ArtifactCache(tmp_path, max_bytes=25)
+    other = ArtifactCache(tmp_path, max_bytes=25)
+
+    one.put_text(one.key("old"), "a" * 10)
+    other.put_text(other.key("middle"), "b" * 10)
+    other.put_text(other.key("new"), "c" * 10)
+
+    assert _manifest_keys(tmp_path) == {one.key("middle"), one.key("new")}
+    assert one.get_text(one.key("old")) is None
+
+
+def test_hits_are_written_in_batches(tmp_path: Path) -> None:
+    cache = ArtifactCache(tmp_path, max_bytes=1 << 20)
+    key = cache.key("hot")
+    cache.put_text(key, "value")
+    written = (tmp_path / "manifest.json").stat().st_mtime_ns
+
+    for _ in range(10):
+        assert cache.get_text(key) == "value"
+
+    assert (tmp_path / "manifest.json").stat().st_mtime_ns == written
+    cache.flush()
+    assert (tmp_path / "manifest.json").stat().st_mtime_ns != written
+
+
+def test_digest_is_memoized_until_the_file_changes(tmp_path: Path) -> None:
+    cache = ArtifactCache(tmp_path / "cache", max_bytes=1 << 20)
+    path = tmp_path / "audio.bin"
+    path.write_bytes(b"first")
+    first = cache.digest(path)
+
+    cache.flush()
+    assert ArtifactCache(tmp_path / "cache", max_bytes=1 << 20).digest(path) == first
+    path.write_bytes(b"second")
+    os.utime(path, ns=(0, path.stat().st_mtime_ns + 1))
+    assert cache.digest(path) != first
+
+
+def test_digests_of_changed_or_deleted_files_are_dropped(tmp_path: Path) -> None:
+    cache = ArtifactCache(tmp_path / "cache", max_bytes=1 << 20)
+    kept, changed, deleted = (tmp_path / name for name in ("kept", "changed", "deleted"))
+    for path in (kept, changed, deleted):
+        path.write_bytes(path.name.encode())
+        cache.digest(path)
+    written = (tmp_path / "cache" / "manifest.json").exists()
+
+    cache.flush()
+    changed.write_bytes(b"changed again")
+    os.utime(changed, ns=(0, changed.stat().st_mtime_ns + 1))
+    deleted.unlink()
+    cache.put_text(cache.key("entry"), "value")
+
+    assert not written  # digests alone do not rewrite the manifest
+    digests = json.loads((tmp_path / "cache" / "manifest.json").read_text(encoding="utf-8"))["digests"]
+    assert [key.rsplit(":", 2)[0] for key in digests] == [str(kept.resolve())]
+
+
+def test_flush_after_the_cache_directory_is_removed(tmp_path: Path) -> None:
+    cache = ArtifactCache(tmp_path / "cache", max_bytes=1 << 20)
+    path = tmp_path / "audio.bin"
+    path.write_bytes(b"audio")
+    cache.digest(path)
+
+    shutil.rmtree(tmp_path / "cache")
+    cache.flush()
+
+    assert not (tmp_path / "cache").exists()
+
+
+def test_get_cache_shares_one_instance_per_directory(tmp_path: Path) -> None:
+    settings = dataclasses.replace(load_settings(), cache_dir=tmp_path / "a")
+
+    assert get_cache(settings) is get_cache(settings)
+    assert get_cache(settings) is not get_cache(dataclasses.replace(settings, cache_dir=tmp_path / "b"))
@@ -0,0 +1,21 @@
+from pathlib import Path
+
+from podcast_engine.utils.checkpoint import ChunkJournal
+
+
+def test_chunk_journal_resumes_only_its_own_plan(tmp_path: Path) -> None:
+    journal = ChunkJournal(tmp_path / "chunks.jsonl")
+    assert journal.open("plan-a") == {}
+    assert not journal.started()
+
+    journal.record(0, {"transcription": []})
+    journal.record(2, {"transcription": [{"text": "hi"}]})
+    with journal.path.open("a", encoding="utf-8") as f:
+        f.write('{"index": 3, "raw"')  # torn by a crash
+
+    assert journal.started()
+    assert ChunkJournal(journal.path).open("plan-a") == {0: {"transcription": []}, 2: {"transcription": [{"text": "hi"}]}}
+    assert journal.open("plan-b") == {}
+    assert not journal.started()
+    journal.discard()
+    assert not journal.started()
@@ -0,0 +1,32 @@
+import json
+from pathlib import Path
+from typing import Dict
+
+import pytest
+
+from podcast_engine.config import load_settings
+from podcast_engine.utils.embeddings import open_index, sync_directory
+
+
+def _write(path: Path, data) -> None:
+    path.write_text(json.dumps(data), encoding="utf-8")
+
+
+def test_sync_directory_embeds_transcripts_only(workspace: Dict[str, Path], monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("OLLAMA_EMBED_MODEL", "nomic-embed-text")
+    settings = load_settings()
+    transcripts = settings.transcripts_dir
+    transcripts.mkdir(parents=True, exist_ok=True)
+    segment = {"start": 1.0, "end": 3.0, "text": "the quarterly budget review"}
+    _write(transcripts / "episode.json", {"title": "Episode", "segments": [segment]})
+    _write(transcripts / "episode_raw.json", {"transcription": [segment]})
+    _write(transcripts / "episode_raw_3.json", {"transcription": [segment]})
+    _write(transcripts / "notes.json", {"unrelated": True})
+    _write(transcripts / "listing.json", {"segments": "not a list"})
+    (transcripts / "broken.json").write_text("{", encoding="utf-8")
+
+    assert sync_directory(settings, transcripts) == 1
+    assert sync_directory(settings, transcripts) == 0
+    index = open_index(settings)
+    assert index.source("episode") is not None
+    assert [name for name in ("episode_raw", "episode_raw_3", "notes", "listing") if index.source(name)] == []
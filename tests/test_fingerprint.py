@@ -0,0 +1,69 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from conftest import SAMPLE_RATE, tone_notes
+from podcast_engine.utils.fingerprint import FingerprintIndex, align_transcript, fingerprint_audio
+from podcast_engine.utils.vad import FrameLevels
+
+
+@pytest.fixture
+def index(tmp_path: Path, write_wav) -> FingerprintIndex:
+    index = FingerprintIndex(tmp_path / "fingerprints.db")
+    original = write_wav(tmp_path / "original.wav", tone_notes(90.0, seed=1))
+    index.add("original", "digest", fingerprint_audio(original))
+    return index
+
+
+def test_copy_with_an_intro_matches_at_its_offset(tmp_path: Path, write_wav, index: FingerprintIndex) -> None:
+    rng = np.random.default_rng(7)
+    copy = np.concatenate([tone_notes(30.0, seed=2), tone_notes(90.0, seed=1)])
+    copy += rng.normal(0.0, 0.01, len(copy)).astype(np.float32)
+    path = write_wav(tmp_path / "copy.wav", copy)
+
+    match = index.match(fingerprint_audio(path))
+
+    assert match is not None
+    assert match.episode_id == "original"
+    assert match.offset == pytest.approx(30.0, abs=0.1)
+    assert match.duration == pytest.approx(90.0, abs=0.1)
+    assert index.source("original") == "digest"
+
+
+def test_unrelated_audio_does_not_match(tmp_path: Path, write_wav, index: FingerprintIndex) -> None:
+    path = write_wav(tmp_path / "other.wav", tone_notes(60.0, seed=3))
+
+    assert index.match(fingerprint_audio(path), min_score=0.1) is None
+    assert index.match(fingerprint_audio(tmp_path / "original.wav"), exclude="original") is None
+
+
+def test_fingerprint_feeds_vad_levels_from_the_same_decode(tmp_path: Path, write_wav) -> None:
+    samples = np.concatenate([np.zeros(2 * SAMPLE_RATE, dtype=np.float32), tone_notes(3.0, seed=4)])
+    levels = FrameLevels()
+
+    fingerprint_audio(write_wav(tmp_path / "clip.wav", samples), levels)
+
+    expected = FrameLevels()
+    expected.feed((np.clip(samples, -1.0, 1.0) * 32767).astype("<i2").astype(np.float32) / 32768.0)
+    np.testing.assert_allclose(levels.levels, expected.levels, rtol=1e-5)
+
+
+def test_align_transcript_shifts_and_drops_segments() -> None:
+    transcript = {
+        "language": "en",
+        "segments": [
+            {"start": 0.0, "end": 4.0, "text": "cut intro"},
+            {"start": 4.0, "end": 8.0, "text": "straddles"},
+            {"start": 20.0, "end": 25.0, "text": "kept"},
+            {"start": 50.0, "end": 55.0, "text": "past the end"},
+        ],
+    }
+
+    aligned = align_transcript(transcript, offset=-5.0, duration=40.0)
+
+    assert aligned["language"] == "en"
+    assert [(s["start"], s["end"], s["text"]) for s in aligned["segments"]] == [
+        (0.0, 3.0, "straddles"),
+        (15.0, 20.0, "kept"),
+    ]
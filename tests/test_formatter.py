@@ -0,0 +1,11 @@
+from podcast_engine.utils.formatter import _format_timestamp, format_timestamp, segment_lines
+
+
+def test_format_timestamp_adds_hours_only_when_needed() -> None:
+    assert format_timestamp(59.9) == "00:59"
+    assert format_timestamp(3725.0) == "01:02:05"
+    assert _format_timestamp is format_timestamp
+
+
+def test_segment_lines() -> None:
+    assert segment_lines([{"start": 61.0, "end": 65.5, "text": " hello "}]) == ["- [01:01 - 01:05] hello"]
@@ -0,0 +1,69 @@
+import logging
+from pathlib import Path
+
+from podcast_engine.backend.services.log_store import JobLogStore, parse_level
+
+
+def _fill(store: JobLogStore, count: int, start: int = 0) -> None:
+    for index in range(start, start + count):
+        store.append(float(index), logging.INFO, f"line {index}", "transcription")
+
+
+def _seqs(entries: list) -> list:
+    return [entry["seq"] for entry in entries]
+
+
+def test_cursors_stay_valid_after_the_ring_wraps() -> None:
+    store = JobLogStore(capacity=5, spill_path=None)
+    _fill(store, 12)
+
+    assert store.cursor == 12
+    assert _seqs(store.read(9)) == [9, 10, 11]
+    assert store.read(12) == []
+    # Without a spill file, older entries are gone; the oldest kept one follows.
+    assert _seqs(store.read(0)) == [7, 8, 9, 10, 11]
+
+
+def test_old_cursors_are_read_from_the_spill_file(tmp_path: Path) -> None:
+    store = JobLogStore(capacity=5, spill_path=tmp_path / "job.jsonl")
+    _fill(store, 1000)
+
+    assert _seqs(store.read(0, limit=3)) == [0, 1, 2]
+    assert _seqs(store.read(700, limit=3)) == [700, 701, 702]
+    assert _seqs(store.read(997)) == [997, 998, 999]
+    assert store.read(300, limit=1)[0]["message"] == "line 300"
+
+
+def test_finished_store_serves_from_disk_and_survives_a_restart(tmp_path: Path) -> None:
+    spill = tmp_path / "job.jsonl"
+    store = JobLogStore(capacity=5, spill_path=spill)
+    _fill(store, 600)
+    store.close()
+
+    assert _seqs(store.read(598)) == [598, 599]
+    restarted = JobLogStore(capacity=5, spill_path=spill)
+    assert restarted.cursor == 600
+    assert _seqs(restarted.read(513, limit=2)) == [513, 514]
+    _fill(restarted, 1, start=600)
+    assert restarted.read(600)[0]["message"] == "line 600"
+
+
+def test_line_still_being_written_is_not_returned(tmp_path: Path) -> None:
+    spill = tmp_path / "job.jsonl"
+    store = JobLogStore(capacity=2, spill_path=spill)
+    _fill(store, 10)
+    with spill.open("a", encoding="utf-8") as f:
+        f.write('{"seq": 10, "t": 10.0')
+
+    assert _seqs(store.read(5)) == [5, 6, 7, 8, 9]
+
+
+def test_level_filters() -> None:
+    store = JobLogStore(capacity=10, min_level=logging.INFO)
+    store.append(0.0, logging.DEBUG, "dropped")
+    store.append(1.0, logging.INFO, "info")
+    store.append(2.0, logging.WARNING, "warning")
+
+    assert store.cursor == 2
+    assert [entry["message"] for entry in store.read(0, min_level=parse_level("warning"))] == ["warning"]
+    assert parse_level("nonsense", logging.INFO) == logging.INFO
@@ -0,0 +1,71 @@
+import json
+from pathlib import Path
+from typing import Dict, List
+
+import pytest
+
+from podcast_engine.hooks import PipelineHooks
+from podcast_engine.main import process_episode
+from podcast_engine.testing import FakeYoutubeDL, synthetic_audio
+
+
+@pytest.fixture
+def episode_audio(workspace: Dict[str, Path], monkeypatch: pytest.MonkeyPatch) -> Path:
+    audio = synthetic_audio(workspace["root"] / "episode.wav", 90.0)
+    monkeypatch.setattr(FakeYoutubeDL, "source", audio)
+    return audio
+
+
+def _stage_samples() -> tuple:
+    samples: Dict[str, Dict] = {}
+    return samples, PipelineHooks(on_metrics=lambda stage, sample: samples.__setitem__(stage, sample))
+
+
+def test_process_episode_writes_every_output(episode_audio: Path) -> None:
+    segments: List[Dict] = []
+
+    paths = process_episode("https://example.invalid/episode/1", hooks=PipelineHooks(on_segment=segments.append))
+
+    assert all(Path(path).exists() for path in paths.values())
+    transcript = json.loads(Path(paths["transcript_json"]).read_text(encoding="utf-8"))
+    assert transcript["segments"] and len(segments) == len(transcript["segments"])
+    assert transcript["segments"][-1]["end"] <= 90.0
+    assert Path(paths["summary"]).read_text(encoding="utf-8").strip()
+
+
+def test_resume_skips_finished_stages(episode_audio: Path) -> None:
+    first = process_episode("https://example.invalid/episode/1")
+    samples, hooks = _stage_samples()
+
+    again = process_episode("https://example.invalid/episode/1", hooks=hooks, resume=True)
+
+    assert again == first
+    assert samples["transcription"].get("resumed") is True
+
+
+def test_same_audio_under_another_url_reuses_the_transcript(episode_audio: Path) -> None:
+    first = process_episode("https://example.invalid/episode/1")
+    samples, hooks = _stage_samples()
+
+    second = process_episode("https://example.invalid/mirror/1", hooks=hooks)
+
+    assert second["transcript_json"] != first["transcript_json"]
+    assert samples["transcription"]["offset"] == pytest.approx(0.0, abs=0.1)
+    reused = json.loads(Path(second["transcript_json"]).read_text(encoding="utf-8"))["segments"]
+    original = json.loads(Path(first["transcript_json"]).read_text(encoding="utf-8"))["segments"]
+    assert [segment["text"] for segment in reused] == [segment["text"] for segment in original]
+
+
+def test_resume_regenerates_outputs_when_the_context_size_changes(
+    episode_audio: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    process_episode("https://example.invalid/episode/1")
+    samples, hooks = _stage_samples()
+    process_episode("https://example.invalid/episode/1", hooks=hooks, resume=True)
+    assert "llm_summary" not in samples
+
+    monkeypatch.setenv("LLM_CONTEXT_TOKENS", "4096")
+    samples, hooks = _stage_samples()
+    process_episode("https://example.invalid/episode/1", hooks=hooks, resume=True)
+
+    assert "llm_summary" in samples and "llm_x_thread" in samples
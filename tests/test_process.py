@@ -0,0 +1,18 @@
+import os
+
+import pytest
+
+from podcast_engine.utils import process
+
+
+def test_nice_lowers_the_child_priority() -> None:
+    result = process.run(["sh", "-c", "nice"], nice=5)
+
+    assert int(result.stdout) == os.nice(0) + 5
+
+
+def test_errors_name_the_tool_not_nice() -> None:
+    cmd = ["sh", "-c", "echo failed >&2; exit 3"]
+
+    with pytest.raises(process.ProcessError, match=r"^sh exited with status 3: failed"):
+        process.run(cmd, nice=5).check(cmd)
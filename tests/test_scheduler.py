@@ -0,0 +1,93 @@
+import dataclasses
+from pathlib import Path
+
+import pytest
+
+from podcast_engine.config import load_settings
+from podcast_engine.utils import scheduler
+from podcast_engine.utils.scheduler import RtfTable, model_tier, plan_transcription
+
+
+def test_model_tier_from_file_name() -> None:
+    assert model_tier(Path("ggml-small.en.bin")) == "small"
+    assert model_tier(Path("/models/ggml-large-v3-turbo.bin")) == "large"
+    assert model_tier(Path("custom.bin")) == "custom"
+
+
+def test_rtf_table_keeps_a_weighted_average(tmp_path: Path) -> None:
+    table = RtfTable(tmp_path / "whisper_rtf.json")
+
+    table.record("small", 4, audio_seconds=100.0, wall_seconds=10.0)
+    table.record("small", 4, audio_seconds=200.0, wall_seconds=10.0)
+    table.record("small", 4, audio_seconds=0.0, wall_seconds=10.0)  # ignored
+
+    assert table.predict("small", 4) == pytest.approx(13.0)
+    assert RtfTable(tmp_path / "whisper_rtf.json").predict("small", 4) == pytest.approx(13.0)
+
+
+def test_rtf_table_scales_the_nearest_thread_count(tmp_path: Path) -> None:
+    table = RtfTable(tmp_path / "whisper_rtf.json")
+    table.record("small", 4, audio_seconds=100.0, wall_seconds=10.0)
+    table.record("small", 16, audio_seconds=300.0, wall_seconds=10.0)
+
+    assert table.predict("small", 8) == pytest.approx(10.0 * 2**0.7)
+    assert table.predict("small", 12) == pytest.approx(30.0 * 0.75**0.7)
+
+
+def test_unmeasured_tier_is_calibrated_by_the_measured_ones(tmp_path: Path) -> None:
+    table = RtfTable(tmp_path / "whisper_rtf.json")
+    assert table.predict("medium", 4) == pytest.approx(1.5)
+
+    table.record("small", 4, audio_seconds=20.0, wall_seconds=10.0)  # half the small prior
+
+    assert table.predict("medium", 4) == pytest.approx(0.75)
+
+
+@pytest.fixture
+def settings(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(scheduler.os, "cpu_count", lambda: 16)
+    monkeypatch.setattr(scheduler.os, "getloadavg", lambda: (0.0, 0.0, 0.0))
+    model = tmp_path / "ggml-small.bin"
+    model.write_bytes(b"model")
+    return dataclasses.replace(
+        load_settings(),
+        state_dir=tmp_path,
+        whisper_model_path=model,
+        whisper_models={},
+        whisper_max_threads=16,
+        whisper_concurrency=1,
+        whisper_workers=4,
+        chunk_seconds=600,
+    )
+
+
+def test_plan_pools_threads_into_one_process_for_short_audio(settings) -> None:
+    plan = plan_transcription(settings, duration=300.0)
+
+    assert (plan.processes, plan.threads, plan.processors) == (1, 16, 1)
+    assert plan.tier == "small"
+
+
+def test_plan_splits_threads_across_chunk_processes(settings) -> None:
+    plan = plan_transcription(settings, duration=3600.0)
+
+    assert (plan.processes, plan.threads, plan.processors) == (4, 4, 1)
+    assert plan.total_threads == 16
+
+
+def test_plan_shares_cores_with_queued_jobs(settings) -> None:
+    plan = plan_transcription(dataclasses.replace(settings, whisper_concurrency=2), duration=300.0, queued=3)
+
+    assert (plan.threads, plan.processors) == (8, 1)
+
+
+def test_apply_runs_exactly_the_planned_threads(settings) -> None:
+    single = scheduler.WhisperPlan("small", settings.whisper_model_path, 7, 1, 1)
+    chunked = scheduler.WhisperPlan("small", settings.whisper_model_path, 3, 1, 2)
+
+    applied = single.apply(dataclasses.replace(settings, whisper_workers=2))
+    assert applied.whisper_pooled_threads == 7
+
+    applied = chunked.apply(settings)
+    assert (applied.whisper_workers, applied.whisper_threads) == (2, 3)
+    assert chunked.total_threads == applied.whisper_workers * applied.whisper_threads
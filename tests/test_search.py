@@ -0,0 +1,26 @@
+import json
+from pathlib import Path
+
+from podcast_engine.utils.search import TranscriptIndex
+
+
+def _write(path: Path, data) -> None:
+    path.write_text(json.dumps(data), encoding="utf-8")
+
+
+def test_sync_directory_indexes_transcripts_only(tmp_path: Path) -> None:
+    transcripts = tmp_path / "transcripts"
+    transcripts.mkdir()
+    segment = {"start": 1.0, "end": 3.0, "text": "the quarterly budget review"}
+    _write(transcripts / "episode.json", {"title": "Episode", "segments": [segment]})
+    _write(transcripts / "episode_raw.json", {"transcription": [segment]})
+    _write(transcripts / "episode_raw_3.json", {"transcription": [segment]})
+    _write(transcripts / "notes.json", {"unrelated": True})
+    _write(transcripts / "listing.json", {"segments": "not a list"})
+    (transcripts / "broken.json").write_text("{", encoding="utf-8")
+    index = TranscriptIndex(tmp_path / "search.db")
+
+    assert index.sync_directory(transcripts) == 1
+    assert index.sync_directory(transcripts) == 0
+    hits = index.search("budget")
+    assert [(hit["episode_id"], hit["start"]) for hit in hits] == [("episode", 1.0)]
@@ -0,0 +1,55 @@
+import threading
+import time
+from typing import Dict, List
+
+from podcast_engine.utils.llm import estimate_tokens
+from podcast_engine.utils.summarizer import chunk_segments, map_reduce_notes
+
+
+def _segments(count: int, words: int = 20) -> List[Dict]:
+    return [
+        {"start": 10.0 * index, "end": 10.0 * index + 9.0, "text": " ".join([f"word{index}"] * words)}
+        for index in range(count)
+    ]
+
+
+def test_chunks_stay_within_budget_and_keep_order() -> None:
+    segments = _segments(30)
+
+    chunks = chunk_segments(segments, budget_tokens=200)
+
+    assert [segment for chunk in chunks for segment in chunk] == segments
+    assert all(sum(estimate_tokens(s["text"]) + 1 for s in chunk) <= 200 for chunk in chunks)
+
+
+def test_progress_counts_each_chunk_once() -> None:
+    progress: List[float] = []
+    lock = threading.Lock()
+
+    def _summarize(text: str, task: str) -> str:
+        time.sleep(0.001)
+        return "short note"
+
+    def _on_progress(percent: float) -> None:
+        with lock:
+            progress.append(percent)
+
+    notes = map_reduce_notes(_segments(40), 200, _summarize, max_workers=8, on_progress=_on_progress)
+
+    assert progress == sorted(progress) and len(progress) == len(set(progress))
+    assert progress[-1] == 100.0
+    assert notes.startswith("short note")
+
+
+def test_notes_that_cannot_shrink_are_cut_to_the_budget() -> None:
+    tasks: List[str] = []
+
+    def _summarize(text: str, task: str) -> str:
+        tasks.append(task)
+        return f"{task}: " + "verbose " * 200  # every note is bigger than the budget
+
+    notes = map_reduce_notes(_segments(20), 300, _summarize, max_workers=2)
+
+    assert estimate_tokens(notes) <= 300
+    assert all(task.startswith("chunk_l0_") for task in tasks)
+    assert [line.split(":")[0] for line in notes.split("\n\n")] == sorted(tasks, key=lambda t: int(t.split("_")[-1]))
@@ -0,0 +1,76 @@
+import os
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from conftest import SAMPLE_RATE
+from podcast_engine.config import load_settings
+from podcast_engine.utils.transcriber import Chunk, _decoded_audio, _plan_chunks, _Stitcher
+
+
+def _segment(start: float, end: float, text: str) -> dict:
+    return {"start": start, "end": end, "text": text}
+
+
+def test_stitcher_keeps_segments_by_midpoint() -> None:
+    first = Chunk(index=0, start=0.0, end=65.0, keep_from=0.0, keep_to=60.0)
+    second = Chunk(index=1, start=55.0, end=120.0, keep_from=60.0, keep_to=float("inf"))
+    stitcher = _Stitcher()
+
+    stitcher.add(first, [_segment(0.0, 30.0, "one"), _segment(55.0, 62.0, "two"), _segment(61.0, 65.0, "three")])
+    stitcher.add(second, [_segment(55.0, 59.0, "one again"), _segment(61.0, 65.0, "three"), _segment(70, 80, "four")])
+
+    assert [segment["text"] for segment in stitcher.segments] == ["one", "two", "three", "four"]
+
+
+def test_stitcher_drops_line_repeated_across_the_cut() -> None:
+    first = Chunk(index=0, start=0.0, end=65.0, keep_from=0.0, keep_to=60.0)
+    second = Chunk(index=1, start=55.0, end=120.0, keep_from=60.0, keep_to=float("inf"))
+    stitcher = _Stitcher()
+
+    stitcher.add(first, [_segment(56.0, 61.0, "Welcome back")])
+    added = stitcher.add(second, [_segment(60.5, 62.0, "welcome back"), _segment(62.0, 66.0, "to the show")])
+
+    assert [segment["text"] for segment in added] == ["to the show"]
+    assert [segment["text"] for segment in stitcher.segments] == ["Welcome back", "to the show"]
+
+
+def test_plan_chunks_cuts_at_nearby_silence() -> None:
+    chunks = _plan_chunks(300.0, [(95.0, 97.0), (210.0, 212.0)], chunk_seconds=100.0, overlap=2.0)
+
+    assert [(chunk.keep_from, chunk.keep_to) for chunk in chunks] == [
+        (0.0, 96.0),
+        (96.0, 211.0),
+        (211.0, float("inf")),
+    ]
+    assert (chunks[1].start, chunks[1].end) == (94.0, 213.0)
+    assert chunks[-1].end == 300.0
+
+
+def test_plan_chunks_falls_back_to_hard_cuts() -> None:
+    chunks = _plan_chunks(220.0, [], chunk_seconds=100.0, overlap=0.0)
+
+    assert [chunk.keep_from for chunk in chunks] == [0.0, 100.0]
+    assert chunks[0].keep_to == 100.0
+
+
+def test_reader_error_is_not_replaced_by_the_decoder_failing(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, write_wav
+) -> None:
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    ffmpeg = bin_dir / "ffmpeg"
+    ffmpeg.write_text("#!/bin/sh\necho 'pipe:: Broken pipe' >&2\nexit 1\n", encoding="utf-8")
+    ffmpeg.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ.get('PATH', '')}")
+    audio = write_wav(tmp_path / "clip.wav", np.zeros(SAMPLE_RATE, dtype=np.float32))
+
+    with pytest.raises(RuntimeError, match="whisper.cpp failed"):
+        with _decoded_audio(audio, load_settings(), start=0.5) as (input_arg, stdin):
+            assert input_arg == "-" and stdin is not None
+            raise RuntimeError("whisper.cpp failed: bad model")
+
+    with pytest.raises(RuntimeError, match="ffmpeg conversion failed"):
+        with _decoded_audio(audio, load_settings(), start=0.5) as (_, stdin):
+            stdin.read()
@@ -0,0 +1,24 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from podcast_engine.utils import transcript_store
+from podcast_engine.utils.transcript_store import ColumnarTranscript, save_transcript
+
+SEGMENTS = [{"start": float(i), "end": i + 1.0, "text": f"segment {i} " * 20} for i in range(2000)]
+
+
+def test_concurrent_writers_never_swap_in_a_partial_file(tmp_path: Path) -> None:
+    path = tmp_path / "episode.json"
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        futures = [pool.submit(save_transcript, path, {"title": "Episode", "segments": SEGMENTS}) for _ in range(16)]
+        for future in futures:
+            future.result()
+
+    assert len(json.loads(path.read_text(encoding="utf-8"))["segments"]) == len(SEGMENTS)
+    with ColumnarTranscript(transcript_store.columnar_path(path)) as columnar:
+        assert columnar.count == len(SEGMENTS)
+        assert columnar.segments(len(SEGMENTS) - 1)[0]["text"] == SEGMENTS[-1]["text"]
+    assert not list(tmp_path.glob("*.tmp"))
+
@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+
+from podcast_engine.utils.vad import FrameLevels, SpeechMap, silences_between, speech_spans_from_levels
+
+
+def test_speech_map_maps_condensed_time_to_original() -> None:
+    speech = SpeechMap([(10.0, 20.0), (30.0, 35.0), (50.0, 60.0)])
+
+    assert speech.speech_seconds == 25.0
+    assert speech.to_original(0.0) == 10.0
+    assert speech.to_original(9.0) == 19.0
+    assert speech.to_original(10.0) == 30.0
+    assert speech.to_original(16.0) == 51.0
+    assert speech.to_original(40.0) == 60.0  # past the end stays at the last span's end
+
+
+def test_speech_map_without_spans_is_identity() -> None:
+    assert SpeechMap([]).to_original(12.5) == 12.5
+
+
+def test_speech_map_window_is_relative_to_its_start() -> None:
+    speech = SpeechMap([(10.0, 20.0), (30.0, 35.0), (50.0, 60.0)])
+
+    window = speech.window(15.0, 55.0)
+
+    assert window.spans == [(0.0, 5.0), (15.0, 20.0), (35.0, 40.0)]
+    assert window.to_original(6.0) == 16.0
+
+
+def test_select_filter_keeps_only_the_spans() -> None:
+    assert SpeechMap([(1.0, 2.5)]).select_filter() == "aselect='between(t,1.000,2.500)',asetpts=N/SR/TB"
+
+
+def test_speech_spans_bridge_short_gaps_and_drop_blips() -> None:
+    frame = 0.5
+    levels = np.full(40, -70.0)
+    levels[2:8] = -20.0  # 1.0 - 4.0 s
+    levels[9:12] = -20.0  # 4.5 - 6.0 s, a 0.5 s gap: bridged
+    levels[30] = -20.0  # a single 0.5 s frame: dropped as a blip
+
+    spans = speech_spans_from_levels(levels, frame_seconds=frame, min_silence=1.0, min_speech=0.75, padding=0.25)
+
+    assert spans == [(0.75, 6.25)]
+
+
+def test_speech_spans_of_silence() -> None:
+    assert speech_spans_from_levels(np.empty(0)) == []
+    assert speech_spans_from_levels(np.full(100, -80.0)) == []
+
+
+def test_frame_levels_do_not_depend_on_block_size() -> None:
+    rng = np.random.default_rng(0)
+    samples = rng.normal(0.0, 0.1, 16000 * 3).astype(np.float32)
+    whole, pieces = FrameLevels(), FrameLevels()
+
+    whole.feed(samples)
+    for block in np.array_split(samples, [1, 4801, 20000, 20001]):
+        pieces.feed(block)
+
+    assert len(whole.levels) == 100
+    np.testing.assert_allclose(pieces.levels, whole.levels, rtol=1e-5)
+    assert whole.levels.mean() == pytest.approx(-20.0, abs=0.5)
+
+
+def test_frame_levels_tap_passes_blocks_through() -> None:
+    blocks = [np.zeros(480, dtype=np.float32), np.ones(480, dtype=np.float32)]
+    meter = FrameLevels()
+
+    assert list(meter.tap(iter(blocks))) == blocks
+    assert len(meter.levels) == 2
+
+
+def test_silences_between_spans() -> None:
+    assert silences_between([(2.0, 5.0), (7.0, 9.0)], 12.0) == [(0.0, 2.0), (5.0, 7.0), (9.0, 12.0)]
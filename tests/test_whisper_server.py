@@ -0,0 +1,125 @@
+import os
+import re
+import signal
+import socket
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Dict, Iterator, List
+
+import numpy as np
+import pytest
+
+from conftest import SAMPLE_RATE
+from podcast_engine.config import load_settings
+from podcast_engine.utils.transcriber import transcribe_audio
+from podcast_engine.utils.whisper_server import WhisperServer, stop_all
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _starts(log_path: Path) -> List[Dict[str, str]]:
+    text = log_path.read_text(encoding="utf-8") if log_path.exists() else ""
+    return [dict(re.findall(r"(\w+)=(\S+)", line)) for line in text.splitlines() if line.startswith("whisper-server")]
+
+
+def _uploads(log_path: Path) -> List[int]:
+    return [int(size) for size in re.findall(r"inference bytes=(\d+)", log_path.read_text(encoding="utf-8"))]
+
+
+@pytest.fixture
+def wav_path(tmp_path: Path, write_wav) -> Path:
+    return write_wav(tmp_path / "clip.wav", np.zeros(12 * SAMPLE_RATE, dtype=np.float32))
+
+
+@pytest.fixture
+def server(workspace: Dict[str, Path]) -> Iterator[WhisperServer]:
+    root = workspace["root"]
+    server = WhisperServer(
+        f"http://127.0.0.1:{_free_port()}",
+        workspace["whisper-server"],
+        root / "models" / "ggml-small.bin",
+        threads=2,
+        log_path=root / "whisper-server.log",
+        startup_timeout=10,
+    )
+    try:
+        yield server
+    finally:
+        server.stop()
+
+
+def _opener(path: Path):
+    @contextmanager
+    def _open() -> Iterator[IO[bytes]]:
+        with path.open("rb") as f:
+            yield f
+
+    return _open
+
+
+def test_starts_once_healthy_and_streams_the_upload(server: WhisperServer, wav_path: Path) -> None:
+    assert not server.healthy()
+
+    result = server.transcribe(_opener(wav_path))
+
+    assert server.healthy()
+    assert [(s["start"], s["end"]) for s in result["segments"]] == [(0.0, 5.0), (5.0, 10.0), (10.0, 12.0)]
+    assert _uploads(server.log_path) == [wav_path.stat().st_size]
+    server.transcribe(_opener(wav_path))
+    assert len(_starts(server.log_path)) == 1 and server.restarts == 0
+
+
+def test_restarts_after_the_process_dies(server: WhisperServer, wav_path: Path) -> None:
+    server.ensure_running()
+    first = _starts(server.log_path)[0]["pid"]
+    os.kill(int(first), signal.SIGKILL)
+    deadline = time.monotonic() + 5
+    while server.healthy() and time.monotonic() < deadline:
+        time.sleep(0.05)
+
+    result = server.transcribe(_opener(wav_path))
+
+    assert result["segments"]
+    assert server.restarts == 1
+    pids = [start["pid"] for start in _starts(server.log_path)]
+    assert len(pids) == 2 and pids[0] == first != pids[1]
+
+
+def test_configured_restarts_for_another_model(server: WhisperServer, wav_path: Path, tmp_path: Path) -> None:
+    other_model = tmp_path / "ggml-medium.bin"
+    other_model.write_bytes(b"model")
+    with server.configured(server.binary, server.model_path, 2):
+        server.transcribe(_opener(wav_path))
+    with server.configured(server.binary, server.model_path, 2):
+        server.transcribe(_opener(wav_path))  # same config: the running server is kept
+
+    with server.configured(server.binary, other_model, 4):
+        server.transcribe(_opener(wav_path))
+
+    starts = _starts(server.log_path)
+    assert [(Path(start["model"]).name, start["threads"]) for start in starts] == [
+        ("ggml-small.bin", "2"),
+        ("ggml-medium.bin", "4"),
+    ]
+
+
+def test_transcribe_audio_through_the_server(workspace: Dict[str, Path], wav_path: Path, monkeypatch) -> None:
+    monkeypatch.setenv("WHISPER_BACKEND", "server")
+    monkeypatch.setenv("WHISPER_SERVER_BIN", str(workspace["whisper-server"]))
+    monkeypatch.setenv("WHISPER_SERVER_URL", f"http://127.0.0.1:{_free_port()}")
+    monkeypatch.setenv("WHISPER_VAD", "0")
+    settings = load_settings()
+
+    try:
+        path, transcript = transcribe_audio(wav_path, settings, {"id": "clip", "title": "Clip"})
+    finally:
+        stop_all()
+
+    assert path.exists()
+    assert [segment["end"] for segment in transcript["segments"]] == [5.0, 10.0, 12.0]
+    assert _uploads(settings.state_dir / "whisper-server.log") == [wav_path.stat().st_size]